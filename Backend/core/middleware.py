@@ -0,0 +1,153 @@
+"""
+Negotiated response compression.
+
+CompressionMiddleware encodes responses with brotli (when the optional
+brotli package is installed) or gzip, whichever the client prefers in
+Accept-Encoding. Settings live in RESPONSE_COMPRESSION:
+
+    MIN_SIZE        responses shorter than this many bytes are sent as they
+                    are; compressing them costs more than it saves
+    GZIP_LEVEL      zlib level, 1 (fastest) to 9
+    BROTLI_QUALITY  brotli quality, 0 (fastest) to 11
+
+Streaming responses (exports) are compressed chunk by chunk with one
+compressor, flushed after every chunk, so rows still reach the client as
+they are produced.
+"""
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/x-ndjson',
+    'application/msgpack',
+    'application/javascript',
+    'image/svg+xml',
+)
+
+
+def accepted_encodings(header):
+    """{coding: q} from an Accept-Encoding header."""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def choose_encoding(header):
+    """'br', 'gzip' or None for an Accept-Encoding header."""
+    accepted = accepted_encodings(header)
+    wildcard = accepted.get('*', 0.0)
+    candidates = (['br'] if brotli is not None else []) + ['gzip']
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class Compressor:
+    """compress(chunk) / flush() / finish() over brotli or gzip."""
+
+    def __init__(self, encoding, options):
+        self.encoding = encoding
+        if encoding == 'br':
+            self.brotli = brotli.Compressor(quality=options['BROTLI_QUALITY'])
+        else:
+            self.zlib = zlib.compressobj(options['GZIP_LEVEL'], zlib.DEFLATED, 31)
+
+    def compress(self, data):
+        if self.encoding == 'br':
+            return self.brotli.process(data)
+        return self.zlib.compress(data)
+
+    def flush(self):
+        if self.encoding == 'br':
+            return self.brotli.flush()
+        return self.zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self.brotli.finish()
+        return self.zlib.flush()
+
+
+def compress_stream(chunks, compressor):
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def compress_async_stream(chunks, compressor):
+    async for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class CompressionMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        options = settings.RESPONSE_COMPRESSION
+
+        if response.has_header('Content-Encoding') or response.status_code in (204, 206, 304):
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+        if not response.streaming and len(response.content) < options['MIN_SIZE']:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        compressor = Compressor(encoding, options)
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_stream(response.streaming_content, compressor)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, compressor)
+            del response.headers['Content-Length']
+        else:
+            content = compressor.compress(response.content) + compressor.finish()
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response.headers['Content-Length'] = str(len(content))
+
+        # The compressed body is a different representation: a strong ETag
+        # becomes weak, which If-None-Match still matches.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
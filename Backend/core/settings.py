@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
 from pathlib import Path
+import importlib.util
 import os
 import urllib.parse
 from datetime import timedelta
@@ -50,6 +51,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -114,6 +116,32 @@ else:
         }
     }
 
+# Connection reuse. Each worker thread keeps its connection for
+# DB_CONN_MAX_AGE seconds (0 closes it after every request) and checks it
+# before reusing it in a new request. DB_POOL=1 replaces that with one
+# psycopg pool per process, for threaded workers (gunicorn --threads);
+# the pool checks connections on checkout. Stats are served by
+# /api/system/metrics/.
+DATABASES['default']['CONN_HEALTH_CHECKS'] = os.environ.get('DB_CONN_HEALTH_CHECKS', '1') == '1'
+if os.environ.get('DB_POOL', '0') == '1':
+    # Pooled connections go back to the pool after every request.
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', '300')),
+        'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', '3600')),
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+# Exports and reports stream rows through server-side cursors on
+# PostgreSQL. Transaction-mode PgBouncer cannot keep them open between
+# statements: set DB_DISABLE_SERVER_SIDE_CURSORS=1 behind it.
+DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = (
+    os.environ.get('DB_DISABLE_SERVER_SIDE_CURSORS', '0') == '1'
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -175,8 +203,74 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # JSON is rendered by orjson (finances.renderers). application/msgpack
+    # is negotiated only when the optional msgpack package is installed.
+    'DEFAULT_RENDERER_CLASSES': (
+        'finances.renderers.ORJSONRenderer',
+        *(('finances.renderers.MessagePackRenderer',) if importlib.util.find_spec('msgpack') else ()),
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+}
+
+# gzip/brotli response compression (core.middleware). brotli is used when
+# the optional brotli package is installed and the client accepts it.
+RESPONSE_COMPRESSION = {
+    'MIN_SIZE': int(os.environ.get('COMPRESSION_MIN_SIZE', '1024')),
+    'GZIP_LEVEL': int(os.environ.get('COMPRESSION_GZIP_LEVEL', '6')),
+    'BROTLI_QUALITY': int(os.environ.get('COMPRESSION_BROTLI_QUALITY', '4')),
+}
+
+# Per-process cache of users resolved from JWTs (finances.authentication).
+# Set AUTH_USER_CACHE_SHARED to a CACHES alias to share entries between
+# workers; MAX_SIZE or TTL of 0 disables the cache.
+AUTH_USER_CACHE = {
+    'MAX_SIZE': int(os.environ.get('AUTH_USER_CACHE_MAX_SIZE', '1024')),
+    'TTL': int(os.environ.get('AUTH_USER_CACHE_TTL', '60')),
+    'SHARED_CACHE': os.environ.get('AUTH_USER_CACHE_SHARED') or None,
+}
+
+# bcrypt cost and the bounded executor that runs password hashing
+# (finances.passwords). Existing hashes with another cost are rehashed on
+# the next login. MAX_CONCURRENCY 0 uses one hashing thread per CPU; logins
+# beyond MAX_CONCURRENCY + MAX_QUEUE, or waiting longer than TIMEOUT
+# seconds, get a 503.
+PASSWORD_HASHING = {
+    'ROUNDS': int(os.environ.get('BCRYPT_ROUNDS', '12')),
+    'MAX_CONCURRENCY': int(os.environ.get('PASSWORD_HASH_CONCURRENCY', '0')),
+    'MAX_QUEUE': int(os.environ.get('PASSWORD_HASH_QUEUE', '32')),
+    'TIMEOUT': float(os.environ.get('PASSWORD_HASH_TIMEOUT', '10')),
 }
 
+# Cache for serialized read responses (finances.versions.cached). Keys
+# include the user's data version, so writes never need a purge; size and
+# culling apply to the locmem, file and database backends.
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_CACHE_BACKEND = os.environ.get(
+    'RESPONSE_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'
+)
+RESPONSE_CACHE = {
+    'BACKEND': RESPONSE_CACHE_BACKEND,
+    'LOCATION': os.environ.get('RESPONSE_CACHE_LOCATION', 'finances-responses'),
+    'TIMEOUT': int(os.environ.get('RESPONSE_CACHE_TIMEOUT', '300')),
+    'KEY_PREFIX': 'finances',
+}
+if RESPONSE_CACHE_BACKEND.rsplit('.', 1)[-1] in ('LocMemCache', 'FileBasedCache', 'DatabaseCache'):
+    RESPONSE_CACHE['OPTIONS'] = {
+        'MAX_ENTRIES': int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', '5000')),
+        'CULL_FREQUENCY': int(os.environ.get('RESPONSE_CACHE_CULL_FREQUENCY', '3')),
+    }
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    RESPONSE_CACHE_ALIAS: RESPONSE_CACHE,
+}
+
+# Token required in the X-Metrics-Token header by the system/metrics/
+# endpoint. The endpoint is disabled when it is empty.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -201,6 +295,13 @@ LOGIN_REDIRECT_URL = os.environ.get('LOGIN_REDIRECT_URL', 'http://localhost:5173
 SOCIAL_AUTH_REDIRECT_IS_HTTPS = os.environ.get('SOCIAL_AUTH_REDIRECT_IS_HTTPS', 'False') == '1'
 
 STATIC_ROOT = BASE_DIR / 'staticfiles'
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
@@ -0,0 +1,62 @@
+"""
+API-only settings, used by the serverless entry point (api/wsgi.py).
+
+Vercel only routes /api/ to Django, so every cold start that loads the
+admin, sessions, messages, static files and social_django pays for apps
+no request can reach. This profile keeps what the API uses: the finances
+app, DRF, CORS and the auth/contenttypes apps DRF needs for
+AnonymousUser. manage.py and the other entry points keep core.settings.
+
+Measure it against the full profile with:
+
+    python manage.py benchmark_startup
+"""
+
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'rest_framework',
+    'corsheaders',
+    'finances',
+]
+
+# The API authenticates with JWTs and its views are CSRF-exempt, so the
+# session, CSRF, auth, messages and clickjacking middleware have nothing
+# to do; whitenoise only serves /static/.
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+ROOT_URLCONF = 'core.urls_api'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+            ],
+        },
+    },
+]
+
+AUTHENTICATION_BACKENDS = (
+    'django.contrib.auth.backends.ModelBackend',
+)
+
+# JSON and MessagePack only: the frontend never asks for the browsable
+# API's HTML, and rendering it loads templates and forms.
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': tuple(
+        renderer for renderer in REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES']
+        if renderer != 'rest_framework.renderers.BrowsableAPIRenderer'
+    ),
+}
@@ -6,3 +6,17 @@ DATABASES = {
         'NAME': ':memory:',
     }
 }
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    RESPONSE_CACHE_ALIAS: {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'finances-test-responses',
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+
+# The minimum bcrypt cost: hashing at 12 would dominate the suite's runtime.
+PASSWORD_HASHING = {**PASSWORD_HASHING, 'ROUNDS': 4}
@@ -0,0 +1,9 @@
+"""
+URL configuration for the API-only settings (core.settings_api): the
+API without the admin.
+"""
+from django.urls import path, include
+
+urlpatterns = [
+    path('api/', include('finances.urls')),
+]
@@ -0,0 +1,277 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Transaction, TransactionMonthlyRollup, Debt
+
+
+DASHBOARD_PERIODS = ('7', '30', '90', 'qtd', 'all')
+TREND_MONTHS = 6
+TOP_CATEGORIES = 6
+RECENT_TRANSACTIONS = 6
+
+CENT = Decimal('0.01')
+
+
+def money(value):
+    """Format an aggregate the same way DecimalField amounts are rendered."""
+    return str((value or Decimal('0')).quantize(CENT))
+
+
+def shift_month(month_start, months):
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def period_start(period, today=None):
+    """
+    First day included in a dashboard period, or None for all time.
+
+    Matches the options of the dashboard selector: a number of days
+    counting today, 'qtd' (quarter to date) or 'all'.
+    """
+    today = today or timezone.localdate()
+    if period == 'all':
+        return None
+    if period == 'qtd':
+        return date(today.year, (today.month - 1) // 3 * 3 + 1, 1)
+    if period not in DASHBOARD_PERIODS:
+        raise ValueError(f"Invalid period. Use one of: {', '.join(DASHBOARD_PERIODS)}")
+    return today - timedelta(days=int(period) - 1)
+
+
+class LedgerSource:
+    """
+    Rows to aggregate for a user and period.
+
+    Periods that start on a month boundary (or cover all time) read the
+    monthly rollups, a few rows per month; periods that start mid-month
+    aggregate the raw transactions through the (user, transaction_date)
+    index.
+    """
+
+    def __init__(self, user, start=None):
+        self.use_rollups = start is None or start.day == 1
+        if self.use_rollups:
+            rows = TransactionMonthlyRollup.objects.filter(user=user)
+            if start:
+                rows = rows.filter(month__gte=start)
+            self.amount = 'total'
+        else:
+            rows = Transaction.objects.filter(user=user, transaction_date__gte=start)
+            self.amount = 'amount'
+        self.rows = rows
+
+    def total(self, **filters):
+        return Sum(self.amount, filter=Q(**filters) if filters else None)
+
+    def count(self, **filters):
+        condition = Q(**filters) if filters else None
+        if self.use_rollups:
+            return Sum('transaction_count', filter=condition)
+        return Count('id', filter=condition)
+
+
+def period_totals(source):
+    totals = source.rows.aggregate(
+        income=source.total(type='income'),
+        expense=source.total(type='expense'),
+        income_count=source.count(type='income'),
+        expense_count=source.count(type='expense'),
+    )
+    income = totals['income'] or Decimal('0')
+    expense = totals['expense'] or Decimal('0')
+    net = income - expense
+    return {
+        'income': money(income),
+        'expense': money(expense),
+        'net_balance': money(net),
+        'savings_rate': round(net / income * 100) if income > 0 else 0,
+        'income_transactions': totals['income_count'] or 0,
+        'expense_transactions': totals['expense_count'] or 0,
+    }
+
+
+def monthly_trend(user, today=None, months=TREND_MONTHS):
+    today = today or timezone.localdate()
+    first_month = shift_month(date(today.year, today.month, 1), -(months - 1))
+    rows = (
+        TransactionMonthlyRollup.objects
+        .filter(user=user, month__gte=first_month)
+        .values('month')
+        .annotate(
+            income=Sum('total', filter=Q(type='income')),
+            expense=Sum('total', filter=Q(type='expense')),
+        )
+        .order_by('month')
+    )
+    by_month = {row['month']: row for row in rows}
+    trend = []
+    for offset in range(months):
+        month = shift_month(first_month, offset)
+        row = by_month.get(month, {})
+        trend.append({
+            'month': month.strftime('%Y-%m'),
+            'income': money(row.get('income')),
+            'expense': money(row.get('expense')),
+        })
+    return trend
+
+
+def top_expense_categories(source, total_expense, limit=TOP_CATEGORIES):
+    rows = (
+        source.rows.filter(type='expense')
+        .values('category_id', 'category__name')
+        .annotate(amount_total=source.total())
+        .order_by('-amount_total')[:limit]
+    )
+    return [
+        {
+            'category_id': row['category_id'],
+            'category_name': row['category__name'] or 'Uncategorized',
+            'amount': money(row['amount_total']),
+            'percentage': round(row['amount_total'] / total_expense * 100) if total_expense else 0,
+        }
+        for row in rows
+    ]
+
+
+def category_total_subquery(type):
+    """
+    Correlated subquery: all-time total of one transaction type in the
+    outer row's category, read from the monthly rollups.
+    """
+    totals = (
+        TransactionMonthlyRollup.objects
+        .filter(user=OuterRef('user'), category=OuterRef('category'), type=type)
+        .values('category')
+        .annotate(amount_total=Sum('total'))
+        .values('amount_total')
+    )
+    return Coalesce(
+        Subquery(totals, output_field=DecimalField(max_digits=15, decimal_places=2)),
+        Value(Decimal('0')),
+        output_field=DecimalField(max_digits=15, decimal_places=2),
+    )
+
+
+def with_goal_progress(goals):
+    """Annotate goals with current_amount: income saved in their category."""
+    return goals.annotate(current_amount=category_total_subquery('income'))
+
+
+def with_debt_progress(debts):
+    """Annotate debts with paid_amount: expenses recorded in their category."""
+    return debts.annotate(paid_amount=category_total_subquery('expense'))
+
+
+def debt_remaining(debt):
+    return max(debt.total_with_interest - debt.paid_amount, Decimal('0'))
+
+
+def debt_totals(debts):
+    """Portfolio totals for debts annotated by with_debt_progress."""
+    total = sum((debt.total_with_interest for debt in debts), Decimal('0'))
+    paid = sum((debt.paid_amount for debt in debts), Decimal('0'))
+    return {
+        'total': money(total),
+        'paid': money(paid),
+        'remaining': money(sum((debt_remaining(debt) for debt in debts), Decimal('0'))),
+        'count': len(debts),
+    }
+
+
+PERIOD_MONTHS = {'monthly': 1, 'quarterly': 3, 'yearly': 12}
+
+
+def budget_window(budget, today=None):
+    """
+    Current period window of a budget as (first_day, last_day).
+
+    The window is the calendar month, quarter or year containing today,
+    clipped to the budget's start and end dates. Budgets that have not
+    started yet or have already ended use their first or last window.
+    """
+    today = today or timezone.localdate()
+    reference = max(today, budget.start_date)
+    if budget.end_date:
+        reference = min(reference, budget.end_date)
+
+    length = PERIOD_MONTHS.get(budget.period, 1)
+    first_month = (reference.month - 1) // length * length
+    first_day = date(reference.year, first_month + 1, 1)
+    last_day = shift_month(first_day, length) - timedelta(days=1)
+
+    first_day = max(first_day, budget.start_date)
+    if budget.end_date:
+        last_day = min(last_day, budget.end_date)
+    return first_day, last_day
+
+
+def budget_progress(user, budgets, today=None):
+    """
+    Spent, remaining and percentage for each budget, keyed by budget id.
+
+    Every budget is one conditional SUM over the user's expenses, so all
+    of them are computed by a single query that scans the union of their
+    windows once.
+    """
+    budgets = list(budgets)
+    if not budgets:
+        return {}
+
+    windows = {budget.id: budget_window(budget, today) for budget in budgets}
+    sums = {}
+    for budget in budgets:
+        first_day, last_day = windows[budget.id]
+        condition = Q(transaction_date__gte=first_day, transaction_date__lte=last_day)
+        if budget.category_id:
+            condition &= Q(category_id=budget.category_id)
+        sums[f'budget_{budget.id}'] = Sum('amount', filter=condition)
+
+    spent_by_budget = Transaction.objects.filter(
+        user=user,
+        type='expense',
+        transaction_date__gte=min(first for first, _ in windows.values()),
+        transaction_date__lte=max(last for _, last in windows.values()),
+    ).aggregate(**sums)
+
+    progress = {}
+    for budget in budgets:
+        spent = spent_by_budget[f'budget_{budget.id}'] or Decimal('0')
+        percentage = round(spent / budget.amount * 100) if budget.amount else 0
+        first_day, last_day = windows[budget.id]
+        progress[budget.id] = {
+            'period_start': first_day,
+            'period_end': last_day,
+            'spent': money(spent),
+            'remaining': money(max(budget.amount - spent, Decimal('0'))),
+            'percentage': percentage,
+            'alert': percentage >= budget.alert_percentage,
+        }
+    return progress
+
+
+def dashboard_summary(user, period):
+    today = timezone.localdate()
+    start = period_start(period, today)
+    source = LedgerSource(user, start)
+
+    totals = period_totals(source)
+    recent = Transaction.objects.filter(user=user).select_related('category')
+    if start:
+        recent = recent.filter(transaction_date__gte=start)
+    recent = recent.order_by('-transaction_date', '-id')[:RECENT_TRANSACTIONS]
+    return {
+        'period': period,
+        'start_date': start,
+        'end_date': today,
+        'totals': totals,
+        'monthly_trend': monthly_trend(user, today),
+        'top_categories': top_expense_categories(source, Decimal(totals['expense'])),
+        'debts': debt_totals(list(with_debt_progress(Debt.objects.filter(user=user)))),
+        'recent_transactions': recent,
+    }
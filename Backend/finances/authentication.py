@@ -1,13 +1,148 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
 from .models import User
 
 
+USER_CACHE_DEFAULTS = {
+    'MAX_SIZE': 1024,
+    'TTL': 60,
+    'SHARED_CACHE': None,
+}
+
+# Authentication never needs the password hash, so it is kept out of the
+# per-process and shared caches; cached users load it lazily if ever read.
+UNCACHED_FIELDS = ('password',)
+
+
+class UserCache:
+    """
+    Per-process LRU cache of authenticated users with a TTL.
+
+    Entries hold the user's field values, not the model instance, so every
+    request gets its own User object. The password hash is never cached.
+    When AUTH_USER_CACHE['SHARED_CACHE'] names a Django cache alias, misses
+    fall back to that cache before the database. Entries are dropped when a
+    User is saved or deleted (see finances.signals); the TTL bounds
+    staleness in other processes.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def config(self):
+        return {**USER_CACHE_DEFAULTS, **getattr(settings, 'AUTH_USER_CACHE', {})}
+
+    @property
+    def enabled(self):
+        config = self.config
+        return config['MAX_SIZE'] > 0 and config['TTL'] > 0
+
+    def _shared(self):
+        alias = self.config['SHARED_CACHE']
+        return caches[alias] if alias else None
+
+    @staticmethod
+    def _key(user_id):
+        return f'auth:user:{user_id}'
+
+    @staticmethod
+    def _build(values):
+        names = list(values)
+        return User.from_db('default', names, [values[name] for name in names])
+
+    def get(self, user_id):
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None:
+                expires, values = entry
+                if expires > now:
+                    self._entries.move_to_end(user_id)
+                    self.hits += 1
+                    return self._build(values)
+                del self._entries[user_id]
+
+        shared = self._shared()
+        values = shared.get(self._key(user_id)) if shared else None
+        with self._lock:
+            if values is None:
+                self.misses += 1
+                return None
+            self.shared_hits += 1
+        self._store_local(user_id, values)
+        return self._build(values)
+
+    def set(self, user):
+        if not self.enabled:
+            return
+        values = {
+            field.attname: getattr(user, field.attname)
+            for field in User._meta.concrete_fields
+            if field.attname not in UNCACHED_FIELDS
+        }
+        self._store_local(user.pk, values)
+        shared = self._shared()
+        if shared:
+            shared.set(self._key(user.pk), values, self.config['TTL'])
+
+    def _store_local(self, user_id, values):
+        config = self.config
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + config['TTL'], values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > config['MAX_SIZE']:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+        shared = self._shared()
+        if shared:
+            shared.delete(self._key(user_id))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = 0
+
+    def stats(self):
+        config = self.config
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'size': len(self._entries),
+                'max_size': config['MAX_SIZE'],
+                'ttl': config['TTL'],
+                'shared_cache': config['SHARED_CACHE'],
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.hits + self.shared_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+user_cache = UserCache()
+
+
 class CustomJWTAuthentication(JWTAuthentication):
     """
     Custom JWT authentication for our custom User model.
     """
-    
+
     def get_validated_token(self, raw_token):
         """
         Validate the JWT token.
@@ -19,20 +154,23 @@ class CustomJWTAuthentication(JWTAuthentication):
             raise AuthenticationFailed('Invalid token')
         except Exception as e:
             raise AuthenticationFailed(str(e))
-    
+
     def get_user(self, validated_token):
         """
-        Get the user from the validated token.
+        Get the user from the validated token, from the user cache when possible.
         """
         try:
             user_id = validated_token.get('user_id')
             if not user_id:
                 user_id = validated_token.get('id')
-            
+
             if not user_id:
                 raise AuthenticationFailed('Token contains no user_id')
-            
-            user = User.objects.get(id=user_id)
+
+            user = user_cache.get(user_id)
+            if user is None:
+                user = User.objects.defer(*UNCACHED_FIELDS).get(id=user_id)
+                user_cache.set(user)
             return user
         except User.DoesNotExist:
             raise AuthenticationFailed('User not found')
@@ -0,0 +1,68 @@
+from django.db import transaction
+from rest_framework import serializers
+
+from . import rollups, versions
+from .models import Category, Transaction
+from .serializers import TransactionSerializer
+
+
+MAX_ROWS = 5000
+BATCH_SIZE = 1000
+
+
+def first_error(detail):
+    """First message of a (possibly nested) DRF error detail."""
+    while isinstance(detail, (dict, list)) and detail:
+        detail = next(iter(detail.values())) if isinstance(detail, dict) else detail[0]
+    return str(detail)
+
+
+def build_transactions(request, rows):
+    """
+    Validate raw rows for request.user.
+
+    Returns (transactions, errors): unsaved Transaction objects for every
+    row, and a list of {'index', 'message'} for the rows that failed. One
+    serializer validates all rows and category ownership is checked with a
+    single query.
+    """
+    user = request.user
+    child = TransactionSerializer(context={'request': request})
+    validated, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            validated.append((index, child.run_validation(row)))
+        except serializers.ValidationError as e:
+            errors.append({'index': index, 'message': first_error(e.detail)})
+
+    category_ids = {data['category_id'] for _, data in validated if data.get('category_id')}
+    owned = set(
+        Category.objects.filter(user=user, id__in=category_ids).values_list('id', flat=True)
+    ) if category_ids else set()
+
+    transactions = []
+    for index, data in validated:
+        category_id = data.pop('category_id', None) or None
+        if category_id and category_id not in owned:
+            errors.append({'index': index, 'message': 'Category not found'})
+            continue
+        transactions.append(Transaction(user=user, category_id=category_id, **data))
+
+    errors.sort(key=lambda error: error['index'])
+    return transactions, errors
+
+
+def insert_transactions(transactions, batch_size=BATCH_SIZE):
+    """
+    Insert transactions with bulk_create in one atomic transaction.
+
+    bulk_create skips the model signals, so the monthly rollups and the
+    owners' data versions are updated here instead.
+    """
+    if not transactions:
+        return []
+    with transaction.atomic():
+        created = Transaction.objects.bulk_create(transactions, batch_size=batch_size)
+        rollups.apply_deltas(rollups.deltas_for(created))
+        versions.bump_many(tx.user_id for tx in created)
+    return created
@@ -0,0 +1,28 @@
+"""
+Database connection reuse, as reported by /api/system/metrics/.
+
+Without a pool each worker thread keeps one connection for CONN_MAX_AGE
+seconds. With DB_POOL the process shares a psycopg pool, and its
+counters (size, waiting requests, wait times, timeouts) show whether
+max_size fits the worker's threads.
+"""
+from django.db import connections
+
+
+def connection_stats():
+    stats = {}
+    for alias in connections:
+        connection = connections[alias]
+        settings_dict = connection.settings_dict
+        # connection.pool exists on the PostgreSQL backend and is None
+        # unless OPTIONS['pool'] is set.
+        pool = getattr(connection, 'pool', None)
+        stats[alias] = {
+            'vendor': connection.vendor,
+            'conn_max_age': settings_dict['CONN_MAX_AGE'],
+            'health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+            'server_side_cursors': not settings_dict.get('DISABLE_SERVER_SIDE_CURSORS', False),
+            'open': connection.connection is not None,
+            'pool': pool.get_stats() if pool is not None else None,
+        }
+    return stats
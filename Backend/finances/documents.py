@@ -0,0 +1,348 @@
+"""
+PDF and XLSX renderings of a financial report (see finances.reports).
+
+Both formats are written with the standard library: the PDF is plain
+text on A4 pages with the built-in Helvetica fonts, the XLSX a zip of
+SpreadsheetML parts with one sheet per report section. Transaction rows
+are consumed from an iterator and written as they come.
+"""
+import io
+import re
+import zipfile
+import zlib
+from datetime import date
+from decimal import Decimal
+from itertools import chain
+from xml.sax.saxutils import escape
+
+from .aggregates import money
+
+
+TITLE = 'Financial Report'
+TRANSACTION_HEADER = ('Date', 'Description', 'Category', 'Type', 'Amount')
+
+GREEN = (26, 127, 58)
+GREY = (100, 100, 100)
+BLACK = (0, 0, 0)
+HEADER_FILL = (232, 245, 233)
+
+
+# ── PDF ──────────────────────────────────────────────────────────
+
+def _pdf_text(value):
+    text = str(value).encode('cp1252', errors='replace').decode('latin-1')
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def _rgb(color):
+    return ' '.join(f'{channel / 255:.3f}' for channel in color)
+
+
+class PDFWriter:
+    """Text-only A4 pages, laid out top to bottom."""
+
+    WIDTH, HEIGHT = 595, 842
+    MARGIN = 42
+
+    def __init__(self):
+        self.pages = []
+        self.new_page()
+
+    def new_page(self):
+        self.ops = []
+        self.pages.append(self.ops)
+        self.y = self.HEIGHT - self.MARGIN
+
+    def room_for(self, height):
+        """Start a new page unless height points fit on this one."""
+        if self.y - height < self.MARGIN:
+            self.new_page()
+            return False
+        return True
+
+    def text(self, x, value, size=9, bold=False, color=BLACK):
+        font = 'F2' if bold else 'F1'
+        self.ops.append(
+            f'{_rgb(color)} rg BT /{font} {size} Tf {x} {self.y} Td ({_pdf_text(value)}) Tj ET'
+        )
+
+    def fill(self, x, width, height, color):
+        self.ops.append(f'{_rgb(color)} rg {x} {self.y - 3} {width} {height} re f')
+
+    def down(self, points):
+        self.y -= points
+
+    def output(self):
+        objects = [
+            b'<< /Type /Catalog /Pages 2 0 R >>',
+            None,  # page tree, written once the page ids are known
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>',
+        ]
+        page_ids = []
+        for number, ops in enumerate(self.pages, 1):
+            ops = ops + [
+                f'{_rgb(GREY)} rg BT /F1 8 Tf {self.WIDTH - self.MARGIN - 50} 20 Td '
+                f'(Page {number} of {len(self.pages)}) Tj ET'
+            ]
+            stream = zlib.compress('\n'.join(ops).encode('latin-1'))
+            objects.append(
+                b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(stream) + stream + b'\nendstream'
+            )
+            objects.append(
+                b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] '
+                b'/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>'
+                % (self.WIDTH, self.HEIGHT, len(objects))
+            )
+            page_ids.append(len(objects))
+        kids = ' '.join(f'{page_id} 0 R' for page_id in page_ids)
+        objects[1] = f'<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>'.encode()
+
+        out = io.BytesIO()
+        out.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(out.tell())
+            out.write(b'%d 0 obj\n' % number + body + b'\nendobj\n')
+        xref = out.tell()
+        out.write(b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1))
+        for offset in offsets:
+            out.write(b'%010d 00000 n \n' % offset)
+        out.write(
+            b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+        )
+        return out.getvalue()
+
+
+def _pdf_table(pdf, header, rows, widths, clip):
+    """Rows of cells at the given column widths, repeating the header on new pages."""
+    def write_header():
+        pdf.fill(pdf.MARGIN, sum(widths), 14, HEADER_FILL)
+        x = pdf.MARGIN
+        for title, width in zip(header, widths):
+            pdf.text(x + 2, title, bold=True)
+            x += width
+        pdf.down(16)
+
+    pdf.room_for(30)
+    write_header()
+    for row in rows:
+        if not pdf.room_for(12):
+            write_header()
+        x = pdf.MARGIN
+        for value, width, limit in zip(row, widths, clip):
+            value = str(value)
+            pdf.text(x + 2, value[:limit - 1] + '.' if len(value) > limit else value)
+            x += width
+        pdf.down(12)
+    pdf.down(12)
+
+
+def _pdf_heading(pdf, title):
+    pdf.room_for(40)
+    pdf.text(pdf.MARGIN, title, size=12, bold=True, color=GREEN)
+    pdf.down(18)
+
+
+def render_pdf(report):
+    pdf = PDFWriter()
+    pdf.text(pdf.MARGIN, TITLE, size=20, bold=True, color=GREEN)
+    pdf.down(22)
+    pdf.text(pdf.MARGIN, f"Report Period: {report['date_from']} to {report['date_to']}", size=10, color=GREY)
+    pdf.down(26)
+
+    totals = report['totals']
+    _pdf_heading(pdf, 'Summary')
+    for label, key in (('Total Income', 'income'), ('Total Expenses', 'expense'), ('Net Balance', 'net_balance')):
+        pdf.text(pdf.MARGIN + 8, f'{label}: ${money(totals[key])}', size=10)
+        pdf.down(14)
+    pdf.text(
+        pdf.MARGIN + 8,
+        f"Transactions: {totals['income_transactions']} income, {totals['expense_transactions']} expense",
+        size=10,
+    )
+    pdf.down(24)
+
+    if report['categories']:
+        _pdf_heading(pdf, 'Expenses by Category')
+        _pdf_table(
+            pdf, ('Category', 'Amount', '%'),
+            ((row['category_name'], f"${money(row['amount'])}", f"{row['percentage']}%") for row in report['categories']),
+            (240, 120, 60), (48, 20, 6),
+        )
+
+    if report['monthly']:
+        _pdf_heading(pdf, 'Monthly Trend')
+        _pdf_table(
+            pdf, ('Month', 'Income', 'Expenses'),
+            ((row['month'], f"${money(row['income'])}", f"${money(row['expense'])}") for row in report['monthly']),
+            (120, 120, 120), (10, 20, 20),
+        )
+
+    _pdf_heading(pdf, 'Transactions')
+    _pdf_table(
+        pdf, TRANSACTION_HEADER,
+        (
+            (day.isoformat(), description, category, type, f'${money(amount)}')
+            for day, description, category, type, amount in report['transactions']
+        ),
+        (70, 190, 110, 60, 81), (12, 36, 20, 10, 16),
+    )
+    return pdf.output()
+
+
+# ── XLSX ─────────────────────────────────────────────────────────
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+SPREADSHEET_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+RELATIONSHIP_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+
+# Indexes into cellXfs of the stylesheet below.
+STYLE_BOLD, STYLE_DATE, STYLE_MONEY = 1, 2, 3
+
+STYLES = f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<styleSheet xmlns="{SPREADSHEET_NS}">
+<numFmts count="1"><numFmt numFmtId="164" formatCode="#,##0.00"/></numFmts>
+<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font><font><b/><sz val="11"/><name val="Calibri"/></font></fonts>
+<fills count="2"><fill><patternFill patternType="none"/></fill><fill><patternFill patternType="gray125"/></fill></fills>
+<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>
+<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>
+<cellXfs count="4">
+<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>
+<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>
+<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>
+</cellXfs>
+<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>
+</styleSheet>'''
+
+EXCEL_EPOCH = date(1899, 12, 30)
+CONTROL_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _cell(ref, value, style=0):
+    if value is None or value == '':
+        return ''
+    if isinstance(value, date):
+        return f'<c r="{ref}" s="{style or STYLE_DATE}"><v>{(value - EXCEL_EPOCH).days}</v></c>'
+    style_attr = f' s="{style}"' if style else ''
+    if isinstance(value, (int, float, Decimal)):
+        return f'<c r="{ref}"{style_attr}><v>{value}</v></c>'
+    text = escape(CONTROL_CHARS.sub('', str(value)))
+    return f'<c r="{ref}" t="inlineStr"{style_attr}><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _write_sheet(archive, number, rows, widths):
+    """rows yields lists of (value, style) pairs or plain values."""
+    with archive.open(f'xl/worksheets/sheet{number}.xml', 'w') as part:
+        columns = ''.join(
+            f'<col min="{index}" max="{index}" width="{width}" customWidth="1"/>'
+            for index, width in enumerate(widths, 1)
+        )
+        part.write(
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<worksheet xmlns="{SPREADSHEET_NS}"><cols>{columns}</cols><sheetData>'.encode()
+        )
+        chunk = []
+        for line, row in enumerate(rows, 1):
+            cells = []
+            for column, cell in enumerate(row):
+                value, style = cell if isinstance(cell, tuple) else (cell, 0)
+                cells.append(_cell(f'{chr(65 + column)}{line}', value, style))
+            chunk.append(f'<row r="{line}">{"".join(cells)}</row>')
+            if len(chunk) == 1000:
+                part.write(''.join(chunk).encode())
+                chunk = []
+        part.write((''.join(chunk) + '</sheetData></worksheet>').encode())
+
+
+def _bold(*titles):
+    return [(title, STYLE_BOLD) for title in titles]
+
+
+def render_xlsx(report):
+    totals = report['totals']
+    sheets = [
+        ('Summary', (30, 18), [
+            [(TITLE, STYLE_BOLD)],
+            ['From', report['date_from']],
+            ['To', report['date_to']],
+            [],
+            ['Total Income', (totals['income'], STYLE_MONEY)],
+            ['Total Expenses', (totals['expense'], STYLE_MONEY)],
+            ['Net Balance', (totals['net_balance'], STYLE_MONEY)],
+            ['Income Transactions', totals['income_transactions']],
+            ['Expense Transactions', totals['expense_transactions']],
+        ]),
+        ('Categories', (30, 16, 10), [_bold('Category', 'Amount', '%')] + [
+            [row['category_name'], (row['amount'], STYLE_MONEY), row['percentage']]
+            for row in report['categories']
+        ]),
+        ('Monthly', (12, 16, 16), [_bold('Month', 'Income', 'Expenses')] + [
+            [row['month'], (row['income'], STYLE_MONEY), (row['expense'], STYLE_MONEY)]
+            for row in report['monthly']
+        ]),
+        ('Transactions', (12, 40, 24, 10, 14), chain(
+            [_bold(*TRANSACTION_HEADER)],
+            (
+                [day, description, category, type, (amount, STYLE_MONEY)]
+                for day, description, category, type, amount in report['transactions']
+            ),
+        )),
+    ]
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        overrides = ''.join(
+            f'<Override PartName="/xl/worksheets/sheet{number}.xml" '
+            f'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for number in range(1, len(sheets) + 1)
+        )
+        archive.writestr('[Content_Types].xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            '<Override PartName="/xl/styles.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+            f'{overrides}</Types>'
+        ))
+        archive.writestr('_rels/.rels', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+            'Target="xl/workbook.xml"/></Relationships>'
+        ))
+        archive.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            f'<workbook xmlns="{SPREADSHEET_NS}" xmlns:r="{RELATIONSHIP_NS}"><sheets>'
+            + ''.join(
+                f'<sheet name="{name}" sheetId="{number}" r:id="rId{number}"/>'
+                for number, (name, _, _) in enumerate(sheets, 1)
+            )
+            + '</sheets></workbook>'
+        ))
+        archive.writestr('xl/_rels/workbook.xml.rels', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + ''.join(
+                f'<Relationship Id="rId{number}" Type="{RELATIONSHIP_NS}/worksheet" '
+                f'Target="worksheets/sheet{number}.xml"/>'
+                for number in range(1, len(sheets) + 1)
+            )
+            + f'<Relationship Id="rId{len(sheets) + 1}" Type="{RELATIONSHIP_NS}/styles" Target="styles.xml"/>'
+            '</Relationships>'
+        ))
+        archive.writestr('xl/styles.xml', STYLES)
+        for number, (_, widths, rows) in enumerate(sheets, 1):
+            _write_sheet(archive, number, rows, widths)
+    return buffer.getvalue()
+
+
+RENDERERS = {
+    'pdf': (render_pdf, 'application/pdf'),
+    'xlsx': (render_xlsx, XLSX_CONTENT_TYPE),
+}
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+EXPORT_FORMATS = ('csv', 'ndjson')
+CHUNK_SIZE = 2000
+ROWS_PER_WRITE = 500
+
+COLUMNS = (
+    ('id', 'id'),
+    ('transaction_date', 'transaction_date'),
+    ('type', 'type'),
+    ('amount', 'amount'),
+    ('category_id', 'category_id'),
+    ('category_name', 'category__name'),
+    ('description', 'description'),
+    ('payment_method', 'payment_method'),
+    ('is_recurring', 'is_recurring'),
+    ('recurring_frequency', 'recurring_frequency'),
+    ('notes', 'notes'),
+    ('created_at', 'created_at'),
+)
+HEADER = [name for name, _ in COLUMNS]
+CATEGORY_NAME = HEADER.index('category_name')
+TEXT_COLUMNS = {HEADER.index(name) for name in ('category_name', 'description', 'recurring_frequency', 'notes')}
+
+# Spreadsheets evaluate cells starting with these as formulas.
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def export_rows(transactions, chunk_size=CHUNK_SIZE):
+    """
+    Ledger rows as tuples in HEADER order, newest first.
+
+    .iterator() reads through a server-side cursor on PostgreSQL (and in
+    chunk_size batches elsewhere), so no more than one chunk is in memory.
+    """
+    rows = (
+        transactions
+        .order_by('-transaction_date', '-id')
+        .values_list(*(lookup for _, lookup in COLUMNS))
+        .iterator(chunk_size=chunk_size)
+    )
+    for row in rows:
+        if row[CATEGORY_NAME] is None:
+            row = row[:CATEGORY_NAME] + ('Uncategorized',) + row[CATEGORY_NAME + 1:]
+        yield row
+
+
+def _csv_cell(index, value):
+    if index in TEXT_COLUMNS and isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_stream(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(HEADER)
+    # The header goes out before the first query so the download starts
+    # right away.
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    for count, row in enumerate(rows, 1):
+        writer.writerow([_csv_cell(index, value) for index, value in enumerate(row)])
+        if count % ROWS_PER_WRITE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def ndjson_stream(rows):
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(HEADER, row)), cls=DjangoJSONEncoder))
+        if len(lines) == ROWS_PER_WRITE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+STREAMS = {'csv': csv_stream, 'ndjson': ndjson_stream}
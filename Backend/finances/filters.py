@@ -0,0 +1,113 @@
+"""
+Query-string filters for transaction lists, applied in SQL.
+
+    ?date_from=2026-01-01&date_to=2026-03-31   inclusive date range
+    ?type=expense                               income or expense
+    ?category=3,7  ?category=none               category ids; none = uncategorized
+    ?payment_method=cash,debit_card
+    ?min_amount=10&max_amount=250.50            inclusive amount range
+    ?ordering=-amount                           see ORDERINGS
+
+Every filter narrows a (user, ...) composite index: date ranges and date
+ordering use tx_user_date_idx, type with a date range tx_user_type_date_idx,
+categories tx_user_cat_type_idx and amount ranges or ordering
+tx_user_amount_idx.
+"""
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.db.models import Q
+
+from .models import Transaction
+
+
+# ?ordering= values and the columns they sort on; id breaks ties.
+ORDERINGS = {
+    'date': ('transaction_date', 'id'),
+    '-date': ('-transaction_date', '-id'),
+    'amount': ('amount', 'id'),
+    '-amount': ('-amount', '-id'),
+    'created': ('created_at', 'id'),
+    '-created': ('-created_at', '-id'),
+}
+FILTER_PARAMS = ('date_from', 'date_to', 'type', 'category', 'payment_method', 'min_amount', 'max_amount')
+
+TYPES = {choice for choice, _ in Transaction.TYPE_CHOICES}
+PAYMENT_METHODS = {choice for choice, _ in Transaction.PAYMENT_METHOD_CHOICES}
+
+
+class InvalidFilter(ValueError):
+    """Raised when a filter in the query string cannot be used."""
+
+
+def _date(query_params, name):
+    try:
+        return date.fromisoformat(query_params[name])
+    except ValueError:
+        raise InvalidFilter(f'{name} must be a date (YYYY-MM-DD)')
+
+
+def _amount(query_params, name):
+    try:
+        value = Decimal(query_params[name])
+    except InvalidOperation:
+        raise InvalidFilter(f'{name} must be a number')
+    if not value.is_finite():
+        raise InvalidFilter(f'{name} must be a number')
+    return value
+
+
+def _choices(query_params, name, allowed):
+    values = {value.strip() for value in query_params[name].split(',') if value.strip()}
+    unknown = values - allowed
+    if unknown:
+        raise InvalidFilter(f"Invalid {name}: {', '.join(sorted(unknown))}")
+    return values
+
+
+def _categories(query_params):
+    condition = Q()
+    ids = set()
+    for value in query_params['category'].split(','):
+        value = value.strip().lower()
+        if value == 'none':
+            condition |= Q(category__isnull=True)
+        elif value.isdigit():
+            ids.add(int(value))
+        elif value:
+            raise InvalidFilter('category must be category ids or none')
+    if ids:
+        condition |= Q(category_id__in=ids)
+    return condition
+
+
+def filter_transactions(transactions, query_params):
+    """Apply the filters present in query_params to a transaction queryset."""
+    present = {name for name in FILTER_PARAMS if query_params.get(name)}
+    if not present:
+        return transactions
+
+    conditions = Q()
+    if 'date_from' in present:
+        conditions &= Q(transaction_date__gte=_date(query_params, 'date_from'))
+    if 'date_to' in present:
+        conditions &= Q(transaction_date__lte=_date(query_params, 'date_to'))
+    if 'type' in present:
+        conditions &= Q(type__in=_choices(query_params, 'type', TYPES))
+    if 'category' in present:
+        conditions &= _categories(query_params)
+    if 'payment_method' in present:
+        conditions &= Q(payment_method__in=_choices(query_params, 'payment_method', PAYMENT_METHODS))
+    if 'min_amount' in present:
+        conditions &= Q(amount__gte=_amount(query_params, 'min_amount'))
+    if 'max_amount' in present:
+        conditions &= Q(amount__lte=_amount(query_params, 'max_amount'))
+    return transactions.filter(conditions)
+
+
+def ordering(query_params, default='-created'):
+    """Columns for ?ordering=, or the default's when it is absent."""
+    value = query_params.get('ordering') or default
+    if value not in ORDERINGS:
+        raise InvalidFilter(f"Invalid ordering. Use one of: {', '.join(ORDERINGS)}")
+    return ORDERINGS[value]
@@ -0,0 +1,84 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken
+
+from finances.authentication import user_cache
+from finances.models import User
+from finances.views import get_tokens_for_user
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def legacy_view(request):
+    # What every budget, goal and debt view did before they moved onto
+    # DRF's pipeline: the default authenticator has already run, then the
+    # header is decoded again and the user fetched a second time.
+    auth_header = request.headers.get('Authorization', '')
+    token = auth_header.split(' ')[1]
+    user = User.objects.get(id=AccessToken(token)['id'])
+    return Response({'user': user.id})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def pipeline_view(request):
+    return Response({'user': request.user.id})
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure the per-request authentication overhead of the old manual '
+        'token handling against the shared DRF authentication pipeline. '
+        'Runs inside a transaction that is rolled back.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per case.')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = User.objects.create(
+                username='bench_auth', email='bench_auth@bench.local', password=''
+            )
+            header = f"Bearer {get_tokens_for_user(user)['token']}"
+            factory = APIRequestFactory()
+
+            results = {}
+            for cache in ('cold', 'warm'):
+                for path, view in (('legacy', legacy_view), ('pipeline', pipeline_view)):
+                    user_cache.clear()
+                    results[(path, cache)] = self.run_case(
+                        factory, header, view, cache == 'cold', options['requests']
+                    )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"\n{'path':<10} {'user cache':<11} {'median us':>10} {'p95 us':>10} {'queries':>8}")
+        for (path, cache), (median, p95, queries) in results.items():
+            self.stdout.write(f'{path:<10} {cache:<11} {median:>10.1f} {p95:>10.1f} {queries:>8.1f}')
+
+        for cache in ('cold', 'warm'):
+            speedup = results[('legacy', cache)][0] / results[('pipeline', cache)][0]
+            self.stdout.write(f'{cache} user cache: pipeline {speedup:.2f}x faster than legacy')
+
+    def run_case(self, factory, header, view, cold, count):
+        timings = []
+        with CaptureQueriesContext(connection) as ctx:
+            for _ in range(count):
+                if cold:
+                    user_cache.clear()
+                request = factory.get('/bench/', HTTP_AUTHORIZATION=header)
+                started = time.perf_counter()
+                response = view(request)
+                timings.append((time.perf_counter() - started) * 1_000_000)
+                assert response.status_code == 200, response.data
+        p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+        return statistics.median(timings), p95, len(ctx.captured_queries) / count
@@ -0,0 +1,241 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Sum
+
+from finances.models import User, Category, Transaction
+
+
+USERNAME_PREFIX = 'bench_idx_'
+BATCH_SIZE = 10000
+FIRST_DATE = date(2016, 1, 1)
+DAYS = 3650
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed a large transactions table and compare query plans and latency '
+        'with and without the per-user composite indexes. The indexes are '
+        'dropped and recreated on the configured database while it runs.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5_000_000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--categories', type=int, default=12, help='Categories per user.')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query.')
+        parser.add_argument('--keep', action='store_true', help='Keep the seeded rows afterwards.')
+
+    def handle(self, *args, **options):
+        if User.objects.filter(username__startswith=USERNAME_PREFIX).exists():
+            raise CommandError(
+                f'Benchmark users ({USERNAME_PREFIX}*) already exist; remove them first.'
+            )
+
+        users, categories = self.seed_owners(options['users'], options['categories'])
+        try:
+            started = time.perf_counter()
+            self.seed_transactions(users, categories, options['rows'])
+            self.analyze()
+            self.stdout.write(
+                f"Seeded {options['rows']:,} transactions for {len(users)} users "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+
+            cases = self.build_cases(users, categories)
+            indexes = Transaction._meta.indexes
+
+            with connection.schema_editor() as editor:
+                for index in indexes:
+                    editor.remove_index(Transaction, index)
+            try:
+                self.analyze()
+                before = self.run_cases(cases, options['repeat'], 'without composite indexes')
+            finally:
+                with connection.schema_editor() as editor:
+                    for index in indexes:
+                        editor.add_index(Transaction, index)
+            self.analyze()
+            after = self.run_cases(cases, options['repeat'], 'with composite indexes')
+
+            self.stdout.write('\nSummary (median ms)')
+            for name, _ in cases:
+                speedup = before[name] / after[name] if after[name] else float('inf')
+                self.stdout.write(
+                    f'  {name:<32} {before[name]:>10.2f} -> {after[name]:>8.2f}  ({speedup:.1f}x)'
+                )
+        finally:
+            if not options['keep']:
+                self.cleanup()
+
+    def seed_owners(self, user_count, category_count):
+        User.objects.bulk_create(
+            User(username=f'{USERNAME_PREFIX}{i}', email=f'{USERNAME_PREFIX}{i}@bench.local', password='')
+            for i in range(user_count)
+        )
+        users = list(
+            User.objects.filter(username__startswith=USERNAME_PREFIX)
+            .order_by('id').values_list('id', flat=True)
+        )
+        Category.objects.bulk_create(
+            Category(
+                user_id=user_id,
+                name=f'Category {n}',
+                type='income' if n == 0 else 'expense',
+            )
+            for user_id in users
+            for n in range(category_count)
+        )
+        categories = {}
+        for user_id, category_id in (
+            Category.objects.filter(user_id__in=users)
+            .order_by('user_id', 'id').values_list('user_id', 'id')
+        ):
+            categories.setdefault(user_id, []).append(category_id)
+        return users, categories
+
+    def seed_transactions(self, users, categories, rows):
+        if connection.vendor == 'postgresql':
+            self.seed_with_generate_series(users, categories, rows)
+            return
+
+        rng = random.Random(42)
+        batch = []
+        for n in range(rows):
+            user_id = users[n % len(users)]
+            batch.append(Transaction(
+                user_id=user_id,
+                category_id=rng.choice(categories[user_id]),
+                amount=Decimal(rng.randint(100, 100000)) / 100,
+                transaction_date=FIRST_DATE + timedelta(days=rng.randrange(DAYS)),
+                type='income' if n % 5 == 0 else 'expense',
+                description=f'Benchmark row {n}',
+            ))
+            if len(batch) >= BATCH_SIZE:
+                Transaction.objects.bulk_create(batch)
+                batch = []
+        if batch:
+            Transaction.objects.bulk_create(batch)
+
+    def seed_with_generate_series(self, users, categories, rows):
+        per_user = len(next(iter(categories.values())))
+        flat_categories = [c for user_id in users for c in categories[user_id]]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO transactions (
+                    user_id, category_id, amount, transaction_date, description,
+                    type, payment_method, is_recurring, notes, created_at, updated_at
+                )
+                SELECT
+                    (%(users)s::bigint[])[1 + g %% %(user_count)s],
+                    (%(categories)s::bigint[])[
+                        1 + (g %% %(user_count)s) * %(per_user)s + (g / %(user_count)s) %% %(per_user)s
+                    ],
+                    1 + ((g * 7919) %% 100000) / 100.0,
+                    %(first_date)s::date + (g * 31) %% %(days)s,
+                    'Benchmark row ' || g,
+                    CASE WHEN g %% 5 = 0 THEN 'income' ELSE 'expense' END,
+                    'cash', false, '',
+                    now() - ((g * 31) %% %(days)s) * interval '1 day',
+                    now()
+                FROM generate_series(0, %(rows)s - 1) AS g
+                """,
+                {
+                    'users': users,
+                    'user_count': len(users),
+                    'categories': flat_categories,
+                    'per_user': per_user,
+                    'first_date': FIRST_DATE,
+                    'days': DAYS,
+                    'rows': rows,
+                },
+            )
+
+    def build_cases(self, users, categories):
+        def latest_by_date(user_id):
+            return Transaction.objects.filter(user_id=user_id).order_by('-transaction_date', '-id')[:50]
+
+        def latest_by_created(user_id):
+            return Transaction.objects.filter(user_id=user_id).order_by('-created_at')[:50]
+
+        def category_type_total(user_id):
+            return (
+                Transaction.objects
+                .filter(user_id=user_id, category_id=categories[user_id][-1], type='expense')
+                .values('type').annotate(total=Sum('amount')).order_by()
+            )
+
+        def date_range_totals(user_id):
+            return (
+                Transaction.objects
+                .filter(user_id=user_id, transaction_date__range=(date(2020, 1, 1), date(2020, 3, 31)))
+                .values('type').annotate(total=Sum('amount')).order_by()
+            )
+
+        def filtered_page(user_id):
+            # GET /transactions/?type=expense&date_from=...&date_to=...&limit=50
+            return (
+                Transaction.objects
+                .filter(user_id=user_id, type='expense', transaction_date__range=(date(2020, 1, 1), date(2020, 12, 31)))
+                .order_by('-transaction_date', '-id')[:50]
+            )
+
+        def largest_in_amount_range(user_id):
+            # GET /transactions/?min_amount=500&max_amount=600&ordering=-amount
+            return (
+                Transaction.objects
+                .filter(user_id=user_id, amount__range=(Decimal('500'), Decimal('600')))
+                .order_by('-amount', '-id')[:50]
+            )
+
+        sample = random.Random(7).sample(users, min(len(users), 50))
+        return [
+            ('latest page by transaction_date', lambda i: latest_by_date(sample[i % len(sample)])),
+            ('latest page by created_at', lambda i: latest_by_created(sample[i % len(sample)])),
+            ('total per category and type', lambda i: category_type_total(sample[i % len(sample)])),
+            ('totals for a date range', lambda i: date_range_totals(sample[i % len(sample)])),
+            ('expenses in a date range', lambda i: filtered_page(sample[i % len(sample)])),
+            ('amount range by amount', lambda i: largest_in_amount_range(sample[i % len(sample)])),
+        ]
+
+    def run_cases(self, cases, repeat, label):
+        self.stdout.write(f'\n=== {label} ===')
+        medians = {}
+        for name, make_queryset in cases:
+            plan = make_queryset(0).explain(**self.explain_options())
+            timings = []
+            for i in range(repeat):
+                queryset = make_queryset(i)
+                started = time.perf_counter()
+                list(queryset)
+                timings.append((time.perf_counter() - started) * 1000)
+            medians[name] = statistics.median(timings)
+            p95 = sorted(timings)[max(0, int(len(timings) * 0.95) - 1)]
+            self.stdout.write(f'\n{name}: median {medians[name]:.2f} ms, p95 {p95:.2f} ms')
+            for line in plan.splitlines():
+                self.stdout.write(f'    {line}')
+        return medians
+
+    def explain_options(self):
+        if connection.vendor == 'postgresql':
+            return {'analyze': True, 'buffers': True}
+        return {}
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE transactions')
+
+    def cleanup(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'DELETE FROM transactions WHERE user_id IN '
+                '(SELECT id FROM users WHERE username LIKE %s)',
+                [f'{USERNAME_PREFIX}%'],
+            )
+        User.objects.filter(username__startswith=USERNAME_PREFIX).delete()
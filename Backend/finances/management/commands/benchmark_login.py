@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from finances.models import Category, Transaction, User
+from finances.passwords import password_hasher
+from finances.views import get_transactions, login
+
+
+EMAIL = 'bench_login@bench.local'
+PASSWORD = 'BenchLogin1'
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))] if ordered else 0.0
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure login throughput per core with the configured bcrypt cost and '
+        'hashing executor, and the latency of the transaction list while the '
+        'logins run. Creates one user and deletes it at the end.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=200, help='Logins in the burst.')
+        parser.add_argument('--clients', type=int, default=8, help='Concurrent login requests.')
+        parser.add_argument('--rounds', type=int, help='bcrypt cost (defaults to PASSWORD_HASHING["ROUNDS"]).')
+        parser.add_argument(
+            '--concurrency', type=int,
+            help='Hashing threads (defaults to PASSWORD_HASHING["MAX_CONCURRENCY"]). Set it to '
+                 '--clients to see what hashing on every request thread does to the other endpoints.',
+        )
+        parser.add_argument('--probes', type=int, default=50, help='Transaction list requests before the burst.')
+
+    def handle(self, *args, **options):
+        if User.objects.filter(email=EMAIL).exists():
+            raise CommandError(f'The benchmark user ({EMAIL}) already exists; remove it first.')
+
+        hashing = {**settings.PASSWORD_HASHING}
+        if options['rounds']:
+            hashing['ROUNDS'] = options['rounds']
+        if options['concurrency']:
+            hashing['MAX_CONCURRENCY'] = options['concurrency']
+        with override_settings(PASSWORD_HASHING=hashing):
+            user = User(username='bench_login', email=EMAIL)
+            user.set_password(PASSWORD)
+            user.save()
+            category = Category.objects.create(user=user, name='Groceries', type='expense')
+            Transaction.objects.bulk_create(
+                Transaction(
+                    user=user, category=category, amount=Decimal('12.50'), type='expense',
+                    transaction_date=date(2025, 1, 1) + timedelta(days=index), description=f'Purchase {index}',
+                )
+                for index in range(50)
+            )
+            try:
+                self.run(user, options)
+            finally:
+                user.delete()
+
+    def run(self, user, options):
+        factory = APIRequestFactory()
+        cores = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+
+        started = time.perf_counter()
+        user.check_password(PASSWORD)
+        check_ms = (time.perf_counter() - started) * 1000
+
+        def probe():
+            request = factory.get('/api/transactions/')
+            force_authenticate(request, user=user)
+            started = time.perf_counter()
+            get_transactions(request)
+            return (time.perf_counter() - started) * 1000
+
+        def sign_in():
+            request = factory.post('/api/login/', {'email': EMAIL, 'password': PASSWORD}, format='json')
+            started = time.perf_counter()
+            response = login(request)
+            return response.status_code, (time.perf_counter() - started) * 1000
+
+        idle = [probe() for _ in range(options['probes'])]
+
+        results, busy = [], []
+        remaining = iter(range(options['logins']))
+        lock, done = threading.Lock(), threading.Event()
+
+        def client():
+            try:
+                while True:
+                    with lock:
+                        if next(remaining, None) is None:
+                            return
+                    results.append(sign_in())
+            finally:
+                connection.close()
+
+        def probe_during_burst():
+            try:
+                # About 20 list requests per second alongside the logins.
+                while not done.wait(0.05):
+                    busy.append(probe())
+            finally:
+                connection.close()
+
+        prober = threading.Thread(target=probe_during_burst)
+        clients = [threading.Thread(target=client) for _ in range(options['clients'])]
+        prober.start()
+        started = time.perf_counter()
+        for thread in clients:
+            thread.start()
+        for thread in clients:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        done.set()
+        prober.join()
+
+        latencies = [ms for code, ms in results if code == 200]
+        rejected = sum(1 for code, _ in results if code == 503)
+        throughput = len(latencies) / elapsed
+        ceiling = 1000 / check_ms
+        hashing_cores = min(cores, password_hasher.max_concurrency)
+
+        stats = password_hasher.stats()
+        self.stdout.write(
+            f"\nbcrypt cost {stats['rounds']}, {stats['max_concurrency']} hashing threads, "
+            f"{cores} cores, {options['clients']} clients"
+        )
+        self.stdout.write(f'one password check:        {check_ms:>8.1f} ms  (ceiling {ceiling:.1f} logins/s per core)')
+        self.stdout.write(f'logins:                    {len(latencies):>8} ok, {rejected} rejected (503)')
+        self.stdout.write(f'throughput:                {throughput:>8.1f} logins/s')
+        self.stdout.write(
+            f'per hashing core:          {throughput / hashing_cores:>8.1f} logins/s '
+            f'({throughput / hashing_cores / ceiling:.0%} of ceiling)'
+        )
+        self.stdout.write(
+            f'login latency p50/p95:     {percentile(latencies, 0.5):>8.1f} / {percentile(latencies, 0.95):.1f} ms'
+        )
+        self.stdout.write(
+            f'transactions p50/p95:      {percentile(idle, 0.5):>8.1f} / {percentile(idle, 0.95):.1f} ms idle, '
+            f'{percentile(busy, 0.5):.1f} / {percentile(busy, 0.95):.1f} ms during the logins'
+        )
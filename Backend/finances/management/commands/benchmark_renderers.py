@@ -0,0 +1,72 @@
+import statistics
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from finances.models import Category, Transaction, User
+from finances.renderers import MessagePackRenderer, ORJSONRenderer, msgpack
+from finances.serializers import TransactionSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Render a list of serialized transactions with DRF\'s JSONRenderer, '
+        'the orjson renderer and, when msgpack is installed, the MessagePack '
+        'renderer. Needs no database rows: the transactions are built in memory.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000, help='Transactions in the list.')
+        parser.add_argument('--repeat', type=int, default=5, help='Renders per renderer.')
+
+    def handle(self, *args, **options):
+        data = TransactionSerializer(self.transactions(options['rows']), many=True).data
+
+        renderers = [('drf json', JSONRenderer()), ('orjson', ORJSONRenderer())]
+        if msgpack is not None:
+            renderers.append(('msgpack', MessagePackRenderer()))
+        else:
+            self.stdout.write('msgpack is not installed; skipping the MessagePack renderer')
+
+        results = {}
+        for name, renderer in renderers:
+            timings = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                body = renderer.render(data)
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = statistics.median(timings), len(body)
+
+        self.stdout.write(f"\n{options['rows']} transactions")
+        self.stdout.write(f"{'renderer':<10} {'median ms':>10} {'bytes':>12}")
+        for name, (median, size) in results.items():
+            self.stdout.write(f'{name:<10} {median:>10.1f} {size:>12}')
+
+        baseline = results['drf json'][0]
+        for name, (median, _) in results.items():
+            if name != 'drf json':
+                self.stdout.write(f'{name}: {baseline / median:.1f}x faster than drf json')
+
+    def transactions(self, count):
+        user = User(id=1, username='bench_renderers')
+        category = Category(id=1, user=user, name='Groceries', type='expense')
+        first_day = date(2025, 1, 1)
+        created_at = datetime(2025, 1, 1, 9, 30, tzinfo=timezone.utc)
+        return [
+            Transaction(
+                id=index + 1,
+                user=user,
+                category=category if index % 3 else None,
+                amount=Decimal(index % 100000) / 100 + Decimal('0.01'),
+                transaction_date=first_day + timedelta(days=index % 365),
+                description=f'Transaction {index}',
+                type='expense' if index % 4 else 'income',
+                payment_method='debit_card',
+                notes='Weekly supermarket' if index % 5 == 0 else '',
+                created_at=created_at + timedelta(minutes=index),
+            )
+            for index in range(count)
+        ]
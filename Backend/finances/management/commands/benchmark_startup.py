@@ -0,0 +1,103 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Run in a fresh interpreter per measurement: what a cold start does before
+# the first request (load settings and apps, build the middleware chain)
+# and while routing it (import the URLconf and the views).
+STARTUP_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+ready = time.perf_counter()
+from django.urls import resolve
+resolve('/api/login/')
+routed = time.perf_counter()
+print(json.dumps({
+    'setup_ms': (ready - started) * 1000,
+    'urls_ms': (routed - ready) * 1000,
+    'modules': len(sys.modules),
+}))
+'''
+
+
+def parse_importtime(stderr):
+    """
+    Microseconds per top-level package from `python -X importtime` output.
+    Only unindented entries are summed: their cumulative times include
+    everything imported under them, so nothing is counted twice.
+    """
+    packages = defaultdict(int)
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.startswith('  ') or not cumulative.strip().isdigit():
+            continue
+        packages[name.strip().split('.')[0]] += int(cumulative)
+    return packages
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure cold-start time of the WSGI application for each settings '
+        'module: a fresh interpreter per run, timing setup and the first URL '
+        'resolution, plus a `python -X importtime` breakdown by package.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', nargs='+', default=['core.settings', 'core.settings_api'],
+            help='Settings modules to compare.',
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Cold starts per settings module.')
+        parser.add_argument('--top', type=int, default=10, help='Packages listed in the import breakdown.')
+
+    def handle(self, *args, **options):
+        results = {}
+        for profile in options['profiles']:
+            runs = [self.cold_start(profile) for _ in range(options['repeat'])]
+            packages = parse_importtime(self.cold_start(profile, importtime=True)[1])
+            results[profile] = runs, packages
+
+        self.stdout.write(f"\nmedian of {options['repeat']} cold starts (ms)")
+        self.stdout.write(f"{'settings':<22} {'process':>9} {'setup':>9} {'urls':>9} {'modules':>8}")
+        for profile, (runs, _) in results.items():
+            wall = statistics.median(run[0] for run, _ in runs)
+            setup = statistics.median(run[1]['setup_ms'] for run, _ in runs)
+            urls = statistics.median(run[1]['urls_ms'] for run, _ in runs)
+            modules = runs[-1][0][1]['modules']
+            self.stdout.write(f'{profile:<22} {wall:>9.1f} {setup:>9.1f} {urls:>9.1f} {modules:>8}')
+
+        for profile, (_, packages) in results.items():
+            self.stdout.write(f'\n{profile}: import time by package (ms, -X importtime)')
+            ranked = sorted(packages.items(), key=lambda item: item[1], reverse=True)
+            for name, micros in ranked[:options['top']]:
+                self.stdout.write(f'  {name:<28} {micros / 1000:>8.1f}')
+
+    def cold_start(self, profile, importtime=False):
+        """((process ms, timings), stderr) of one fresh interpreter."""
+        command = [sys.executable]
+        if importtime:
+            command += ['-X', 'importtime']
+        command += ['-c', STARTUP_SCRIPT]
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': profile}
+
+        started = time.perf_counter()
+        process = subprocess.run(
+            command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        wall = (time.perf_counter() - started) * 1000
+        if process.returncode != 0:
+            raise CommandError(f'{profile} failed to start:\n{process.stderr[-2000:]}')
+        timings = json.loads(process.stdout.strip().splitlines()[-1])
+        return (wall, timings), process.stderr
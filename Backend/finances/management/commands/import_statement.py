@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from finances import importers
+from finances.models import User, Transaction
+
+
+class Command(BaseCommand):
+    help = (
+        'Import a bank statement (CSV, OFX/QFX or QIF) from a local file into '
+        "a user's transactions. Rows already imported are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--user', type=int, required=True, help='Id of the owner.')
+        parser.add_argument('--format', choices=importers.FORMATS, help='Defaults to the file extension.')
+        parser.add_argument('--chunk-size', type=int, default=importers.CHUNK_SIZE)
+        parser.add_argument('--date-format', help='strptime format of the dates, e.g. %%d/%%m/%%Y.')
+        parser.add_argument('--encoding', default='utf-8-sig')
+        parser.add_argument(
+            '--payment-method', default='bank_transfer',
+            choices=[choice for choice, _ in Transaction.PAYMENT_METHOD_CHOICES],
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(id=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['user']} not found")
+
+        try:
+            format = importers.detect_format(options['path'], options['format'])
+            with open(options['path'], 'rb') as binary:
+                report = importers.import_statement(
+                    user,
+                    importers.open_text(binary, options['encoding']),
+                    format,
+                    chunk_size=options['chunk_size'],
+                    date_format=options['date_format'],
+                    payment_method=options['payment_method'],
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        for error in report.errors:
+            self.stderr.write(f"line {error['line']}: {error['message']}")
+        self.stdout.write(
+            f'{report.rows} rows read: {report.created} created, {report.duplicates} duplicates '
+            f'skipped, {report.rejected} rejected in {report.seconds:.2f}s '
+            f'({report.rows_per_second} rows/s)'
+        )
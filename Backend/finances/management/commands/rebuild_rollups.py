@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from finances import rollups
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the monthly transaction rollups from the raw transactions '
+        'and verify them. With --check, only verify.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='Only compare rollups with the raw data.')
+        parser.add_argument('--user', type=int, action='append', dest='users', help='Limit to a user id (repeatable).')
+
+    def handle(self, *args, **options):
+        user_ids = options['users']
+
+        if not options['check']:
+            started = time.perf_counter()
+            buckets = rollups.rebuild(user_ids)
+            self.stdout.write(f'Rebuilt {buckets} rollup buckets in {time.perf_counter() - started:.2f}s')
+
+        mismatches = rollups.check(user_ids)
+        if mismatches:
+            for (user_id, month, category_id, type), expected, actual in mismatches[:50]:
+                self.stderr.write(
+                    f'user={user_id} month={month:%Y-%m} category={category_id} type={type}: '
+                    f'expected {expected}, found {actual}'
+                )
+            raise CommandError(f'{len(mismatches)} rollup buckets do not match the transactions')
+
+        self.stdout.write(self.style.SUCCESS('Rollups match the transactions'))
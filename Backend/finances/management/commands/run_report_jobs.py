@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from finances import reports
+
+
+class Command(BaseCommand):
+    help = (
+        'Render queued PDF/XLSX reports. Polls the queue until stopped; with '
+        '--once, exits when the queue is empty. Several workers can run side by side.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Exit once no job is waiting.')
+        parser.add_argument('--poll', type=float, default=2.0, help='Seconds between polls of an empty queue.')
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                close_old_connections()
+                job = reports.claim_job()
+                if job is None:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll'])
+                    continue
+
+                started = time.perf_counter()
+                reports.run_job(job)
+                message = (
+                    f'report {job.pk} ({job.format} {job.date_from}..{job.date_to}, user {job.user_id}): '
+                    f'{job.status} in {time.perf_counter() - started:.2f}s'
+                )
+                if job.status == 'ready':
+                    self.stdout.write(f'{message}, {job.size} bytes')
+                else:
+                    self.stderr.write(f'{message}: {job.error}')
+        except KeyboardInterrupt:
+            pass
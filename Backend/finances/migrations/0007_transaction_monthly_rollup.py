@@ -0,0 +1,61 @@
+# Generated by Django 5.0.1 on 2026-10-18 20:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def populate_rollups(apps, schema_editor):
+    Transaction = apps.get_model('finances', 'Transaction')
+    TransactionMonthlyRollup = apps.get_model('finances', 'TransactionMonthlyRollup')
+    rows = (
+        Transaction.objects
+        .annotate(month=TruncMonth('transaction_date'))
+        .values('user_id', 'month', 'category_id', 'type')
+        .annotate(total=Sum('amount'), transaction_count=Count('id'))
+        .order_by()
+    )
+    batch = []
+    for row in rows.iterator(chunk_size=1000):
+        batch.append(TransactionMonthlyRollup(**row))
+        if len(batch) >= 1000:
+            TransactionMonthlyRollup.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        TransactionMonthlyRollup.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0006_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('type', models.CharField(choices=[('income', 'Income'), ('expense', 'Expense')], max_length=20)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=15)),
+                ('transaction_count', models.IntegerField(default=0)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to='finances.category')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_rollups', to='finances.user')),
+            ],
+            options={
+                'db_table': 'transaction_monthly_rollups',
+                'ordering': ['month'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='transactionmonthlyrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'month', 'category', 'type'), name='rollup_unique_bucket'),
+        ),
+        migrations.AddConstraint(
+            model_name='transactionmonthlyrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('user', 'month', 'type'), name='rollup_unique_uncategorized'),
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
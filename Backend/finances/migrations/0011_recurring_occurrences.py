@@ -0,0 +1,54 @@
+# Generated by Django 5.0.1 on 2026-10-18 20:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+FREQUENCIES = ('daily', 'weekly', 'biweekly', 'monthly', 'quarterly', 'yearly')
+
+
+def normalize_frequencies(apps, schema_editor):
+    # The field was free text before it got choices; 'Monthly' and
+    # 'MONTHLY' are both the monthly frequency.
+    Transaction = apps.get_model('finances', 'Transaction')
+    for frequency in FREQUENCIES:
+        (
+            Transaction.objects
+            .filter(recurring_frequency__iexact=frequency)
+            .exclude(recurring_frequency=frequency)
+            .update(recurring_frequency=frequency)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0010_report_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='recurring_next_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='recurring_parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='occurrences', to='finances.transaction'),
+        ),
+        migrations.AlterField(
+            model_name='transaction',
+            name='recurring_frequency',
+            field=models.CharField(blank=True, choices=[('daily', 'Daily'), ('weekly', 'Weekly'), ('biweekly', 'Biweekly'), ('monthly', 'Monthly'), ('quarterly', 'Quarterly'), ('yearly', 'Yearly')], max_length=50, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(condition=models.Q(('is_recurring', True)), fields=['recurring_next_date', 'id'], name='tx_recurring_due_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='transaction',
+            constraint=models.UniqueConstraint(condition=models.Q(('recurring_parent__isnull', False)), fields=('recurring_parent', 'transaction_date'), name='tx_unique_occurrence'),
+        ),
+        migrations.RunPython(normalize_frequencies, migrations.RunPython.noop),
+    ]
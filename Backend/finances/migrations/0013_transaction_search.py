@@ -0,0 +1,24 @@
+# Generated by Django 5.0.1 on 2026-10-18 21:05
+
+from django.db import migrations
+
+
+def install_search(apps, schema_editor):
+    from finances import search
+    search.install(schema_editor.connection)
+
+
+def uninstall_search(apps, schema_editor):
+    from finances import search
+    search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finances', '0012_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search, uninstall_search),
+    ]
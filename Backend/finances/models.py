@@ -1,5 +1,6 @@
 from django.db import models
-import bcrypt
+
+from .passwords import PasswordHashingBusy, password_hasher
 
 class User(models.Model):
     PROVIDER_CHOICES = [
@@ -27,17 +28,21 @@ class User(models.Model):
         return True
     
     def set_password(self, raw_password):
-        self.password = bcrypt.hashpw(
-            raw_password.encode('utf-8'), 
-            bcrypt.gensalt()
-        ).decode('utf-8')
+        self.password = password_hasher.hash(raw_password)
 
     def check_password(self, raw_password):
-        return bcrypt.checkpw(
-            raw_password.encode('utf-8'), 
-            self.password.encode('utf-8')
-        )    
-        
+        valid = password_hasher.check(raw_password, self.password)
+        if valid and self.pk and password_hasher.needs_rehash(self.password):
+            # Stored with another cost than PASSWORD_HASHING['ROUNDS']:
+            # upgrade it now that the raw password is at hand. Skipped when
+            # the hasher is saturated; the next login tries again.
+            try:
+                self.password = password_hasher.rehash(raw_password)
+            except PasswordHashingBusy:
+                return valid
+            self.save(update_fields=['password', 'updated_at'])
+        return valid
+
     def __str__(self):
         return self.username
 
@@ -74,6 +79,14 @@ class Transaction(models.Model):
         ('debit_card', 'Debit Card'),
         ('bank_transfer', 'Bank Transfer'),
     ]
+    RECURRING_FREQUENCY_CHOICES = [
+        ('daily', 'Daily'),
+        ('weekly', 'Weekly'),
+        ('biweekly', 'Biweekly'),
+        ('monthly', 'Monthly'),
+        ('quarterly', 'Quarterly'),
+        ('yearly', 'Yearly'),
+    ]
     
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='transactions')
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name='transactions')
@@ -83,14 +96,49 @@ class Transaction(models.Model):
     type = models.CharField(max_length=20, choices=TYPE_CHOICES, default='expense')
     payment_method = models.CharField(max_length=20, choices=PAYMENT_METHOD_CHOICES, default='cash')
     is_recurring = models.BooleanField(default=False)
-    recurring_frequency = models.CharField(max_length=50, blank=True, null=True)
+    recurring_frequency = models.CharField(
+        max_length=50, choices=RECURRING_FREQUENCY_CHOICES, blank=True, null=True
+    )
+    # Occurrences generated from a recurring transaction point back to it;
+    # on the recurring transaction, recurring_next_date is the first
+    # occurrence not generated yet (finances.recurring).
+    recurring_parent = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='occurrences'
+    )
+    recurring_next_date = models.DateField(null=True, blank=True)
     notes = models.TextField(blank=True)
+    # Stable id of a row imported from a bank statement (finances.importers).
+    import_id = models.CharField(max_length=64, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = 'transactions'
         ordering = ['-transaction_date']
+        indexes = [
+            models.Index(fields=['user', 'transaction_date', 'id'], name='tx_user_date_idx'),
+            models.Index(fields=['user', 'created_at'], name='tx_user_created_idx'),
+            models.Index(fields=['user', 'category', 'type'], name='tx_user_cat_type_idx'),
+            models.Index(fields=['user', 'type', 'transaction_date', 'id'], name='tx_user_type_date_idx'),
+            models.Index(fields=['user', 'amount', 'id'], name='tx_user_amount_idx'),
+            models.Index(
+                fields=['recurring_next_date', 'id'],
+                condition=models.Q(is_recurring=True),
+                name='tx_recurring_due_idx',
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'import_id'],
+                condition=models.Q(import_id__isnull=False),
+                name='tx_unique_import_id',
+            ),
+            models.UniqueConstraint(
+                fields=['recurring_parent', 'transaction_date'],
+                condition=models.Q(recurring_parent__isnull=False),
+                name='tx_unique_occurrence',
+            ),
+        ]
     
     def __str__(self):
         cat_name = self.category.name if self.category else 'Uncategorized'
@@ -120,6 +168,9 @@ class Budget(models.Model):
     class Meta:
         db_table = 'budgets'
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['user', 'is_active', 'start_date'], name='budget_user_active_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.amount}"
@@ -153,6 +204,9 @@ class Goal(models.Model):
     class Meta:
         db_table = 'goals'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='goal_user_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.target_amount}"
@@ -184,6 +238,115 @@ class Debt(models.Model):
     class Meta:
         db_table = 'debts'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='debt_user_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} - {self.total_with_interest}"
+
+
+class TransactionMonthlyRollup(models.Model):
+    """
+    Running totals of transactions per user, month, category and type.
+
+    Kept in sync by the signal handlers in finances.signals and by the bulk
+    write paths; `python manage.py rebuild_rollups` recomputes it from the
+    raw transactions.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='monthly_rollups')
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, null=True, blank=True, related_name='monthly_rollups'
+    )
+    month = models.DateField()
+    type = models.CharField(max_length=20, choices=Transaction.TYPE_CHOICES)
+    total = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    transaction_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'transaction_monthly_rollups'
+        ordering = ['month']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'month', 'category', 'type'],
+                name='rollup_unique_bucket',
+            ),
+            models.UniqueConstraint(
+                fields=['user', 'month', 'type'],
+                condition=models.Q(category__isnull=True),
+                name='rollup_unique_uncategorized',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.type}: {self.total}"
+
+
+class UserDataVersion(models.Model):
+    """
+    Counter bumped on every write to a user's finance data.
+
+    List endpoints derive their ETag and Last-Modified from it (see
+    finances.versions), so a revalidation costs one primary-key lookup.
+    """
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name='data_version'
+    )
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'user_data_versions'
+
+    def __str__(self):
+        return f"{self.user_id} v{self.version}"
+
+
+class ReportJob(models.Model):
+    """
+    A financial report rendered by the background worker
+    (`python manage.py run_report_jobs`).
+
+    Jobs are keyed by user, format, period and the user's data version: a
+    request for a report that already exists for the current version
+    reuses the stored file instead of rendering it again.
+    """
+    FORMAT_CHOICES = [
+        ('pdf', 'PDF'),
+        ('xlsx', 'Excel'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='report_jobs')
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES)
+    date_from = models.DateField()
+    date_to = models.DateField()
+    data_version = models.BigIntegerField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    content = models.BinaryField(null=True, blank=True, editable=False)
+    size = models.IntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'report_jobs'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'format', 'date_from', 'date_to', 'data_version'],
+                name='report_unique_artifact',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='report_status_created_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.name} - {self.total_with_interest}"
\ No newline at end of file
+        return f"{self.format} {self.date_from}..{self.date_to} ({self.status})"
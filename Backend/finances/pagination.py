@@ -0,0 +1,86 @@
+import base64
+import binascii
+from datetime import date
+
+from django.db.models import Q
+
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class InvalidPage(ValueError):
+    """Raised when the cursor or limit sent by the client cannot be used."""
+
+
+def encode_cursor(transaction_date, pk):
+    raw = f"{transaction_date.isoformat()}:{pk}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        date_part, pk_part = raw.split(':', 1)
+        return date.fromisoformat(date_part), int(pk_part)
+    except (ValueError, UnicodeError, binascii.Error):
+        raise InvalidPage('Invalid cursor')
+
+
+def parse_limit(value):
+    if value in (None, ''):
+        return DEFAULT_PAGE_SIZE
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise InvalidPage('Limit must be a number')
+    if limit < 1:
+        raise InvalidPage('Limit must be greater than 0')
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def parse_offset(value):
+    if value in (None, ''):
+        return 0
+    try:
+        offset = int(value)
+    except (TypeError, ValueError):
+        raise InvalidPage('Offset must be a number')
+    if offset < 0:
+        raise InvalidPage('Offset must not be negative')
+    return offset
+
+
+def wants_cursor_page(query_params):
+    return 'cursor' in query_params or 'limit' in query_params
+
+
+def paginate_by_date(queryset, query_params):
+    """
+    Keyset pagination on (transaction_date, id), newest first.
+
+    Each page seeks past the last row of the previous one instead of using
+    OFFSET, so the cost per page does not grow with the scroll depth.
+    Returns (rows, next_cursor).
+    """
+    limit = parse_limit(query_params.get('limit'))
+    cursor = query_params.get('cursor')
+    if query_params.get('ordering', '-date') != '-date':
+        raise InvalidPage('Cursor pages are ordered by -date only')
+
+    queryset = queryset.order_by('-transaction_date', '-id')
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(transaction_date__lt=last_date) |
+            Q(transaction_date=last_date, id__lt=last_id)
+        )
+
+    rows = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.transaction_date, last.id)
+    return rows, next_cursor
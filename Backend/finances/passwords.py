@@ -0,0 +1,163 @@
+"""
+bcrypt password hashing on a bounded executor.
+
+A bcrypt hash or check at cost 12 takes about 250 ms of CPU. Run inline on
+the request threads, a burst of logins takes every core and the other
+endpoints wait behind it. Here hashing runs on at most MAX_CONCURRENCY
+threads per process. Up to MAX_QUEUE more requests wait for a thread, for
+at most TIMEOUT seconds; beyond that PasswordHashingBusy is raised and the
+view answers 503. bcrypt releases the GIL while it hashes, so the other
+request threads keep running.
+
+Settings live in PASSWORD_HASHING:
+
+    ROUNDS           bcrypt cost (log2 of the iterations) for new hashes
+    MAX_CONCURRENCY  hashing threads; 0 uses one per CPU
+    MAX_QUEUE        requests allowed to wait for a hashing thread
+    TIMEOUT          seconds a request waits before giving up
+
+Hashes made with another cost still verify. User.check_password rehashes
+them with ROUNDS on the next successful login (see needs_rehash).
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+
+
+PASSWORD_HASHING_DEFAULTS = {
+    'ROUNDS': 12,
+    'MAX_CONCURRENCY': 0,
+    'MAX_QUEUE': 32,
+    'TIMEOUT': 10.0,
+}
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when every hashing thread is taken and the queue is full or too slow."""
+
+
+def _hash(raw_password, rounds):
+    import bcrypt  # deferred: only register and login hash passwords
+    return bcrypt.hashpw(raw_password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check(raw_password, hashed):
+    import bcrypt
+    return bcrypt.checkpw(raw_password.encode('utf-8'), hashed.encode('utf-8'))
+
+
+def hash_cost(hashed):
+    """Cost of a '$2b$12$...' bcrypt hash, or None if it is not one."""
+    parts = hashed.split('$')
+    if len(parts) != 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._workers = 0
+        self.pending = 0
+        self.running = 0
+        self.hashes = 0
+        self.checks = 0
+        self.rehashes = 0
+        self.rejected = 0
+
+    @property
+    def config(self):
+        return {**PASSWORD_HASHING_DEFAULTS, **getattr(settings, 'PASSWORD_HASHING', {})}
+
+    @property
+    def max_concurrency(self):
+        return self.config['MAX_CONCURRENCY'] or os.cpu_count() or 1
+
+    def executor(self):
+        workers = self.max_concurrency
+        with self._lock:
+            if self._executor is None or self._workers != workers:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+                self._workers = workers
+            return self._executor
+
+    def _tracked(self, function, *args):
+        with self._lock:
+            self.running += 1
+        try:
+            return function(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def _release(self, future):
+        with self._lock:
+            self.pending -= 1
+
+    def _run(self, function, *args):
+        config = self.config
+        executor = self.executor()
+        with self._lock:
+            if self.pending >= self._workers + config['MAX_QUEUE']:
+                self.rejected += 1
+                raise PasswordHashingBusy('Too many sign-ins at once, try again shortly')
+            self.pending += 1
+        try:
+            future = executor.submit(self._tracked, function, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        # Released when the work is done or cancelled, not when the caller
+        # stops waiting: a timed-out hash keeps its thread until it finishes.
+        future.add_done_callback(self._release)
+        try:
+            return future.result(timeout=config['TIMEOUT'])
+        except TimeoutError:
+            future.cancel()
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashingBusy('Too many sign-ins at once, try again shortly')
+
+    def hash(self, raw_password):
+        hashed = self._run(_hash, raw_password, self.config['ROUNDS'])
+        with self._lock:
+            self.hashes += 1
+        return hashed
+
+    def check(self, raw_password, hashed):
+        valid = self._run(_check, raw_password, hashed)
+        with self._lock:
+            self.checks += 1
+        return valid
+
+    def rehash(self, raw_password):
+        hashed = self.hash(raw_password)
+        with self._lock:
+            self.rehashes += 1
+        return hashed
+
+    def needs_rehash(self, hashed):
+        return hash_cost(hashed) != self.config['ROUNDS']
+
+    def stats(self):
+        config = self.config
+        with self._lock:
+            return {
+                'rounds': config['ROUNDS'],
+                'max_concurrency': self.max_concurrency,
+                'max_queue': config['MAX_QUEUE'],
+                'running': self.running,
+                'waiting': self.pending - self.running,
+                'hashes': self.hashes,
+                'checks': self.checks,
+                'rehashes': self.rehashes,
+                'rejected': self.rejected,
+            }
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,181 @@
+"""
+Materialization of recurring transactions.
+
+A transaction with is_recurring set is a template: its own date is the
+first occurrence and its recurring_frequency spaces the following ones.
+materialize() creates the occurrences that are due up to a date as
+ordinary transactions pointing back to the template (recurring_parent)
+and moves the template's recurring_next_date past them.
+
+Templates are processed in batches of locked rows. Each batch inserts its
+occurrences, updates the rollups and data versions, and advances the next
+dates in one transaction. A run after downtime catches up on every
+missed occurrence. Running it twice creates nothing new, and the unique
+(recurring_parent, transaction_date) constraint guards against duplicates.
+"""
+import calendar
+import time
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .bulk import insert_transactions
+from .models import Transaction
+
+
+BATCH_SIZE = 1000
+# Occurrences generated per template and batch. A template further behind
+# (a daily one after a long outage) continues in the next pass of the run.
+MAX_OCCURRENCES = 100
+
+# (days, months) between occurrences.
+FREQUENCY_STEPS = {
+    'daily': (1, 0),
+    'weekly': (7, 0),
+    'biweekly': (14, 0),
+    'monthly': (0, 1),
+    'quarterly': (0, 3),
+    'yearly': (0, 12),
+}
+
+TEMPLATE_FIELDS = (
+    'id', 'user_id', 'category_id', 'amount', 'transaction_date', 'description', 'type',
+    'payment_method', 'notes', 'recurring_frequency', 'recurring_next_date',
+)
+
+
+def add_months(day, months):
+    """day shifted by whole months, clamped to the end of shorter months."""
+    index = day.year * 12 + day.month - 1 + months
+    year, month = index // 12, index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def occurrence_dates(anchor, frequency, start):
+    """
+    Occurrence dates of a schedule that started on anchor, from start on.
+
+    Dates are computed from the anchor rather than from each other, so a
+    monthly schedule that started on the 31st comes back to the 31st after
+    a shorter month.
+    """
+    days, months = FREQUENCY_STEPS[frequency]
+    if days:
+        n = max(1, -(-(start - anchor).days // days))
+        while True:
+            yield anchor + timedelta(days=n * days)
+            n += 1
+    n = max(1, ((start.year - anchor.year) * 12 + start.month - anchor.month) // months)
+    while True:
+        day = add_months(anchor, n * months)
+        if day >= start:
+            yield day
+        n += 1
+
+
+def due_templates(until, user_ids=None):
+    templates = Transaction.objects.filter(
+        Q(recurring_next_date__lte=until) | Q(recurring_next_date__isnull=True),
+        is_recurring=True,
+        recurring_parent__isnull=True,
+        recurring_frequency__in=FREQUENCY_STEPS,
+    )
+    if user_ids:
+        templates = templates.filter(user_id__in=user_ids)
+    return templates
+
+
+def plan_batch(templates, until):
+    """
+    Unsaved occurrences of a batch of templates up to until, setting each
+    template's recurring_next_date. Returns (occurrences, behind), where
+    behind is True when a template hit MAX_OCCURRENCES.
+    """
+    # Templates without a next date are new or were rescheduled: resume
+    # after their last occurrence, if any.
+    restarted = [template.id for template in templates if template.recurring_next_date is None]
+    last_dates = dict(
+        Transaction.objects.filter(recurring_parent_id__in=restarted)
+        .values('recurring_parent_id')
+        .annotate(last=Max('transaction_date'))
+        .values_list('recurring_parent_id', 'last')
+    ) if restarted else {}
+
+    occurrences, behind = [], False
+    for template in templates:
+        start = template.recurring_next_date
+        if start is None:
+            start = max(template.transaction_date, last_dates.get(template.id, template.transaction_date))
+            start += timedelta(days=1)
+
+        dates = occurrence_dates(template.transaction_date, template.recurring_frequency, start)
+        day = next(dates)
+        for _ in range(MAX_OCCURRENCES):
+            if day > until:
+                break
+            occurrences.append(Transaction(
+                user_id=template.user_id,
+                category_id=template.category_id,
+                amount=template.amount,
+                transaction_date=day,
+                description=template.description,
+                type=template.type,
+                payment_method=template.payment_method,
+                notes=template.notes,
+                recurring_parent_id=template.id,
+            ))
+            day = next(dates)
+        else:
+            behind = behind or day <= until
+        template.recurring_next_date = day
+    return occurrences, behind
+
+
+class MaterializeReport:
+    def __init__(self):
+        self.templates = 0
+        self.created = 0
+        self.batches = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self):
+        return round(self.created / self.seconds) if self.seconds else 0
+
+
+def materialize(until=None, batch_size=BATCH_SIZE, user_ids=None):
+    """Create every occurrence due up to until (default today). Returns a MaterializeReport."""
+    until = until or timezone.localdate()
+    report = MaterializeReport()
+    started = time.perf_counter()
+
+    behind = True
+    while behind:
+        behind, last_id = False, 0
+        while True:
+            with transaction.atomic():
+                # SKIP LOCKED leaves templates held by a concurrent run to it.
+                templates = list(
+                    due_templates(until, user_ids)
+                    .filter(id__gt=last_id)
+                    .order_by('id')
+                    .only(*TEMPLATE_FIELDS)
+                    .select_for_update(skip_locked=True)[:batch_size]
+                )
+                if not templates:
+                    break
+                last_id = templates[-1].id
+
+                occurrences, batch_behind = plan_batch(templates, until)
+                insert_transactions(occurrences)
+                Transaction.objects.bulk_update(templates, ['recurring_next_date'], batch_size=batch_size)
+
+            behind = behind or batch_behind
+            report.batches += 1
+            report.templates += len(templates)
+            report.created += len(occurrences)
+
+    report.seconds = time.perf_counter() - started
+    return report
@@ -0,0 +1,188 @@
+"""
+Server-side financial reports.
+
+A request records a ReportJob; the worker (`python manage.py
+run_report_jobs`) claims pending jobs, renders them with
+finances.documents and stores the file on the job. Jobs are unique per
+user, format, period and data version, so asking again for an unchanged
+period returns the stored file, and any write to the user's data makes
+the next request render a fresh one.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+
+from . import versions
+from .aggregates import CENT
+from .documents import RENDERERS
+from .models import ReportJob, Transaction
+
+
+DEFAULT_DAYS = 90
+CHUNK_SIZE = 2000
+# Running jobs not finished after this long are assumed to belong to a
+# worker that died, and are claimed again.
+STALE_AFTER = timedelta(minutes=15)
+
+
+def report_period(date_from=None, date_to=None):
+    """(date_from, date_to) of a report; defaults to the last 90 days."""
+    date_to = date_to or timezone.localdate()
+    date_from = date_from or date_to - timedelta(days=DEFAULT_DAYS - 1)
+    if date_from > date_to:
+        raise ValueError('date_from must be before date_to')
+    return date_from, date_to
+
+
+def report_data(user, date_from, date_to, chunk_size=CHUNK_SIZE):
+    """
+    Totals, expense breakdown by category, monthly trend and the
+    transaction table of a period. The transactions are an iterator, read
+    in chunks while the document is written.
+    """
+    transactions = Transaction.objects.filter(
+        user=user, transaction_date__gte=date_from, transaction_date__lte=date_to
+    )
+    zero = Decimal('0')
+    totals = transactions.aggregate(
+        income=Coalesce(Sum('amount', filter=Q(type='income')), zero),
+        expense=Coalesce(Sum('amount', filter=Q(type='expense')), zero),
+        income_transactions=Count('id', filter=Q(type='income')),
+        expense_transactions=Count('id', filter=Q(type='expense')),
+    )
+    for key in ('income', 'expense'):
+        totals[key] = totals[key].quantize(CENT)
+    totals['net_balance'] = totals['income'] - totals['expense']
+
+    categories = (
+        transactions.filter(type='expense')
+        .values('category__name')
+        .annotate(amount=Sum('amount'))
+        .order_by('-amount')
+    )
+    monthly = (
+        transactions
+        .annotate(month=TruncMonth('transaction_date'))
+        .values('month')
+        .annotate(
+            income=Coalesce(Sum('amount', filter=Q(type='income')), zero),
+            expense=Coalesce(Sum('amount', filter=Q(type='expense')), zero),
+        )
+        .order_by('month')
+    )
+    rows = (
+        transactions
+        .order_by('transaction_date', 'id')
+        .values_list('transaction_date', 'description', 'category__name', 'type', 'amount')
+        .iterator(chunk_size=chunk_size)
+    )
+    return {
+        'date_from': date_from,
+        'date_to': date_to,
+        'totals': totals,
+        'categories': [
+            {
+                'category_name': row['category__name'] or 'Uncategorized',
+                'amount': row['amount'].quantize(CENT),
+                'percentage': round(row['amount'] / totals['expense'] * 100) if totals['expense'] else 0,
+            }
+            for row in categories
+        ],
+        'monthly': [
+            {
+                'month': row['month'].strftime('%Y-%m'),
+                'income': row['income'].quantize(CENT),
+                'expense': row['expense'].quantize(CENT),
+            }
+            for row in monthly
+        ],
+        'transactions': (
+            (day, description or '', category or 'Uncategorized', type, amount)
+            for day, description, category, type, amount in rows
+        ),
+    }
+
+
+def request_report(user, format, date_from, date_to):
+    """
+    The job for a report of the user's current data, created if needed.
+    A job that failed is queued again.
+    """
+    version, _ = versions.current(user.pk)
+    job, _ = ReportJob.objects.defer('content').get_or_create(
+        user=user, format=format, date_from=date_from, date_to=date_to, data_version=version
+    )
+    if job.status == 'failed':
+        ReportJob.objects.filter(pk=job.pk, status='failed').update(status='pending', error='')
+        job.status, job.error = 'pending', ''
+    return job
+
+
+def claim_job():
+    """
+    Mark the oldest waiting job as running and return it, or None.
+
+    SKIP LOCKED lets several workers poll the queue on PostgreSQL without
+    waiting on each other; the conditional update makes sure only one of
+    them wins a job on databases without row locks.
+    """
+    now = timezone.now()
+    waiting = Q(status='pending') | Q(status='running', started_at__lt=now - STALE_AFTER)
+    with transaction.atomic():
+        job = (
+            ReportJob.objects.select_for_update(skip_locked=True)
+            .defer('content')
+            .filter(waiting)
+            .order_by('created_at')
+            .first()
+        )
+        if job is None:
+            return None
+        claimed = ReportJob.objects.filter(
+            pk=job.pk, status=job.status, started_at=job.started_at
+        ).update(status='running', started_at=now)
+    if not claimed:
+        return None
+    job.status, job.started_at = 'running', now
+    return job
+
+
+def run_job(job):
+    """Render a claimed job and store the file, or record why it failed."""
+    render, _ = RENDERERS[job.format]
+    try:
+        content = render(report_data(job.user_id, job.date_from, job.date_to))
+    except Exception as e:
+        print(f"Error in report job {job.pk}: {e}")
+        ReportJob.objects.filter(pk=job.pk).update(
+            status='failed', error=str(e), finished_at=timezone.now()
+        )
+        job.status, job.error = 'failed', str(e)
+        return job
+
+    job.content, job.size = content, len(content)
+    job.status, job.finished_at = 'ready', timezone.now()
+    job.save(update_fields=['content', 'size', 'status', 'finished_at'])
+
+    # Files rendered from older data of the same report are never served again.
+    ReportJob.objects.filter(
+        user_id=job.user_id, format=job.format, date_from=job.date_from,
+        date_to=job.date_to, data_version__lt=job.data_version,
+    ).delete()
+    return job
+
+
+def run_pending(limit=None):
+    """Run queued jobs until the queue is empty (or limit jobs ran)."""
+    done = 0
+    while limit is None or done < limit:
+        job = claim_job()
+        if job is None:
+            break
+        run_job(job)
+        done += 1
+    return done
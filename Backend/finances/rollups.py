@@ -0,0 +1,179 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+from . import versions
+from .models import Transaction, TransactionMonthlyRollup
+
+
+REBUILD_BATCH_SIZE = 1000
+APPLY_RETRIES = 3
+
+
+def month_start(value):
+    if isinstance(value, str):
+        value = date.fromisoformat(value)
+    return date(value.year, value.month, 1)
+
+
+def rollup_key(user_id, transaction_date, category_id, type):
+    return (user_id, month_start(transaction_date), category_id, type)
+
+
+def new_deltas():
+    return defaultdict(lambda: [Decimal('0'), 0])
+
+
+def add_transaction(deltas, tx, sign=1):
+    """Accumulate one transaction (sign=-1 to remove it) into a delta map."""
+    bucket = deltas[rollup_key(tx.user_id, tx.transaction_date, tx.category_id, tx.type)]
+    bucket[0] += sign * Decimal(str(tx.amount))
+    bucket[1] += sign
+
+
+def deltas_for(transactions, sign=1):
+    deltas = new_deltas()
+    for tx in transactions:
+        add_transaction(deltas, tx, sign)
+    return deltas
+
+
+def apply_deltas(deltas):
+    """
+    Add a {(user_id, month, category_id, type): [total, count]} map to the
+    rollup table with one locking select plus bulk writes, whatever the
+    number of buckets. Buckets that drop to zero transactions are removed.
+    """
+    deltas = {key: value for key, value in deltas.items() if value[0] or value[1]}
+    if not deltas:
+        return
+
+    for attempt in range(APPLY_RETRIES):
+        try:
+            with transaction.atomic():
+                _apply(deltas)
+            return
+        except IntegrityError:
+            # A concurrent writer created one of the missing buckets first;
+            # the next attempt will find and lock it.
+            if attempt == APPLY_RETRIES - 1:
+                raise
+
+
+def _apply(deltas):
+    user_ids = {key[0] for key in deltas}
+    months = {key[1] for key in deltas}
+    existing = {
+        (row.user_id, row.month, row.category_id, row.type): row
+        for row in TransactionMonthlyRollup.objects.select_for_update().filter(
+            user_id__in=user_ids, month__in=months
+        )
+    }
+
+    to_update, to_create, to_delete = [], [], []
+    for key, (total, count) in deltas.items():
+        row = existing.get(key)
+        if row is None:
+            user_id, month, category_id, type = key
+            to_create.append(TransactionMonthlyRollup(
+                user_id=user_id, month=month, category_id=category_id, type=type,
+                total=total, transaction_count=count,
+            ))
+            continue
+        row.total += total
+        row.transaction_count += count
+        if row.transaction_count <= 0:
+            to_delete.append(row.pk)
+        else:
+            to_update.append(row)
+
+    if to_delete:
+        TransactionMonthlyRollup.objects.filter(pk__in=to_delete).delete()
+    if to_update:
+        TransactionMonthlyRollup.objects.bulk_update(to_update, ['total', 'transaction_count'])
+    if to_create:
+        TransactionMonthlyRollup.objects.bulk_create(to_create)
+
+
+def aggregate_transactions(transactions):
+    """Group raw transactions into rollup buckets, computed by the database."""
+    return (
+        transactions
+        .annotate(month=TruncMonth('transaction_date'))
+        .values('user_id', 'month', 'category_id', 'type')
+        .annotate(total=Sum('amount'), transaction_count=Count('id'))
+        .order_by()
+    )
+
+
+def rebuild(user_ids=None):
+    """
+    Recompute the rollups from scratch. Returns the number of buckets.
+
+    Every user whose rollups were rebuilt gets a data version bump, so
+    ETags and cached responses built from the old numbers are dropped.
+    """
+    transactions = Transaction.objects.all()
+    rollups = TransactionMonthlyRollup.objects.all()
+    if user_ids:
+        transactions = transactions.filter(user_id__in=user_ids)
+        rollups = rollups.filter(user_id__in=user_ids)
+
+    created = 0
+    with transaction.atomic():
+        affected = set(rollups.values_list('user_id', flat=True).distinct())
+        rollups.delete()
+        batch = []
+        for row in aggregate_transactions(transactions).iterator(chunk_size=REBUILD_BATCH_SIZE):
+            affected.add(row['user_id'])
+            batch.append(TransactionMonthlyRollup(
+                user_id=row['user_id'],
+                month=month_start(row['month']),
+                category_id=row['category_id'],
+                type=row['type'],
+                total=row['total'],
+                transaction_count=row['transaction_count'],
+            ))
+            if len(batch) >= REBUILD_BATCH_SIZE:
+                TransactionMonthlyRollup.objects.bulk_create(batch)
+                created += len(batch)
+                batch = []
+        if batch:
+            TransactionMonthlyRollup.objects.bulk_create(batch)
+            created += len(batch)
+        versions.bump_many(affected)
+    return created
+
+
+def check(user_ids=None):
+    """
+    Compare the rollups with the raw transactions.
+
+    Returns a list of (key, expected, actual) tuples, where expected and
+    actual are (total, count) pairs or None for a missing bucket.
+    """
+    transactions = Transaction.objects.all()
+    rollups = TransactionMonthlyRollup.objects.all()
+    if user_ids:
+        transactions = transactions.filter(user_id__in=user_ids)
+        rollups = rollups.filter(user_id__in=user_ids)
+
+    expected = {
+        (row['user_id'], month_start(row['month']), row['category_id'], row['type']):
+            (row['total'], row['transaction_count'])
+        for row in aggregate_transactions(transactions).iterator()
+    }
+    actual = {
+        (row.user_id, row.month, row.category_id, row.type): (row.total, row.transaction_count)
+        for row in rollups.iterator()
+    }
+
+    mismatches = []
+    for key in sorted(expected.keys() | actual.keys(), key=str):
+        if expected.get(key) != actual.get(key):
+            mismatches.append((key, expected.get(key), actual.get(key)))
+    return mismatches
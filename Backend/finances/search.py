@@ -0,0 +1,223 @@
+"""
+Ranked search over transaction descriptions and notes.
+
+PostgreSQL: a pg_trgm GIN index on description || ' ' || notes serves
+both substring (ILIKE) and fuzzy word (<%) matches, and results are
+ranked by word_similarity.
+
+SQLite: an external-content FTS5 table (transactions_fts) is kept in
+sync by triggers. user_id is indexed in it too, so a query only walks the
+user's postings instead of every match in the table. Words match by
+prefix (with prefix indexes for two and three characters) and results
+are ranked by bm25. A search runs one MATCH, joined to transactions as a
+derived table, so ranking stays linear in the number of matches.
+
+Other databases fall back to an unindexed icontains scan ordered by date.
+
+install() runs in migration 0013. On SQLite, migrations that rebuild the
+transactions table drop its triggers, so ensure_index() runs after every
+migrate to recreate them and refill the table.
+"""
+import re
+
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.sql.constants import INNER, LOUTER
+
+
+MAX_QUERY_LENGTH = 200
+
+POSTGRES_INSTALL = [
+    'CREATE EXTENSION IF NOT EXISTS pg_trgm',
+    "CREATE INDEX IF NOT EXISTS tx_search_trgm_idx ON transactions "
+    "USING gin ((description || ' ' || notes) gin_trgm_ops)",
+]
+POSTGRES_UNINSTALL = ['DROP INDEX IF EXISTS tx_search_trgm_idx']
+# Must match the indexed expression for the planner to use the index.
+POSTGRES_DOCUMENT = "(transactions.description || ' ' || transactions.notes)"
+
+SQLITE_TABLE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5("
+    "description, notes, user_id, content='transactions', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+)
+SQLITE_TRIGGERS = {
+    'transactions_fts_insert': (
+        "CREATE TRIGGER IF NOT EXISTS transactions_fts_insert AFTER INSERT ON transactions BEGIN "
+        "INSERT INTO transactions_fts(rowid, description, notes, user_id) "
+        "VALUES (new.id, new.description, new.notes, new.user_id); END"
+    ),
+    'transactions_fts_delete': (
+        "CREATE TRIGGER IF NOT EXISTS transactions_fts_delete AFTER DELETE ON transactions BEGIN "
+        "INSERT INTO transactions_fts(transactions_fts, rowid, description, notes, user_id) "
+        "VALUES ('delete', old.id, old.description, old.notes, old.user_id); END"
+    ),
+    'transactions_fts_update': (
+        "CREATE TRIGGER IF NOT EXISTS transactions_fts_update "
+        "AFTER UPDATE OF description, notes, user_id ON transactions BEGIN "
+        "INSERT INTO transactions_fts(transactions_fts, rowid, description, notes, user_id) "
+        "VALUES ('delete', old.id, old.description, old.notes, old.user_id); "
+        "INSERT INTO transactions_fts(rowid, description, notes, user_id) "
+        "VALUES (new.id, new.description, new.notes, new.user_id); END"
+    ),
+}
+# One FTS pass yields every match with its bm25 score, negated so higher
+# is better; the user_id column does not weigh in.
+SQLITE_MATCHES = (
+    'SELECT rowid, -bm25(transactions_fts, 1.0, 1.0, 0.0) AS rank '
+    'FROM transactions_fts WHERE transactions_fts MATCH %s'
+)
+SQLITE_REBUILD = "INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')"
+SQLITE_UNINSTALL = [f'DROP TRIGGER IF EXISTS {name}' for name in SQLITE_TRIGGERS] + [
+    'DROP TABLE IF EXISTS transactions_fts',
+]
+
+WORD = re.compile(r'\w+')
+
+
+class InvalidSearch(ValueError):
+    """Raised when the search query cannot be used."""
+
+
+class MatchJoin:
+    """
+    INNER JOIN of SQLITE_MATCHES as a derived table, in the shape
+    Query.alias_map expects of its entries (see sql.datastructures.Join).
+    """
+
+    table_name = 'transactions_fts_match'
+    nullable = False
+    filtered_relation = None
+
+    def __init__(self, match, parent_alias, table_alias=None, join_type=INNER):
+        self.match = match
+        self.parent_alias = parent_alias
+        self.table_alias = table_alias
+        self.join_type = join_type
+
+    def as_sql(self, compiler, connection):
+        qn = connection.ops.quote_name
+        return (
+            f'{self.join_type} ({SQLITE_MATCHES}) {qn(self.table_alias)} '
+            f'ON ({qn(self.table_alias)}.rowid = {qn(self.parent_alias)}.{qn("id")})'
+        ), [self.match]
+
+    def relabeled_clone(self, change_map):
+        return self.__class__(
+            self.match,
+            change_map.get(self.parent_alias, self.parent_alias),
+            change_map.get(self.table_alias, self.table_alias),
+            self.join_type,
+        )
+
+    @property
+    def identity(self):
+        return self.__class__, self.match, self.parent_alias
+
+    def __eq__(self, other):
+        if not isinstance(other, MatchJoin):
+            return NotImplemented
+        return self.identity == other.identity
+
+    def __hash__(self):
+        return hash(self.identity)
+
+    def demote(self):
+        return self.relabeled_clone({})
+
+    def promote(self):
+        new = self.relabeled_clone({})
+        new.join_type = LOUTER
+        return new
+
+
+def install(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            for sql in POSTGRES_INSTALL:
+                cursor.execute(sql)
+        elif connection.vendor == 'sqlite':
+            cursor.execute(SQLITE_TABLE)
+            for sql in SQLITE_TRIGGERS.values():
+                cursor.execute(sql)
+            cursor.execute(SQLITE_REBUILD)
+
+
+def uninstall(connection):
+    statements = {'postgresql': POSTGRES_UNINSTALL, 'sqlite': SQLITE_UNINSTALL}.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def ensure_index(connection):
+    """Recreate missing SQLite triggers and refill the FTS table."""
+    if connection.vendor != 'sqlite':
+        return
+    tables = connection.introspection.table_names()
+    if 'transactions' not in tables or 'transactions_fts' not in tables:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'transactions'"
+        )
+        if set(SQLITE_TRIGGERS) <= {row[0] for row in cursor.fetchall()}:
+            return
+    install(connection)
+
+
+def clean_query(q):
+    q = ' '.join((q or '').split())
+    if not q:
+        raise InvalidSearch('Search query is required')
+    if len(q) > MAX_QUERY_LENGTH:
+        raise InvalidSearch(f'Search query must be at most {MAX_QUERY_LENGTH} characters')
+    return q
+
+
+def fts_query(q, user_id):
+    """
+    Every word as a quoted prefix term of the text columns, so user input
+    is never FTS syntax, restricted to the user's rows.
+    """
+    terms = ' '.join(f'"{word}"*' for word in WORD.findall(q))
+    if not terms:
+        return ''
+    return f'user_id : "{int(user_id)}" AND {{description notes}} : ({terms})'
+
+
+def search(transactions, q, connection, user_id):
+    """
+    Transactions of user_id matching q, annotated with a rank and ordered
+    best first (ties newest first). Slice the result to paginate.
+    """
+    if connection.vendor == 'postgresql':
+        pattern = '%' + q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        return (
+            transactions
+            .filter(RawSQL(
+                f'({POSTGRES_DOCUMENT} ILIKE %s OR %s <%% {POSTGRES_DOCUMENT})',
+                [pattern, q], output_field=BooleanField(),
+            ))
+            .annotate(rank=RawSQL(f'word_similarity(%s, {POSTGRES_DOCUMENT})', [q], output_field=FloatField()))
+            .order_by('-rank', '-transaction_date', '-id')
+        )
+
+    if connection.vendor == 'sqlite':
+        match = fts_query(q, user_id)
+        if not match:
+            return transactions.none()
+        transactions = transactions.all()
+        query = transactions.query
+        alias = query.join(MatchJoin(match, query.get_initial_alias()))
+        return (
+            transactions
+            .annotate(rank=RawSQL(f'{connection.ops.quote_name(alias)}.rank', [], output_field=FloatField()))
+            .order_by('-rank', '-transaction_date', '-id')
+        )
+
+    return (
+        transactions
+        .filter(Q(description__icontains=q) | Q(notes__icontains=q))
+        .order_by('-transaction_date', '-id')
+    )
@@ -1,5 +1,8 @@
+from django.urls import reverse
 from rest_framework import serializers
-from .models import User, Category, Transaction, Budget, Goal, Debt
+from .models import User, Category, Transaction, Budget, Goal, Debt, ReportJob
+from .aggregates import CENT, debt_remaining, money
+from decimal import Decimal, ROUND_HALF_UP
 import re
 
 
@@ -80,7 +83,21 @@ class UserSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """
+    Serializes only the fields listed in context['fields'], as parsed by
+    fieldsets.sparse_fields; all of them when it is absent.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        wanted = self.context.get('fields')
+        if wanted:
+            for name in set(self.fields) - set(wanted):
+                self.fields.pop(name)
+
+
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'icon', 'color', 'type', 'parent_id', 'created_at']
@@ -100,21 +117,24 @@ class CategorySerializer(serializers.ModelSerializer):
         return value
 
 
-class TransactionSerializer(serializers.ModelSerializer):
+class TransactionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     category_id = serializers.IntegerField(required=False, allow_null=True, write_only=False)
     category_name = serializers.SerializerMethodField(read_only=True)
+    # Columns read by method fields (fieldsets.only_fields).
+    field_sources = {'category_name': ('category__name',)}
     
     class Meta:
         model = Transaction
-        fields = ['id', 'amount', 'transaction_date', 'description', 'category_id', 'category_name', 'type', 'payment_method', 'is_recurring', 'recurring_frequency', 'notes', 'created_at']
-        read_only_fields = ['id', 'created_at', 'category_name']
+        fields = ['id', 'amount', 'transaction_date', 'description', 'category_id', 'category_name', 'type', 'payment_method', 'is_recurring', 'recurring_frequency', 'recurring_parent_id', 'notes', 'created_at']
+        read_only_fields = ['id', 'created_at', 'category_name', 'recurring_parent_id']
     
     def get_category_name(self, obj):
         return obj.category.name if obj.category else 'Uncategorized'
     
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        data['category_id'] = instance.category.id if instance.category else None
+        if 'category_id' in data:
+            data['category_id'] = instance.category_id
         return data
     
     def create(self, validated_data):
@@ -142,12 +162,27 @@ class TransactionSerializer(serializers.ModelSerializer):
             else:
                 instance.category = None
         
+        # A rescheduled recurring transaction resumes after its last
+        # generated occurrence (finances.recurring).
+        if any(
+            field in validated_data and validated_data[field] != getattr(instance, field)
+            for field in ('transaction_date', 'is_recurring', 'recurring_frequency')
+        ):
+            instance.recurring_next_date = None
+
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         
         instance.save()
         return instance
     
+    def validate(self, data):
+        is_recurring = data.get('is_recurring', getattr(self.instance, 'is_recurring', False))
+        frequency = data.get('recurring_frequency', getattr(self.instance, 'recurring_frequency', None))
+        if is_recurring and not frequency:
+            raise serializers.ValidationError({'recurring_frequency': 'Recurring frequency is required'})
+        return data
+    
     def validate_transaction_date(self, value):
         if value is None:
             raise serializers.ValidationError('Date is required')
@@ -159,8 +194,39 @@ class TransactionSerializer(serializers.ModelSerializer):
         return value
 
 
-class BudgetSerializer(serializers.ModelSerializer):
+class RoundedDecimalField(serializers.DecimalField):
+    """DecimalField that rounds extra decimal places instead of rejecting them."""
+
+    def validate_precision(self, value):
+        if value.is_finite():
+            value = value.quantize(Decimal(1).scaleb(-self.decimal_places), rounding=ROUND_HALF_UP)
+        return super().validate_precision(value)
+
+
+class UserCategoryMixin:
+    """
+    Resolves the category a budget, goal or debt points to, accepting only
+    categories of the requesting user.
+    """
+
+    def user_category(self, category_id):
+        if not category_id:
+            return None
+        try:
+            return Category.objects.get(id=category_id, user=self.context['request'].user)
+        except Category.DoesNotExist:
+            raise serializers.ValidationError('Category not found')
+
+    def validate(self, data):
+        # category_id is written through the category relation.
+        if 'category_id' in data:
+            data['category'] = self.user_category(data.pop('category_id'))
+        return super().validate(data)
+
+
+class BudgetSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     category_name = serializers.SerializerMethodField(read_only=True)
+    progress = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Budget
@@ -176,13 +242,23 @@ class BudgetSerializer(serializers.ModelSerializer):
             'alert_percentage',
             'is_active',
             'description',
+            'progress',
             'created_at'
         ]  
-    read_only_fields = ['id', 'created_at', 'category_name']
+    read_only_fields = ['id', 'created_at', 'category_name', 'progress']
 
     def get_category_name(self, obj):
         return obj.category.name if obj.category else None
 
+    def get_progress(self, obj):
+        # Filled in bulk by the list view (see aggregates.budget_progress).
+        return self.context.get('progress', {}).get(obj.id)
+
+    def validate_category(self, value):
+        if value is not None and value.user_id != self.context['request'].user.id:
+            raise serializers.ValidationError('Category not found')
+        return value
+
     def validate_amount(self, value):
         if value <= 0:
             raise serializers.ValidationError('Budget amount must be greater than 0')
@@ -194,66 +270,11 @@ class BudgetSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError('End date must be after start date')
         return data
     
-# Gersson le toca esto
-class GoalSerializer(serializers.ModelSerializer):
-    category_name = serializers.SerializerMethodField(read_only=True)
+class GoalSerializer(SparseFieldsMixin, UserCategoryMixin, serializers.ModelSerializer):
+    category_name  = serializers.SerializerMethodField(read_only=True)
+    category_id    = serializers.IntegerField(required=False, allow_null=True, write_only=False)
     current_amount = serializers.SerializerMethodField(read_only=True)
-    
-    class Meta:
-        model = Goal
-        fields = [
-            'id', 
-            'name', 
-            'category',
-            'category_name',
-            'description',
-            'target_amount', 
-            'target_date', 
-            'priority',
-            'status',
-            'current_amount',
-            'created_at',
-            'updated_at'
-        ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'category_name', 'current_amount']
-    
-    def get_category_name(self, obj):
-        return obj.category.name if obj.category else None
-    
-    def get_current_amount(self, obj):
-        """Calcula el monto actual basado en transacciones de ingresos de la categoría asociada"""
-        if not obj.category:
-            return 0.0
-        
-        try:
-            total = Transaction.objects.filter(
-                user=obj.user,
-                category=obj.category, 
-                type='income'
-            ).aggregate(Sum('amount'))['amount__sum']
-            
-            if total is None:
-                return 0.0
-            return float(total)
-        except Exception as e:
-            print(f"Error calculando current_amount para goal {obj.id}: {e}")
-            return 0.0
-    
-    def validate_target_amount(self, value):
-        if value <= 0:
-            raise serializers.ValidationError('El monto objetivo debe ser mayor que cero')
-        return value
-    
-    def validate_target_date(self, value):
-        from datetime import date
-        if value < date.today():
-            raise serializers.ValidationError('La fecha objetivo no puede ser en el pasado')
-        return value
-
-
-class GoalSerializer(serializers.ModelSerializer):
-    category_name = serializers.SerializerMethodField(read_only=True)
-    category_id   = serializers.IntegerField(required=False, allow_null=True, write_only=False)
+    progress_pct   = serializers.SerializerMethodField(read_only=True)
 
     class Meta:
         model = Goal
@@ -267,16 +288,29 @@ class GoalSerializer(serializers.ModelSerializer):
             'category_name',
             'priority',
             'status',
+            'current_amount',
+            'progress_pct',
             'created_at',
         ]
-        read_only_fields = ['id', 'created_at', 'category_name']
+        read_only_fields = ['id', 'created_at', 'category_name', 'current_amount', 'progress_pct']
 
     def get_category_name(self, obj):
         return obj.category.name if obj.category else None
 
+    # current_amount is annotated by aggregates.with_goal_progress.
+    def get_current_amount(self, obj):
+        return money(getattr(obj, 'current_amount', None))
+
+    def get_progress_pct(self, obj):
+        current = getattr(obj, 'current_amount', None) or Decimal('0')
+        if not obj.target_amount:
+            return 0
+        return min(round(current / obj.target_amount * 100), 100)
+
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        data['category_id'] = instance.category.id if instance.category else None
+        if 'category_id' in data:
+            data['category_id'] = instance.category_id
         return data
 
     def validate_target_amount(self, value):
@@ -285,9 +319,13 @@ class GoalSerializer(serializers.ModelSerializer):
         return value
 
 
-class DebtSerializer(serializers.ModelSerializer):
-    category_name = serializers.SerializerMethodField(read_only=True)
-    category_id   = serializers.IntegerField(required=False, allow_null=True, write_only=False)
+class DebtSerializer(SparseFieldsMixin, UserCategoryMixin, serializers.ModelSerializer):
+    category_name    = serializers.SerializerMethodField(read_only=True)
+    category_id      = serializers.IntegerField(required=False, allow_null=True, write_only=False)
+    paid_amount      = serializers.SerializerMethodField(read_only=True)
+    remaining_amount = serializers.SerializerMethodField(read_only=True)
+    # The frontend sends the compound total unrounded.
+    total_with_interest = RoundedDecimalField(max_digits=15, decimal_places=2, required=False)
 
     class Meta:
         model = Debt
@@ -304,19 +342,73 @@ class DebtSerializer(serializers.ModelSerializer):
             'category_name',
             'description',
             'status',
+            'paid_amount',
+            'remaining_amount',
             'created_at',
         ]
-        read_only_fields = ['id', 'created_at', 'category_name']
+        read_only_fields = ['id', 'created_at', 'category_name', 'paid_amount', 'remaining_amount']
 
     def get_category_name(self, obj):
         return obj.category.name if obj.category else None
 
+    # paid_amount is annotated by aggregates.with_debt_progress.
+    def get_paid_amount(self, obj):
+        return money(getattr(obj, 'paid_amount', None))
+
+    def get_remaining_amount(self, obj):
+        if getattr(obj, 'paid_amount', None) is None:
+            return money(obj.total_with_interest)
+        return money(debt_remaining(obj))
+
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        data['category_id'] = instance.category.id if instance.category else None
+        if 'category_id' in data:
+            data['category_id'] = instance.category_id
         return data
 
     def validate_amount(self, value):
         if value <= 0:
             raise serializers.ValidationError('Amount must be greater than 0')
-        return value
\ No newline at end of file
+        return value
+
+    def validate(self, data):
+        data = super().validate(data)
+        if 'total_with_interest' not in data and (
+            self.instance is None or {'amount', 'interest_rate', 'months'} & data.keys()
+        ):
+            data['total_with_interest'] = self.compound_total(
+                data.get('amount', getattr(self.instance, 'amount', None)),
+                data.get('interest_rate', getattr(self.instance, 'interest_rate', Decimal('0'))),
+                data.get('months', getattr(self.instance, 'months', 0)),
+            )
+        return data
+
+    @staticmethod
+    def compound_total(amount, interest_rate, months):
+        # Compound interest calculation: total = amount * (1 + rate/100) ^ months
+        if interest_rate > 0 and months > 0:
+            amount = amount * (1 + interest_rate / 100) ** months
+        return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class ReportRequestSerializer(serializers.Serializer):
+    format = serializers.ChoiceField(choices=ReportJob.FORMAT_CHOICES, default='pdf')
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = [
+            'id', 'format', 'date_from', 'date_to', 'status', 'size', 'error',
+            'created_at', 'finished_at', 'download_url',
+        ]
+        read_only_fields = fields
+
+    def get_download_url(self, obj):
+        if obj.status != 'ready':
+            return None
+        return reverse('download_report', args=[obj.id])
@@ -0,0 +1,100 @@
+from django.db import connections
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import rollups, search, versions
+from .authentication import user_cache
+from .models import User, Category, Transaction, Budget, Goal, Debt, TransactionMonthlyRollup
+
+
+ROLLUP_FIELDS = ('user_id', 'category_id', 'type', 'transaction_date', 'amount')
+VERSIONED_MODELS = (Category, Transaction, Budget, Goal, Debt)
+
+
+def _origin_model(origin):
+    if isinstance(origin, QuerySet):
+        return origin.model
+    return type(origin)
+
+
+# ── MONTHLY ROLLUPS ──────────────────────────────────────────────
+
+@receiver(pre_save, sender=Transaction)
+def remember_rollup_bucket(sender, instance, raw=False, **kwargs):
+    instance._rollup_previous = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    instance._rollup_previous = (
+        Transaction.objects.filter(pk=instance.pk).only(*ROLLUP_FIELDS).first()
+    )
+
+
+@receiver(post_save, sender=Transaction)
+def update_rollup_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    deltas = rollups.new_deltas()
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous is not None:
+        rollups.add_transaction(deltas, previous, sign=-1)
+    rollups.add_transaction(deltas, instance)
+    rollups.apply_deltas(deltas)
+    instance._rollup_previous = None
+
+
+@receiver(post_delete, sender=Transaction)
+def update_rollup_on_delete(sender, instance, origin=None, **kwargs):
+    # Cascades from a deleted user take that user's rollups with them.
+    if origin is not None and _origin_model(origin) is not Transaction:
+        return
+    rollups.apply_deltas(rollups.deltas_for([instance], sign=-1))
+
+
+@receiver(pre_delete, sender=Category)
+def fold_category_rollups(sender, instance, origin=None, **kwargs):
+    # Transactions of a deleted category become uncategorized (SET_NULL),
+    # so their totals move to the uncategorized buckets.
+    if origin is not None and _origin_model(origin) is not Category:
+        return
+    deltas = rollups.new_deltas()
+    for row in TransactionMonthlyRollup.objects.filter(category=instance):
+        moved = deltas[(row.user_id, row.month, None, row.type)]
+        moved[0] += row.total
+        moved[1] += row.transaction_count
+    rollups.apply_deltas(deltas)
+
+
+# ── USER DATA VERSIONS ───────────────────────────────────────────
+
+def bump_data_version_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        versions.bump(instance.user_id)
+
+
+def bump_data_version_on_delete(sender, instance, origin=None, **kwargs):
+    # Nothing to version once the user itself is being deleted.
+    if origin is not None and _origin_model(origin) is User:
+        return
+    versions.bump(instance.user_id)
+
+
+for model in VERSIONED_MODELS:
+    post_save.connect(bump_data_version_on_save, sender=model, dispatch_uid=f'version_save_{model.__name__}')
+    post_delete.connect(bump_data_version_on_delete, sender=model, dispatch_uid=f'version_delete_{model.__name__}')
+
+
+# ── AUTH USER CACHE ──────────────────────────────────────────────
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+
+
+# ── SEARCH INDEX ─────────────────────────────────────────────────
+
+@receiver(post_migrate)
+def restore_search_index(sender, using='default', **kwargs):
+    if sender.name == 'finances':
+        search.ensure_index(connections[using])
@@ -1,21 +1,46 @@
-from django.test import TestCase, override_settings
-from django.db import IntegrityError
+from django.conf import settings
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from io import BytesIO, StringIO
+from django.db import IntegrityError, connection, connections
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APITestCase, APIRequestFactory
 from rest_framework import status
 from rest_framework_simplejwt.tokens import AccessToken
+from unittest import skipUnless
 from unittest.mock import patch, MagicMock
 from decimal import Decimal
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+import csv
+import gzip
+import importlib
 import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+import zlib
 import bcrypt
 
-from .models import User, Category, Transaction, Budget, Goal, Debt
+from .models import User, Category, Transaction, Budget, Goal, Debt, ReportJob, TransactionMonthlyRollup, UserDataVersion
+from . import importers, recurring, reports, rollups, versions
 from .serializers import (
     RegisterSerializer, LoginSerializer, CategorySerializer,
     TransactionSerializer, BudgetSerializer, GoalSerializer, DebtSerializer
 )
+from .renderers import ORJSONRenderer, msgpack
 from .views import get_tokens_for_user
-from .authentication import CustomJWTAuthentication
+from core.middleware import brotli, choose_encoding
+from .authentication import CustomJWTAuthentication, user_cache
+from .passwords import PasswordHashingBusy, hash_cost, password_hasher
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -264,6 +289,43 @@ class DebtModelTest(TestCase):
         self.assertEqual(debt.status, 'pending')
 
 
+class CompositeIndexTest(TransactionTestCase):
+    INDEXES = {
+        'transactions': {
+            'tx_user_date_idx': ['user_id', 'transaction_date', 'id'],
+            'tx_user_created_idx': ['user_id', 'created_at'],
+            'tx_user_cat_type_idx': ['user_id', 'category_id', 'type'],
+        },
+        'budgets': {'budget_user_active_idx': ['user_id', 'is_active', 'start_date']},
+        'goals': {'goal_user_created_idx': ['user_id', 'created_at']},
+        'debts': {'debt_user_created_idx': ['user_id', 'created_at']},
+    }
+
+    def test_indexes_exist(self):
+        models = {model._meta.db_table: model for model in (Transaction, Budget, Goal, Debt)}
+        with connection.cursor() as cursor:
+            for table, expected in self.INDEXES.items():
+                declared = {index.name for index in models[table]._meta.indexes}
+                constraints = connection.introspection.get_constraints(cursor, table)
+                for name, columns in expected.items():
+                    self.assertIn(name, declared)
+                    self.assertTrue(constraints[name]['index'], name)
+                    self.assertEqual(constraints[name]['columns'], columns, name)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_indexes', rows=200, users=2, categories=2, repeat=2, stdout=out)
+        report = out.getvalue()
+        self.assertIn('Seeded 200 transactions for 2 users', report)
+        self.assertIn('without composite indexes', report)
+        self.assertIn('latest page by transaction_date', report)
+        self.assertFalse(User.objects.filter(username__startswith='bench_idx_').exists())
+        self.assertFalse(Transaction.objects.exists())
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, 'transactions')
+        self.assertIn('tx_user_date_idx', constraints)
+
+
 # ═══════════════════════════════════════════════════════════════════
 # SERIALIZER TESTS
 # ═══════════════════════════════════════════════════════════════════
@@ -694,6 +756,448 @@ class TransactionViewTest(APITestCase):
         response = self.client.post('/api/transactions/create/', data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_get_transactions_cursor_pages(self):
+        for day in range(1, 6):
+            Transaction.objects.create(
+                user=self.user, category=self.category, amount=Decimal('10'),
+                transaction_date=date(2025, 1, day), type='expense'
+            )
+        # Same date as another row: the id breaks the tie.
+        Transaction.objects.create(
+            user=self.user, amount=Decimal('5'),
+            transaction_date=date(2025, 1, 3), type='income'
+        )
+
+        seen = []
+        cursor = ''
+        while True:
+            response = self.client.get('/api/transactions/', {'limit': 2, 'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(row['id'] for row in response.data['results'])
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+
+        expected = list(
+            Transaction.objects.filter(user=self.user)
+            .order_by('-transaction_date', '-id')
+            .values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_get_transactions_without_cursor_returns_full_list(self):
+        for day in range(1, 4):
+            Transaction.objects.create(
+                user=self.user, amount=Decimal('10'),
+                transaction_date=date(2025, 1, day), type='expense'
+            )
+        response = self.client.get('/api/transactions/')
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 3)
+
+    def test_get_transactions_invalid_cursor(self):
+        response = self.client.get('/api/transactions/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_transactions_invalid_limit(self):
+        response = self.client.get('/api/transactions/', {'limit': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TransactionFilterTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='filter', email='filter@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}")
+        self.food = Category.objects.create(user=self.user, name='Food', type='expense')
+        self.rent = Category.objects.create(user=self.user, name='Rent', type='expense')
+        for day, amount, type, category, method in (
+            (date(2025, 1, 5), '12.00', 'expense', self.food, 'cash'),
+            (date(2025, 1, 20), '800.00', 'expense', self.rent, 'bank_transfer'),
+            (date(2025, 2, 1), '2500.00', 'income', None, 'bank_transfer'),
+            (date(2025, 2, 14), '45.50', 'expense', self.food, 'credit_card'),
+            (date(2025, 3, 2), '7.25', 'expense', None, 'cash'),
+        ):
+            Transaction.objects.create(
+                user=self.user, transaction_date=day, amount=Decimal(amount),
+                type=type, category=category, payment_method=method
+            )
+        other = User.objects.create(username='other', email='other@test.com', password='pass')
+        Transaction.objects.create(
+            user=other, transaction_date=date(2025, 1, 10), amount=Decimal('1'), type='expense'
+        )
+
+    def amounts(self, query):
+        response = self.client.get(f'/api/transactions/?{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        rows = response.data['results'] if isinstance(response.data, dict) else response.data
+        return [row['amount'] for row in rows]
+
+    def test_date_range(self):
+        self.assertEqual(
+            sorted(self.amounts('date_from=2025-01-20&date_to=2025-02-14')),
+            ['2500.00', '45.50', '800.00'],
+        )
+
+    def test_type_category_and_payment_method(self):
+        self.assertEqual(self.amounts('type=income'), ['2500.00'])
+        self.assertEqual(
+            sorted(self.amounts(f'category={self.food.id}')), ['12.00', '45.50']
+        )
+        self.assertEqual(
+            sorted(self.amounts(f'category={self.rent.id},none&type=expense')), ['7.25', '800.00']
+        )
+        self.assertEqual(
+            sorted(self.amounts('payment_method=cash,credit_card')), ['12.00', '45.50', '7.25']
+        )
+
+    def test_amount_range_and_ordering(self):
+        self.assertEqual(
+            self.amounts('min_amount=10&max_amount=800&ordering=-amount'), ['800.00', '45.50', '12.00']
+        )
+        self.assertEqual(self.amounts('ordering=amount')[:2], ['7.25', '12.00'])
+        self.assertEqual(self.amounts('ordering=date')[0], '12.00')
+
+    def test_filters_with_cursor_pages(self):
+        first = self.client.get('/api/transactions/?type=expense&limit=2')
+        self.assertEqual([row['amount'] for row in first.data['results']], ['7.25', '45.50'])
+        second = self.client.get(
+            f"/api/transactions/?type=expense&limit=2&cursor={first.data['next_cursor']}"
+        )
+        self.assertEqual([row['amount'] for row in second.data['results']], ['800.00', '12.00'])
+        self.assertIsNone(second.data['next_cursor'])
+
+        response = self.client.get('/api/transactions/?limit=2&ordering=-amount')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_filters(self):
+        for query in (
+            'date_from=yesterday', 'type=transfer', 'category=food', 'payment_method=cheque',
+            'min_amount=ten', 'max_amount=NaN', 'ordering=name',
+        ):
+            response = self.client.get(f'/api/transactions/?{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+    def test_export_applies_filters(self):
+        response = self.client.get('/api/transactions/export/?format=csv&type=income')
+        rows = list(csv.DictReader(StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['amount'] for row in rows], ['2500.00'])
+
+
+class TransactionSearchTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='search', email='search@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}")
+        for day, description, notes in (
+            (date(2025, 1, 3), 'Coffee beans', ''),
+            (date(2025, 1, 9), 'Coffee coffee shop', ''),
+            (date(2025, 2, 1), 'Monthly rent', 'Paid by transfer at the café'),
+            (date(2025, 2, 7), 'Groceries', 'coffee filters'),
+        ):
+            Transaction.objects.create(
+                user=self.user, transaction_date=day, amount=Decimal('10.00'),
+                type='expense', description=description, notes=notes
+            )
+        other = User.objects.create(username='other', email='other@test.com', password='pass')
+        for description in ('Coffee', 'Bus', 'Cinema', 'Pharmacy', 'Gym', 'Books', 'Salary'):
+            Transaction.objects.create(
+                user=other, transaction_date=date(2025, 1, 5), amount=Decimal('1'),
+                type='expense', description=description
+            )
+
+    def search(self, query):
+        response = self.client.get(f'/api/transactions/search/?{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response
+
+    def descriptions(self, query):
+        return [row['description'] for row in self.search(query).data['results']]
+
+    def test_ranked_matches(self):
+        results = self.descriptions('q=coffee')
+        self.assertEqual(len(results), 3)
+        self.assertEqual(results[0], 'Coffee coffee shop')
+        self.assertIn('Groceries', results)
+
+    def test_prefix_accents_and_notes(self):
+        self.assertEqual(self.descriptions('q=ren'), ['Monthly rent'])
+        self.assertEqual(self.descriptions('q=cafe'), ['Monthly rent'])
+        self.assertEqual(self.descriptions('q=transfer'), ['Monthly rent'])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.descriptions('q=coffee shop'), ['Coffee coffee shop'])
+        self.assertEqual(self.descriptions('q=nothing'), [])
+
+    def test_query_syntax_is_literal(self):
+        self.assertEqual(self.descriptions('q=shop" OR "rent'), [])
+        self.assertEqual(len(self.descriptions('q=coffee)*')), 3)
+        self.assertEqual(self.descriptions('q=*'), [])
+
+    def test_pages_and_filters(self):
+        first = self.search('q=coffee&limit=2')
+        self.assertEqual(len(first.data['results']), 2)
+        self.assertEqual(first.data['next_offset'], 2)
+        second = self.search('q=coffee&limit=2&offset=2')
+        self.assertEqual(len(second.data['results']), 1)
+        self.assertIsNone(second.data['next_offset'])
+
+        self.assertEqual(self.descriptions('q=coffee&date_from=2025-02-01'), ['Groceries'])
+
+    def test_index_follows_writes(self):
+        transaction = Transaction.objects.get(description='Groceries')
+        transaction.description = 'Hardware store'
+        transaction.notes = ''
+        transaction.save()
+        self.assertEqual(self.descriptions('q=hardware'), ['Hardware store'])
+        self.assertEqual(len(self.descriptions('q=coffee')), 2)
+
+        transaction.delete()
+        self.assertEqual(self.descriptions('q=hardware'), [])
+
+    @skipUnless(connection.vendor == 'sqlite', 'FTS5 index is SQLite only')
+    def test_ranks_in_one_fts_pass(self):
+        Transaction.objects.bulk_create([
+            Transaction(
+                user=self.user, transaction_date=date(2024, 1, 1), amount=Decimal('1.00'),
+                type='expense', description=f'Coffee {i}'
+            )
+            for i in range(2000)
+        ])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.search('q=coffee&limit=5')
+        self.assertEqual(response.data['next_offset'], 5)
+        sql = next(q['sql'] for q in ctx.captured_queries if 'transactions_fts' in q['sql'])
+        # A per-row MATCH (correlated rank subquery) makes ranking quadratic.
+        self.assertEqual(sql.count('MATCH'), 1)
+        self.assertEqual(sql.count('bm25'), 1)
+
+    def test_invalid_requests(self):
+        for query in ('', 'q=', f"q={'a' * 201}", 'q=coffee&limit=0', 'q=coffee&offset=-1', 'q=coffee&type=x'):
+            response = self.client.get(f'/api/transactions/search/?{query}')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, query)
+
+    def test_triggers_restored_after_migrate(self):
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER transactions_fts_insert')
+        call_command('migrate', verbosity=0)
+        Transaction.objects.create(
+            user=self.user, transaction_date=date(2025, 3, 1), amount=Decimal('5.00'),
+            type='expense', description='Bakery'
+        )
+        self.assertEqual(self.descriptions('q=bakery'), ['Bakery'])
+
+
+class SparseFieldsetTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='sparse', email='sparse@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}")
+        self.food = Category.objects.create(user=self.user, name='Food', type='expense')
+        for day, amount, category in (
+            (date(2025, 1, 5), '12.00', self.food),
+            (date(2025, 1, 20), '800.00', None),
+            (date(2025, 2, 1), '45.50', self.food),
+        ):
+            Transaction.objects.create(
+                user=self.user, transaction_date=day, amount=Decimal(amount),
+                type='expense', category=category, notes='long notes'
+            )
+        Debt.objects.create(
+            user=self.user, name='Loan', amount=Decimal('100'),
+            total_with_interest=Decimal('100'), due_date=date(2026, 1, 1)
+        )
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response.data
+
+    def test_fields_limit_each_row(self):
+        rows = self.get('/api/transactions/?fields=type, amount,transaction_date&ordering=date')
+        self.assertEqual([list(row) for row in rows], [['amount', 'transaction_date', 'type']] * 3)
+        self.assertEqual([row['amount'] for row in rows], ['12.00', '800.00', '45.50'])
+
+    def test_columnar_layout(self):
+        data = self.get('/api/transactions/?fields=amount,category_id,category_name&layout=columnar&ordering=date')
+        self.assertEqual(data, {
+            'amount': ['12.00', '800.00', '45.50'],
+            'category_id': [self.food.id, None, self.food.id],
+            'category_name': ['Food', 'Uncategorized', 'Food'],
+        })
+
+        page = self.get('/api/transactions/?fields=amount&layout=columnar&limit=2')
+        self.assertEqual(page['results'], {'amount': ['45.50', '800.00']})
+        self.assertIsNotNone(page['next_cursor'])
+
+        page = self.get(f"/api/transactions/?fields=amount&limit=2&cursor={page['next_cursor']}")
+        self.assertEqual(page['results'], [{'amount': '12.00'}])
+
+    def test_columnar_layout_of_empty_list_keeps_columns(self):
+        data = self.get('/api/transactions/?fields=id,amount&layout=columnar&type=income')
+        self.assertEqual(data, {'id': [], 'amount': []})
+
+    def test_other_list_endpoints(self):
+        self.assertEqual(self.get('/api/categories/?fields=name&layout=columnar'), {'name': ['Food']})
+        self.assertEqual(self.get('/api/debts/?fields=name,remaining_amount'), [
+            {'name': 'Loan', 'remaining_amount': '100.00'}
+        ])
+        data = self.get('/api/debts/?fields=name&layout=columnar&totals=1')
+        self.assertEqual(data['results'], {'name': ['Loan']})
+
+    def test_dashboard(self):
+        data = self.get('/api/dashboard/summary/?period=all&fields=amount&layout=columnar')
+        self.assertEqual(data['recent_transactions'], {'amount': ['45.50', '800.00', '12.00']})
+        self.assertIn('month', data['monthly_trend'])
+        self.assertIsInstance(data['monthly_trend']['month'], list)
+
+    def test_unrequested_columns_are_not_loaded(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.get('/api/transactions/?fields=amount')
+        select = [q['sql'] for q in ctx.captured_queries if 'FROM "transactions"' in q['sql']][0]
+        self.assertNotIn('"notes"', select)
+        self.assertNotIn('"categories"', select)
+
+    def test_invalid_requests(self):
+        for url in (
+            '/api/transactions/?fields=amount,secret',
+            '/api/transactions/?layout=table',
+            '/api/transactions/search/?q=x&fields=nope',
+            '/api/categories/?fields=nope',
+            '/api/budgets/?layout=nope',
+            '/api/dashboard/summary/?fields=nope',
+        ):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, url)
+
+
+class BulkTransactionViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='bulkuser', email='bulk@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}")
+        self.food = Category.objects.create(user=self.user, name='Food', type='expense')
+        self.salary = Category.objects.create(user=self.user, name='Salary', type='income')
+
+    def rows(self, count):
+        return [
+            {
+                'amount': f'{n + 1}.50', 'transaction_date': f'2025-0{n % 3 + 1}-10',
+                'type': 'expense' if n % 2 else 'income',
+                'category_id': self.food.id if n % 2 else self.salary.id,
+                'description': f'Row {n}',
+            }
+            for n in range(count)
+        ]
+
+    def test_bulk_create(self):
+        response = self.client.post('/api/transactions/bulk/', self.rows(25), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['count'], 25)
+        self.assertEqual(len(response.data['ids']), 25)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 25)
+        self.assertEqual(rollups.check([self.user.id]), [])
+
+    def test_accepts_wrapped_list(self):
+        response = self.client.post('/api/transactions/bulk/', {'transactions': self.rows(2)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_one_category_query_for_any_batch_size(self):
+        for count in (2, 40):
+            with CaptureQueriesContext(connection) as ctx:
+                self.client.post('/api/transactions/bulk/', self.rows(count), format='json')
+            category_selects = [
+                q for q in ctx.captured_queries
+                if q['sql'].startswith('SELECT') and 'FROM "categories"' in q['sql']
+            ]
+            self.assertEqual(len(category_selects), 1)
+
+    def test_invalid_rows_reject_batch(self):
+        other = User.objects.create(username='other', email='other@test.com', password='pass')
+        foreign = Category.objects.create(user=other, name='Theirs', type='expense')
+        rows = self.rows(4)
+        rows[1]['amount'] = '0'
+        rows[3]['category_id'] = foreign.id
+        response = self.client.post('/api/transactions/bulk/', rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'], [
+            {'index': 1, 'message': 'Amount must be greater than 0'},
+            {'index': 3, 'message': 'Category not found'},
+        ])
+        self.assertFalse(Transaction.objects.filter(user=self.user).exists())
+
+    def test_empty_and_oversized_batches(self):
+        response = self.client.post('/api/transactions/bulk/', [], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with patch('finances.bulk.MAX_ROWS', 3):
+            response = self.client.post('/api/transactions/bulk/', self.rows(4), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bumps_data_version(self):
+        before, _ = versions.current(self.user.pk)
+        self.client.post('/api/transactions/bulk/', self.rows(3), format='json')
+        self.assertEqual(versions.current(self.user.pk)[0], before + 1)
+
+    def test_no_token(self):
+        self.client.credentials()
+        response = self.client.post('/api/transactions/bulk/', self.rows(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class ExportTransactionsViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='exporter', email='exp@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}")
+        food = Category.objects.create(user=self.user, name='Food', type='expense')
+        Transaction.objects.create(
+            user=self.user, category=food, amount=Decimal('12.50'),
+            transaction_date=date(2025, 1, 2), type='expense', description='=HYPERLINK("x")'
+        )
+        Transaction.objects.create(
+            user=self.user, amount=Decimal('900'), transaction_date=date(2025, 1, 5),
+            type='income', description='Salary'
+        )
+        other = User.objects.create(username='other', email='other@test.com', password='pass')
+        Transaction.objects.create(
+            user=other, amount=Decimal('1'), transaction_date=date(2025, 1, 1), type='income'
+        )
+
+    def read(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        response = self.client.get('/api/transactions/export/?format=csv')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertIn('attachment;', response['Content-Disposition'])
+        rows = list(csv.DictReader(StringIO(self.read(response))))
+        self.assertEqual([row['description'] for row in rows], ['Salary', '\'=HYPERLINK("x")'])
+        self.assertEqual(rows[0]['amount'], '900.00')
+        self.assertEqual(rows[0]['category_name'], 'Uncategorized')
+        self.assertEqual(rows[1]['category_name'], 'Food')
+
+    def test_ndjson_export(self):
+        response = self.client.get('/api/transactions/export/?format=ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1]['amount'], '12.50')
+        self.assertEqual(rows[1]['transaction_date'], '2025-01-02')
+
+    def test_defaults_to_csv(self):
+        response = self.client.get('/api/transactions/export/')
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+
+    def test_streams_in_chunks(self):
+        with patch('finances.exports.ROWS_PER_WRITE', 1):
+            response = self.client.get('/api/transactions/export/?format=ndjson')
+            chunks = list(response.streaming_content)
+        self.assertEqual(len(chunks), 2)
+
+    def test_no_token(self):
+        self.client.credentials()
+        response = self.client.get('/api/transactions/export/?format=csv')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
 
 class BudgetViewTest(APITestCase):
     def setUp(self):
@@ -956,6 +1460,1198 @@ class DebtViewTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
 
+class DashboardSummaryViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='dashuser', email='dash@test.com', password='pass')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}"
+        )
+        self.food = Category.objects.create(user=self.user, name='Food', type='expense')
+        self.loan = Category.objects.create(user=self.user, name='Loan', type='expense')
+        today = date.today()
+        Transaction.objects.create(
+            user=self.user, amount=Decimal('1000'), transaction_date=today, type='income'
+        )
+        Transaction.objects.create(
+            user=self.user, category=self.food, amount=Decimal('150.50'),
+            transaction_date=today, type='expense'
+        )
+        Transaction.objects.create(
+            user=self.user, category=self.loan, amount=Decimal('200'),
+            transaction_date=today - timedelta(days=3), type='expense'
+        )
+        Transaction.objects.create(
+            user=self.user, category=self.food, amount=Decimal('99'),
+            transaction_date=today - timedelta(days=400), type='expense'
+        )
+        Debt.objects.create(
+            user=self.user, category=self.loan, name='Car', amount=Decimal('1000'),
+            total_with_interest=Decimal('1200'), due_date=date(2027, 1, 1)
+        )
+
+    def test_summary_totals_for_period(self):
+        response = self.client.get('/api/dashboard/summary/', {'period': '30'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        totals = response.data['totals']
+        self.assertEqual(totals['income'], '1000.00')
+        self.assertEqual(totals['expense'], '350.50')
+        self.assertEqual(totals['net_balance'], '649.50')
+        self.assertEqual(totals['expense_transactions'], 2)
+        self.assertEqual(response.data['top_categories'][0]['category_name'], 'Loan')
+        self.assertEqual(len(response.data['recent_transactions']), 3)
+
+    def test_summary_all_time_and_debts(self):
+        response = self.client.get('/api/dashboard/summary/', {'period': 'all'})
+        self.assertEqual(response.data['totals']['expense'], '449.50')
+        self.assertEqual(response.data['debts'], {
+            'total': '1200.00', 'paid': '200.00', 'remaining': '1000.00', 'count': 1,
+        })
+
+    def test_summary_monthly_trend(self):
+        response = self.client.get('/api/dashboard/summary/')
+        trend = response.data['monthly_trend']
+        self.assertEqual(len(trend), 6)
+        self.assertEqual(trend[-1]['month'], date.today().strftime('%Y-%m'))
+        self.assertEqual(
+            sum(Decimal(month['income']) for month in trend), Decimal('1000')
+        )
+
+    def test_summary_invalid_period(self):
+        response = self.client.get('/api/dashboard/summary/', {'period': 'decade'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_summary_query_count_independent_of_rows(self):
+        user_cache.clear()
+        with CaptureQueriesContext(connection) as before:
+            self.client.get('/api/dashboard/summary/')
+        for _ in range(20):
+            Transaction.objects.create(
+                user=self.user, category=self.food, amount=Decimal('1'),
+                transaction_date=date.today(), type='expense'
+            )
+        user_cache.clear()
+        with CaptureQueriesContext(connection) as after:
+            self.client.get('/api/dashboard/summary/')
+        self.assertEqual(len(after.captured_queries), len(before.captured_queries))
+
+
+class BudgetProgressTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='bpuser', email='bp@test.com', password='pass')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}"
+        )
+        self.food = Category.objects.create(user=self.user, name='Food', type='expense')
+        self.today = date.today()
+        self.month_start = self.today.replace(day=1)
+
+    def add(self, amount, day, category=None, type='expense'):
+        Transaction.objects.create(
+            user=self.user, category=category, amount=Decimal(amount),
+            transaction_date=day, type=type
+        )
+
+    def test_budget_window_monthly_quarterly_yearly(self):
+        from .aggregates import budget_window
+        budget = Budget(amount=Decimal('1'), period='monthly', start_date=date(2024, 1, 15))
+        self.assertEqual(budget_window(budget, date(2025, 2, 10)), (date(2025, 2, 1), date(2025, 2, 28)))
+        self.assertEqual(budget_window(budget, date(2024, 1, 20)), (date(2024, 1, 15), date(2024, 1, 31)))
+        budget.period = 'quarterly'
+        self.assertEqual(budget_window(budget, date(2025, 5, 10)), (date(2025, 4, 1), date(2025, 6, 30)))
+        budget.period = 'yearly'
+        budget.end_date = date(2025, 3, 31)
+        self.assertEqual(budget_window(budget, date(2026, 7, 1)), (date(2025, 1, 1), date(2025, 3, 31)))
+
+    def test_progress_for_current_month(self):
+        Budget.objects.create(
+            user=self.user, category=self.food, name='Food', amount=Decimal('200'),
+            period='monthly', start_date=date(2020, 1, 1), alert_percentage=50
+        )
+        self.add('120', self.month_start, self.food)
+        self.add('30', self.month_start)                                   # other category
+        self.add('999', self.month_start - timedelta(days=1), self.food)   # previous month
+        self.add('40', self.month_start, self.food, type='income')
+
+        response = self.client.get('/api/budgets/')
+        progress = response.data[0]['progress']
+        self.assertEqual(progress['spent'], '120.00')
+        self.assertEqual(progress['remaining'], '80.00')
+        self.assertEqual(progress['percentage'], 60)
+        self.assertTrue(progress['alert'])
+
+    def test_budget_without_category_counts_all_expenses(self):
+        Budget.objects.create(
+            user=self.user, name='Everything', amount=Decimal('100'),
+            period='monthly', start_date=date(2020, 1, 1)
+        )
+        self.add('20', self.month_start, self.food)
+        self.add('30', self.month_start)
+        response = self.client.get('/api/budgets/')
+        self.assertEqual(response.data[0]['progress']['spent'], '50.00')
+
+    def test_all_budgets_in_one_query(self):
+        for index in range(5):
+            Budget.objects.create(
+                user=self.user, name=f'B{index}', amount=Decimal('100'),
+                period=['monthly', 'quarterly', 'yearly'][index % 3],
+                start_date=date(2020, 1, 1)
+            )
+        self.add('20', self.month_start, self.food)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/budgets/')
+        transaction_queries = [q for q in ctx.captured_queries if 'FROM "transactions"' in q['sql']]
+        self.assertEqual(len(transaction_queries), 1)
+
+
+class GoalProgressTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='gpuser', email='gp@test.com', password='pass')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}"
+        )
+        self.savings = Category.objects.create(user=self.user, name='Savings', type='income')
+        other = User.objects.create(username='gpother', email='gpo@test.com', password='pass')
+        other_savings = Category.objects.create(user=other, name='Savings', type='income')
+        for amount, type in [('300', 'income'), ('200', 'income'), ('50', 'expense')]:
+            Transaction.objects.create(
+                user=self.user, category=self.savings, amount=Decimal(amount),
+                transaction_date=date(2025, 1, 1), type=type
+            )
+        Transaction.objects.create(
+            user=other, category=other_savings, amount=Decimal('1000'),
+            transaction_date=date(2025, 1, 1), type='income'
+        )
+
+    def test_goal_list_includes_progress(self):
+        Goal.objects.create(
+            user=self.user, category=self.savings, name='Trip',
+            target_amount=Decimal('2000'), target_date=date(2027, 1, 1)
+        )
+        Goal.objects.create(
+            user=self.user, name='No category',
+            target_amount=Decimal('100'), target_date=date(2027, 1, 1)
+        )
+        response = self.client.get('/api/goals/')
+        by_name = {goal['name']: goal for goal in response.data}
+        self.assertEqual(by_name['Trip']['current_amount'], '500.00')
+        self.assertEqual(by_name['Trip']['progress_pct'], 25)
+        self.assertEqual(by_name['No category']['current_amount'], '0.00')
+        self.assertEqual(by_name['No category']['progress_pct'], 0)
+
+    def test_progress_capped_at_100(self):
+        Goal.objects.create(
+            user=self.user, category=self.savings, name='Small',
+            target_amount=Decimal('100'), target_date=date(2027, 1, 1)
+        )
+        response = self.client.get('/api/goals/')
+        self.assertEqual(response.data[0]['progress_pct'], 100)
+
+    def test_update_returns_progress_for_new_category(self):
+        goal = Goal.objects.create(
+            user=self.user, name='Later', target_amount=Decimal('1000'),
+            target_date=date(2027, 1, 1)
+        )
+        response = self.client.put(
+            f'/api/goals/{goal.id}/',
+            {'category_id': self.savings.id, 'target_amount': '1000'}, format='json'
+        )
+        self.assertEqual(response.data['goal']['current_amount'], '500.00')
+        self.assertEqual(response.data['goal']['progress_pct'], 50)
+
+    def test_goal_list_single_query_for_progress(self):
+        for index in range(5):
+            Goal.objects.create(
+                user=self.user, category=self.savings, name=f'G{index}',
+                target_amount=Decimal('100'), target_date=date(2027, 1, 1)
+            )
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/goals/')
+        goal_queries = [q for q in ctx.captured_queries if 'FROM "goals"' in q['sql']]
+        self.assertEqual(len(goal_queries), 1)
+        self.assertNotIn('FROM "transactions"', ' '.join(q['sql'] for q in ctx.captured_queries))
+
+
+class DebtProgressTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='dpuser', email='dp@test.com', password='pass')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}"
+        )
+        self.loan = Category.objects.create(user=self.user, name='Loan', type='expense')
+        for amount, type in [('100', 'expense'), ('150', 'expense'), ('75', 'income')]:
+            Transaction.objects.create(
+                user=self.user, category=self.loan, amount=Decimal(amount),
+                transaction_date=date(2025, 1, 1), type=type
+            )
+        Debt.objects.create(
+            user=self.user, category=self.loan, name='Car', amount=Decimal('1000'),
+            total_with_interest=Decimal('1200'), due_date=date(2027, 1, 1)
+        )
+        Debt.objects.create(
+            user=self.user, name='Friend', amount=Decimal('100'),
+            total_with_interest=Decimal('100'), due_date=date(2027, 1, 1)
+        )
+
+    def test_debt_list_includes_paid_and_remaining(self):
+        response = self.client.get('/api/debts/')
+        by_name = {debt['name']: debt for debt in response.data}
+        self.assertEqual(by_name['Car']['paid_amount'], '250.00')
+        self.assertEqual(by_name['Car']['remaining_amount'], '950.00')
+        self.assertEqual(by_name['Friend']['paid_amount'], '0.00')
+        self.assertEqual(by_name['Friend']['remaining_amount'], '100.00')
+
+    def test_debt_list_with_totals(self):
+        response = self.client.get('/api/debts/', {'totals': '1'})
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(response.data['totals'], {
+            'total': '1300.00', 'paid': '250.00', 'remaining': '1050.00', 'count': 2,
+        })
+
+    def test_debt_list_does_not_scan_transactions(self):
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get('/api/debts/')
+        debt_queries = [q for q in ctx.captured_queries if 'FROM "debts"' in q['sql']]
+        self.assertEqual(len(debt_queries), 1)
+        self.assertNotIn('FROM "transactions"', ' '.join(q['sql'] for q in ctx.captured_queries))
+
+
+class UserOwnedViewSetTest(APITestCase):
+    """Budgets, goals and debts authenticate through DRF's pipeline."""
+
+    def setUp(self):
+        self.user = User.objects.create(username='owner', email='owner@test.com', password='pass')
+        self.other = User.objects.create(username='other', email='other@test.com', password='pass')
+        self.foreign_category = Category.objects.create(user=self.other, name='Theirs', type='expense')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}")
+
+    def test_invalid_token_is_unauthorized(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer not-a-token')
+        for url in ['/api/budgets/', '/api/goals/', '/api/debts/']:
+            self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED, url)
+
+    def test_user_resolved_once_per_request(self):
+        for url in ['/api/budgets/', '/api/goals/', '/api/debts/']:
+            user_cache.clear()
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            user_selects = [q for q in ctx.captured_queries if 'FROM "users"' in q['sql']]
+            self.assertEqual(len(user_selects), 1, url)
+
+    def test_cannot_use_another_users_category(self):
+        cases = [
+            ('/api/budgets/create/', {
+                'name': 'B', 'amount': '100', 'start_date': '2025-01-01',
+                'category': self.foreign_category.id,
+            }),
+            ('/api/goals/create/', {
+                'name': 'G', 'target_amount': '100', 'target_date': '2026-01-01',
+                'category_id': self.foreign_category.id,
+            }),
+            ('/api/debts/create/', {
+                'name': 'D', 'amount': '100', 'due_date': '2026-01-01',
+                'category_id': self.foreign_category.id,
+            }),
+        ]
+        for url, data in cases:
+            response = self.client.post(url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, url)
+            self.assertEqual(response.data['message'], 'Category not found')
+
+    def test_missing_required_field_is_bad_request(self):
+        response = self.client.post('/api/goals/create/', {'name': 'No target'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cannot_touch_another_users_rows(self):
+        goal = Goal.objects.create(
+            user=self.other, name='Theirs', target_amount=Decimal('100'),
+            target_date=date(2026, 1, 1)
+        )
+        response = self.client.put(f'/api/goals/{goal.id}/', {'name': 'Mine'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.delete(f'/api/goals/{goal.id}/delete/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertTrue(Goal.objects.filter(id=goal.id).exists())
+
+    def test_update_debt_recomputes_interest(self):
+        debt = Debt.objects.create(
+            user=self.user, name='Loan', amount=Decimal('1000'),
+            total_with_interest=Decimal('1000'), due_date=date(2026, 6, 30)
+        )
+        response = self.client.put(
+            f'/api/debts/{debt.id}/', {'interest_rate': '10', 'months': 2}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['debt']['total_with_interest'], '1210.00')
+
+    def test_unrounded_total_is_rounded(self):
+        data = {
+            'name': 'Loan', 'amount': '1000', 'interest_rate': '1', 'months': 3,
+            'total_with_interest': 1030.301, 'due_date': '2026-06-30',
+        }
+        response = self.client.post('/api/debts/create/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['debt']['total_with_interest'], '1030.30')
+
+
+class ConditionalListTest(APITestCase):
+    """List endpoints revalidate with ETag / Last-Modified."""
+
+    URLS = ['/api/categories/', '/api/transactions/', '/api/budgets/', '/api/goals/', '/api/debts/']
+
+    def setUp(self):
+        self.user = User.objects.create(username='etaguser', email='etag@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}")
+        self.category = Category.objects.create(user=self.user, name='Food', type='expense')
+
+    def test_list_responses_carry_validators(self):
+        for url in self.URLS:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn('ETag', response, url)
+            self.assertIn('Last-Modified', response, url)
+            self.assertIn('Authorization', response['Vary'])
+            self.assertIn('private', response['Cache-Control'])
+
+    def test_if_none_match_returns_304_with_one_query(self):
+        for url in self.URLS:
+            etag = self.client.get(url)['ETag']
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED, url)
+            self.assertEqual(response['ETag'], etag)
+            self.assertEqual(len(ctx.captured_queries), 1, url)
+
+    def test_if_modified_since_returns_304(self):
+        last_modified = self.client.get('/api/goals/')['Last-Modified']
+        response = self.client.get('/api/goals/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_write_changes_etag(self):
+        etag = self.client.get('/api/budgets/')['ETag']
+        self.client.post('/api/budgets/create/', {
+            'name': 'Food', 'amount': '100', 'start_date': '2025-01-01'
+        }, format='json')
+        response = self.client.get('/api/budgets/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.data), 1)
+
+    def test_transaction_write_changes_dependent_lists(self):
+        etag = self.client.get('/api/goals/')['ETag']
+        tx = Transaction.objects.create(
+            user=self.user, category=self.category, amount=Decimal('5'),
+            transaction_date=date.today(), type='income'
+        )
+        self.assertNotEqual(self.client.get('/api/goals/')['ETag'], etag)
+        etag = self.client.get('/api/goals/')['ETag']
+        tx.delete()
+        self.assertNotEqual(self.client.get('/api/goals/')['ETag'], etag)
+
+    def test_rollup_rebuild_changes_etag(self):
+        Transaction.objects.create(
+            user=self.user, category=self.category, amount=Decimal('5'),
+            transaction_date=date.today(), type='expense'
+        )
+        etag = self.client.get('/api/dashboard/summary/')['ETag']
+        call_command('rebuild_rollups', stdout=StringIO())
+        response = self.client.get('/api/dashboard/summary/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_depends_on_query_and_user(self):
+        etag = self.client.get('/api/debts/')['ETag']
+        self.assertNotEqual(self.client.get('/api/debts/?totals=1')['ETag'], etag)
+
+        other = User.objects.create(username='other', email='other@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(other)['token']}")
+        response = self.client.get('/api/debts/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bump_increments_version(self):
+        before, _ = versions.current(self.user.pk)
+        versions.bump(self.user.pk)
+        self.assertEqual(versions.current(self.user.pk)[0], before + 1)
+
+    def test_deleting_user_removes_version(self):
+        Transaction.objects.create(
+            user=self.user, category=self.category, amount=Decimal('5'),
+            transaction_date=date.today(), type='income'
+        )
+        self.user.delete()
+        self.assertFalse(UserDataVersion.objects.exists())
+
+
+class ResponseCacheTest(APITestCase):
+    """Read endpoints are served from the versioned response cache."""
+
+    URLS = ['/api/categories/', '/api/budgets/', '/api/goals/', '/api/debts/', '/api/dashboard/summary/']
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.user = User.objects.create(username='cacheuser', email='cache@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}")
+        self.category = Category.objects.create(user=self.user, name='Loans', type='expense')
+        Debt.objects.create(
+            user=self.user, category=self.category, name='Car', amount=Decimal('100'),
+            total_with_interest=Decimal('100'), due_date=date(2026, 1, 1)
+        )
+
+    def test_repeat_read_only_checks_version(self):
+        for url in self.URLS:
+            first = self.client.get(url)
+            with CaptureQueriesContext(connection) as ctx:
+                second = self.client.get(url)
+            self.assertEqual(second.status_code, status.HTTP_200_OK)
+            self.assertEqual(second.json(), first.json(), url)
+            self.assertEqual(len(ctx.captured_queries), 1, url)
+
+    def test_write_is_visible_immediately(self):
+        self.assertEqual(self.client.get('/api/debts/').json()[0]['paid_amount'], '0.00')
+        Transaction.objects.create(
+            user=self.user, category=self.category, amount=Decimal('40'),
+            transaction_date=date.today(), type='expense'
+        )
+        self.assertEqual(self.client.get('/api/debts/').json()[0]['paid_amount'], '40.00')
+
+        self.client.put(f'/api/categories/{self.category.id}/', {
+            'name': 'Renamed', 'type': 'expense'
+        }, format='json')
+        self.assertEqual(self.client.get('/api/categories/').json()[0]['name'], 'Renamed')
+
+    def test_query_params_are_cached_separately(self):
+        self.assertIsInstance(self.client.get('/api/debts/').json(), list)
+        self.assertIn('totals', self.client.get('/api/debts/?totals=1').json())
+
+    def test_users_do_not_share_entries(self):
+        self.client.get('/api/debts/')
+        other = User.objects.create(username='other', email='other@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(other)['token']}")
+        self.assertEqual(self.client.get('/api/debts/').json(), [])
+
+
+class ListQueryCountTest(APITestCase):
+    """The number of queries per list request must not grow with the rows."""
+
+    def setUp(self):
+        self.user = User.objects.create(username='qcuser', email='qc@test.com', password='pass')
+        self.token = get_tokens_for_user(self.user)['token']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+
+    def add_rows(self, count):
+        for _ in range(count):
+            index = Category.objects.count()
+            category = Category.objects.create(user=self.user, name=f'Cat {index}', type='expense')
+            Transaction.objects.create(
+                user=self.user, category=category, amount=Decimal('10'),
+                transaction_date=date(2025, 1, 1), type='expense'
+            )
+            Budget.objects.create(
+                user=self.user, category=category, name=f'Budget {index}',
+                amount=Decimal('100'), start_date=date(2025, 1, 1)
+            )
+            Goal.objects.create(
+                user=self.user, category=category, name=f'Goal {index}',
+                target_amount=Decimal('100'), target_date=date(2026, 1, 1)
+            )
+            Debt.objects.create(
+                user=self.user, category=category, name=f'Debt {index}',
+                amount=Decimal('100'), total_with_interest=Decimal('100'),
+                due_date=date(2026, 1, 1)
+            )
+
+    def count_queries(self, url):
+        user_cache.clear()
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(ctx.captured_queries)
+
+    def test_query_count_constant_as_rows_grow(self):
+        urls = ['/api/transactions/', '/api/budgets/', '/api/goals/', '/api/debts/']
+        self.add_rows(1)
+        baseline = {url: self.count_queries(url) for url in urls}
+        self.add_rows(10)
+        for url in urls:
+            self.assertEqual(self.count_queries(url), baseline[url], url)
+
+    def test_update_transaction_does_not_refetch_category(self):
+        self.add_rows(1)
+        tx = Transaction.objects.get(user=self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.put(f'/api/transactions/{tx.id}/', {'description': 'x'}, format='json')
+        category_selects = [
+            q for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT') and 'FROM "categories"' in q['sql']
+        ]
+        self.assertEqual(category_selects, [])
+
+
+class RendererTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='render', email='render@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}")
+        category = Category.objects.create(user=self.user, name='Café', type='expense')
+        Transaction.objects.create(
+            user=self.user, category=category, amount=Decimal('0.10'),
+            transaction_date=date(2025, 1, 5), type='expense', description='Ñandú "quoted"'
+        )
+
+    def test_same_json_as_drf(self):
+        data = TransactionSerializer(Transaction.objects.all(), many=True).data
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+        response = self.client.get('/api/transactions/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()[0]['description'], 'Ñandú "quoted"')
+
+    def test_values_outside_json(self):
+        data = {
+            'amount': Decimal('12.50'),
+            'tiny': Decimal('0.000001'),
+            'at': datetime(2025, 1, 5, 9, 30, tzinfo=dt_timezone.utc),
+            'day': date(2025, 1, 5),
+            'ids': {3: 'x'},
+        }
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), {
+            'amount': '12.50', 'tiny': '0.000001', 'at': '2025-01-05T09:30:00Z',
+            'day': '2025-01-05', 'ids': {'3': 'x'},
+        })
+
+    def test_indent_requested(self):
+        response = self.client.get('/api/categories/', HTTP_ACCEPT='application/json; indent=2')
+        self.assertIn(b'\n  {', response.content)
+
+    @skipUnless(msgpack, 'msgpack is not installed')
+    def test_msgpack_negotiation(self):
+        response = self.client.get('/api/transactions/?fields=amount,transaction_date', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), [{'amount': '0.10', 'transaction_date': '2025-01-05'}])
+
+        response = self.client.get('/api/transactions/', HTTP_ACCEPT='application/json')
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+
+class CompressionMiddlewareTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='squeeze', email='squeeze@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}")
+        Transaction.objects.bulk_create([
+            Transaction(
+                user=self.user, amount=Decimal('10.00'), transaction_date=date(2025, 1, 1) + timedelta(days=i),
+                type='expense', description=f'Groceries {i}', notes='Weekly supermarket'
+            )
+            for i in range(40)
+        ])
+
+    def test_large_response_gzipped(self):
+        plain = self.client.get('/api/transactions/')
+        response = self.client.get('/api/transactions/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertLess(len(response.content) * 5, len(plain.content))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_not_compressed(self):
+        for encoding in ('', 'identity', 'gzip;q=0', 'deflate'):
+            response = self.client.get('/api/transactions/', HTTP_ACCEPT_ENCODING=encoding)
+            self.assertFalse(response.has_header('Content-Encoding'), encoding)
+            self.assertIn('Accept-Encoding', response['Vary'])
+
+        small = self.client.get('/api/categories/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(small.has_header('Content-Encoding'))
+
+    @override_settings(RESPONSE_COMPRESSION={'MIN_SIZE': 10, 'GZIP_LEVEL': 1, 'BROTLI_QUALITY': 1})
+    def test_min_size_setting(self):
+        response = self.client.get('/api/transactions/?type=income', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))  # "[]" is under 10 bytes
+        response = self.client.get('/api/transactions/?limit=1', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_streaming_export_compressed_per_chunk(self):
+        plain = b''.join(self.client.get('/api/transactions/export/?format=csv').streaming_content)
+        with patch('finances.exports.ROWS_PER_WRITE', 10):
+            response = self.client.get('/api/transactions/export/?format=csv', HTTP_ACCEPT_ENCODING='gzip')
+            chunks = list(response.streaming_content)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        self.assertGreater(len(chunks), 2)
+        # Every chunk is flushed, so what arrived so far already decodes.
+        partial = zlib.decompressobj(31).decompress(b''.join(chunks[:2]))
+        self.assertTrue(plain.startswith(partial) and partial)
+        self.assertEqual(gzip.decompress(b''.join(chunks)), plain)
+
+    def test_etag_weakened_and_still_matches(self):
+        response = self.client.get('/api/transactions/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        response = self.client.get(
+            '/api/transactions/', HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_not_modified_matches_compressed_validators(self):
+        for url in ('/api/transactions/', '/api/categories/'):
+            full = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+            response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=full['ETag'])
+            self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED, url)
+            self.assertEqual(response['ETag'], full['ETag'], url)
+            self.assertIn('Accept-Encoding', response['Vary'], url)
+
+        plain = self.client.get('/api/transactions/')
+        self.assertFalse(plain['ETag'].startswith('W/'))
+        response = self.client.get('/api/transactions/', HTTP_IF_NONE_MATCH=plain['ETag'])
+        self.assertEqual(response['ETag'], plain['ETag'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_choose_encoding(self):
+        with patch('core.middleware.brotli', MagicMock()):
+            self.assertEqual(choose_encoding('gzip, deflate, br'), 'br')
+            self.assertEqual(choose_encoding('br;q=0.5, gzip'), 'gzip')
+            self.assertEqual(choose_encoding('*'), 'br')
+            self.assertIsNone(choose_encoding('*;q=0, identity'))
+        with patch('core.middleware.brotli', None):
+            self.assertEqual(choose_encoding('br, gzip;q=0.1'), 'gzip')
+            self.assertIsNone(choose_encoding('br'))
+
+    @skipUnless(brotli, 'brotli is not installed')
+    def test_brotli(self):
+        plain = self.client.get('/api/transactions/')
+        response = self.client.get('/api/transactions/', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# ROLLUP TESTS
+# ═══════════════════════════════════════════════════════════════════
+
+class TransactionMonthlyRollupTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='rolluser', email='roll@test.com', password='pass')
+        self.food = Category.objects.create(user=self.user, name='Food', type='expense')
+        self.rent = Category.objects.create(user=self.user, name='Rent', type='expense')
+
+    def bucket(self, month, category, type):
+        row = TransactionMonthlyRollup.objects.filter(
+            user=self.user, month=month, category=category, type=type
+        ).first()
+        return (row.total, row.transaction_count) if row else None
+
+    def add(self, amount, day, category=None, type='expense'):
+        return Transaction.objects.create(
+            user=self.user, category=category, amount=Decimal(amount),
+            transaction_date=day, type=type
+        )
+
+    def test_create_accumulates_bucket(self):
+        self.add('10.50', date(2025, 3, 1), self.food)
+        self.add('4.50', date(2025, 3, 31), self.food)
+        self.assertEqual(self.bucket(date(2025, 3, 1), self.food, 'expense'), (Decimal('15.00'), 2))
+
+    def test_update_amount(self):
+        tx = self.add('10', date(2025, 3, 5), self.food)
+        tx.amount = Decimal('25')
+        tx.save()
+        self.assertEqual(self.bucket(date(2025, 3, 1), self.food, 'expense'), (Decimal('25'), 1))
+
+    def test_move_between_categories_months_and_types(self):
+        tx = self.add('10', date(2025, 3, 5), self.food)
+        tx.category = self.rent
+        tx.transaction_date = date(2025, 4, 2)
+        tx.type = 'income'
+        tx.save()
+        self.assertIsNone(self.bucket(date(2025, 3, 1), self.food, 'expense'))
+        self.assertEqual(self.bucket(date(2025, 4, 1), self.rent, 'income'), (Decimal('10'), 1))
+
+    def test_update_through_serializer(self):
+        tx = self.add('10', date(2025, 3, 5), self.food)
+        request = MagicMock(user=self.user)
+        serializer = TransactionSerializer(
+            tx, data={'category_id': self.rent.id}, partial=True, context={'request': request}
+        )
+        self.assertTrue(serializer.is_valid())
+        serializer.save()
+        self.assertEqual(self.bucket(date(2025, 3, 1), self.rent, 'expense'), (Decimal('10'), 1))
+        self.assertEqual(rollups.check(), [])
+
+    def test_delete_removes_bucket(self):
+        tx = self.add('10', date(2025, 3, 5), self.food)
+        tx.delete()
+        self.assertFalse(TransactionMonthlyRollup.objects.exists())
+
+    def test_queryset_delete(self):
+        self.add('10', date(2025, 3, 5), self.food)
+        self.add('5', date(2025, 3, 6), self.food)
+        Transaction.objects.filter(amount=Decimal('10')).delete()
+        self.assertEqual(self.bucket(date(2025, 3, 1), self.food, 'expense'), (Decimal('5'), 1))
+
+    def test_category_delete_moves_totals_to_uncategorized(self):
+        self.add('10', date(2025, 3, 5), self.food)
+        self.add('5', date(2025, 3, 6))
+        self.food.delete()
+        self.assertEqual(self.bucket(date(2025, 3, 1), None, 'expense'), (Decimal('15'), 2))
+        self.assertEqual(rollups.check(), [])
+
+    def test_user_delete_cascades(self):
+        self.add('10', date(2025, 3, 5), self.food)
+        self.user.delete()
+        self.assertFalse(TransactionMonthlyRollup.objects.exists())
+
+    def test_check_detects_drift_and_rebuild_fixes_it(self):
+        self.add('10', date(2025, 3, 5), self.food)
+        self.add('7', date(2025, 5, 5), type='income')
+        TransactionMonthlyRollup.objects.filter(category=self.food).update(total=Decimal('99'))
+        self.assertEqual(len(rollups.check()), 1)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuild_rollups', check=True, stdout=StringIO(), stderr=StringIO())
+
+        out = StringIO()
+        call_command('rebuild_rollups', stdout=out)
+        self.assertIn('Rollups match', out.getvalue())
+        self.assertEqual(rollups.check(), [])
+
+    def test_apply_deltas_batches_many_buckets(self):
+        deltas = rollups.new_deltas()
+        for month in range(1, 13):
+            deltas[(self.user.id, date(2025, month, 1), self.food.id, 'expense')] = [Decimal('1'), 1]
+        with CaptureQueriesContext(connection) as ctx:
+            rollups.apply_deltas(deltas)
+        self.assertEqual(TransactionMonthlyRollup.objects.count(), 12)
+        self.assertLessEqual(len(ctx.captured_queries), 5)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# IMPORT TESTS
+# ═══════════════════════════════════════════════════════════════════
+
+CSV_STATEMENT = """Date;Description;Amount;Category
+2025-01-03;Coffee;-3,50;Food
+2025-01-03;Coffee;-3,50;Food
+2025-01-05;Salary;"1.500,00";Salary
+not-a-date;Broken;-1,00;
+2025-01-06;Zero;0;
+"""
+
+OFX_STATEMENT = """OFXHEADER:100
+DATA:OFXSGML
+
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS>
+<BANKACCTFROM><ACCTID>12345</BANKACCTFROM>
+<BANKTRANLIST>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20250110120000[-5:EST]<TRNAMT>-42.10<FITID>A1<NAME>Grocery &amp; Co</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20250115
+<TRNAMT>900.00
+<FITID>A2
+<MEMO>Payroll
+</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+QIF_STATEMENT = """!Type:Bank
+D1/ 7'25
+T-12.00
+PBookstore
+LFood:Snacks
+^
+D01/08/2025
+T2,000.00
+PBonus
+L[Savings]
+^
+"""
+
+
+class StatementImportTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='importer', email='imp@test.com', password='pass')
+        self.food = Category.objects.create(user=self.user, name='Food', type='expense')
+        self.salary = Category.objects.create(user=self.user, name='Salary', type='income')
+
+    def run_import(self, text, format, **kwargs):
+        return importers.import_statement(self.user, StringIO(text), format, **kwargs)
+
+    def test_csv_import(self):
+        report = self.run_import(CSV_STATEMENT, 'csv')
+        self.assertEqual((report.rows, report.created, report.rejected), (5, 3, 2))
+        self.assertEqual([e['line'] for e in report.errors], [5, 6])
+
+        salary = Transaction.objects.get(user=self.user, description='Salary')
+        self.assertEqual(salary.amount, Decimal('1500.00'))
+        self.assertEqual(salary.type, 'income')
+        self.assertEqual(salary.category, self.salary)
+        coffees = Transaction.objects.filter(user=self.user, description='Coffee')
+        self.assertEqual(coffees.count(), 2)
+        self.assertTrue(all(tx.type == 'expense' and tx.category == self.food for tx in coffees))
+        self.assertEqual(rollups.check([self.user.id]), [])
+
+    def test_reimport_skips_duplicates(self):
+        self.run_import(CSV_STATEMENT, 'csv')
+        report = self.run_import(CSV_STATEMENT, 'csv', chunk_size=1)
+        self.assertEqual((report.created, report.duplicates), (0, 3))
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 3)
+
+    def test_identical_rows_with_interleaved_dates(self):
+        statement = (
+            'Date;Description;Amount\n'
+            '2025-01-03;Coffee;-3,50\n'
+            '2025-01-04;Bus;-2,00\n'
+            '2025-01-03;Coffee;-3,50\n'
+        )
+        report = self.run_import(statement, 'csv')
+        self.assertEqual((report.created, report.duplicates), (3, 0))
+        self.assertEqual(Transaction.objects.filter(user=self.user, description='Coffee').count(), 2)
+
+        report = self.run_import(statement, 'csv')
+        self.assertEqual((report.created, report.duplicates), (0, 3))
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 3)
+
+    def test_large_statement_streams_in_chunks(self):
+        rows = 5000
+        statement = StringIO('Date;Description;Amount\n' + ''.join(
+            f'2024-{1 + i % 12:02d}-{1 + i % 28:02d};Shop {i % 97};-{1 + i % 50},00\n' for i in range(rows)
+        ))
+        size = len(statement.getvalue())
+        inserts = []
+        insert_transactions = importers.insert_transactions
+
+        def insert(transactions):
+            inserts.append((len(transactions), statement.tell()))
+            return insert_transactions(transactions)
+
+        with patch('finances.importers.insert_transactions', insert):
+            report = importers.import_statement(self.user, statement, 'csv', chunk_size=500)
+        self.assertEqual((report.rows, report.created, report.duplicates), (rows, rows, 0))
+        self.assertEqual(len(inserts), rows // 500)
+        self.assertTrue(all(count == 500 for count, _ in inserts))
+        # The first chunk is inserted after reading only the start of the file.
+        self.assertLess(inserts[0][1], size // 5)
+
+    def test_ofx_import(self):
+        report = self.run_import(OFX_STATEMENT, 'ofx')
+        self.assertEqual(report.created, 2)
+        grocery = Transaction.objects.get(user=self.user, type='expense')
+        self.assertEqual(grocery.description, 'Grocery & Co')
+        self.assertEqual(grocery.amount, Decimal('42.10'))
+        self.assertEqual(grocery.transaction_date, date(2025, 1, 10))
+        payroll = Transaction.objects.get(user=self.user, type='income')
+        self.assertEqual(payroll.description, 'Payroll')
+        self.assertEqual(self.run_import(OFX_STATEMENT, 'ofx').duplicates, 2)
+
+    def test_ofx_tags_split_across_reads(self):
+        tags = list(importers._ofx_tags(StringIO(OFX_STATEMENT), block_size=7))
+        self.assertIn((False, 'FITID', 'A2'), tags)
+
+    def test_qif_import(self):
+        report = self.run_import(QIF_STATEMENT, 'qif')
+        self.assertEqual(report.created, 2)
+        book = Transaction.objects.get(user=self.user, description='Bookstore')
+        self.assertEqual(book.transaction_date, date(2025, 1, 7))
+        self.assertEqual(book.category, self.food)
+        bonus = Transaction.objects.get(user=self.user, description='Bonus')
+        self.assertEqual(bonus.amount, Decimal('2000.00'))
+        self.assertIsNone(bonus.category)
+
+    def test_parse_amount(self):
+        cases = {
+            '-12.30': Decimal('-12.30'), '$1,234.56': Decimal('1234.56'), '(5.00)': Decimal('-5.00'),
+            '1.234,56': Decimal('1234.56'), '7,5': Decimal('7.5'), '$-3.00': Decimal('-3.00'),
+        }
+        for text, expected in cases.items():
+            self.assertEqual(importers.parse_amount(text), expected, text)
+        with self.assertRaises(importers.RowError):
+            importers.parse_amount('abc')
+
+    def test_csv_header_must_have_date_and_amount(self):
+        with self.assertRaises(ValueError):
+            self.run_import('Foo,Bar\n1,2\n', 'csv')
+
+    def test_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.qif', delete=False) as statement:
+            statement.write(QIF_STATEMENT)
+        self.addCleanup(os.unlink, statement.name)
+        out = StringIO()
+        call_command('import_statement', statement.name, '--user', str(self.user.id), stdout=out)
+        self.assertIn('2 created', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('import_statement', statement.name, '--user', '9999', stdout=StringIO())
+
+
+class ImportTransactionsViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='upload', email='up@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}")
+
+    def upload(self, name, content, **data):
+        data['file'] = SimpleUploadedFile(name, content.encode())
+        return self.client.post('/api/transactions/import/', data, format='multipart')
+
+    def test_upload_statement(self):
+        response = self.upload('statement.ofx', OFX_STATEMENT)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['report']['created'], 2)
+        response = self.upload('statement.ofx', OFX_STATEMENT)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['report']['duplicates'], 2)
+
+    def test_unknown_format(self):
+        response = self.upload('statement.txt', 'hello')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.upload('statement.txt', CSV_STATEMENT, format='csv')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_missing_file(self):
+        response = self.client.post('/api/transactions/import/', {}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# RECURRING TESTS
+# ═══════════════════════════════════════════════════════════════════
+
+class RecurringTransactionTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='recur', email='recur@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}")
+        self.category = Category.objects.create(user=self.user, name='Rent', type='expense')
+        self.rent = Transaction.objects.create(
+            user=self.user, category=self.category, amount=Decimal('800.00'),
+            transaction_date=date(2025, 1, 31), type='expense', description='Rent',
+            payment_method='bank_transfer', is_recurring=True, recurring_frequency='monthly'
+        )
+
+    def occurrence_dates(self, template=None):
+        return list(
+            Transaction.objects.filter(recurring_parent=template or self.rent)
+            .order_by('transaction_date').values_list('transaction_date', flat=True)
+        )
+
+    def test_occurrence_dates(self):
+        dates = recurring.occurrence_dates(date(2025, 1, 31), 'monthly', date(2025, 2, 1))
+        self.assertEqual(
+            [next(dates) for _ in range(3)], [date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 30)]
+        )
+        dates = recurring.occurrence_dates(date(2025, 1, 1), 'biweekly', date(2025, 1, 20))
+        self.assertEqual(next(dates), date(2025, 1, 29))
+
+    def test_materialize(self):
+        report = recurring.materialize(date(2025, 4, 15))
+        self.assertEqual(report.created, 2)
+        self.assertEqual(self.occurrence_dates(), [date(2025, 2, 28), date(2025, 3, 31)])
+
+        occurrence = Transaction.objects.filter(recurring_parent=self.rent).first()
+        self.assertEqual(occurrence.amount, Decimal('800.00'))
+        self.assertEqual(occurrence.category_id, self.category.id)
+        self.assertEqual(occurrence.payment_method, 'bank_transfer')
+        self.assertFalse(occurrence.is_recurring)
+
+        self.rent.refresh_from_db()
+        self.assertEqual(self.rent.recurring_next_date, date(2025, 4, 30))
+
+    def test_rerun_creates_nothing(self):
+        recurring.materialize(date(2025, 4, 15))
+        self.assertEqual(recurring.materialize(date(2025, 4, 15)).created, 0)
+        self.assertEqual(len(self.occurrence_dates()), 2)
+
+    def test_catches_up_after_downtime(self):
+        recurring.materialize(date(2025, 2, 28))
+        report = recurring.materialize(date(2025, 7, 1))
+        self.assertEqual(report.created, 4)
+        self.assertEqual(self.occurrence_dates()[-1], date(2025, 6, 30))
+
+    def test_catch_up_beyond_batch_limit(self):
+        daily = Transaction.objects.create(
+            user=self.user, amount=Decimal('3.00'), transaction_date=date(2025, 1, 1),
+            type='expense', is_recurring=True, recurring_frequency='daily'
+        )
+        with patch('finances.recurring.MAX_OCCURRENCES', 7):
+            recurring.materialize(date(2025, 1, 31))
+        self.assertEqual(len(self.occurrence_dates(daily)), 30)
+
+    def test_updates_rollups_and_version(self):
+        version = versions.current(self.user.pk)[0]
+        recurring.materialize(date(2025, 4, 15))
+        self.assertEqual(rollups.check([self.user.pk]), [])
+        self.assertGreater(versions.current(self.user.pk)[0], version)
+
+    def test_future_template(self):
+        self.rent.transaction_date = date(2025, 6, 1)
+        self.rent.save()
+        self.assertEqual(recurring.materialize(date(2025, 5, 1)).created, 0)
+
+    def test_rescheduled_template_resumes(self):
+        recurring.materialize(date(2025, 3, 31))
+        response = self.client.put(
+            f'/api/transactions/{self.rent.id}/', {'recurring_frequency': 'weekly'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        recurring.materialize(date(2025, 4, 15))
+        self.assertEqual(
+            self.occurrence_dates(),
+            [date(2025, 2, 28), date(2025, 3, 31), date(2025, 4, 4), date(2025, 4, 11)],
+        )
+
+    def test_frequency_required(self):
+        response = self.client.post('/api/transactions/create/', {
+            'amount': '10.00', 'transaction_date': '2025-01-01', 'type': 'expense', 'is_recurring': True,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post('/api/transactions/create/', {
+            'amount': '10.00', 'transaction_date': '2025-01-01', 'type': 'expense',
+            'is_recurring': True, 'recurring_frequency': 'fortnightly',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('materialize_recurring', '--until', '2025-04-15', stdout=out)
+        self.assertIn('2 occurrences created up to 2025-04-15', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('materialize_recurring', '--until', 'soon')
+
+
+# ═══════════════════════════════════════════════════════════════════
+# REPORT TESTS
+# ═══════════════════════════════════════════════════════════════════
+
+class ReportJobTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='reporter', email='rep@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}")
+        food = Category.objects.create(user=self.user, name='Food (home)', type='expense')
+        Transaction.objects.create(
+            user=self.user, category=food, amount=Decimal('40.00'),
+            transaction_date=date(2025, 3, 2), type='expense', description='Groceries'
+        )
+        Transaction.objects.create(
+            user=self.user, amount=Decimal('1000.00'),
+            transaction_date=date(2025, 3, 1), type='income', description='Salary'
+        )
+        self.period = {'date_from': '2025-03-01', 'date_to': '2025-03-31'}
+
+    def request_report(self, format='pdf'):
+        return self.client.post('/api/reports/', {'format': format, **self.period}, format='json')
+
+    def test_request_is_queued(self):
+        response = self.request_report()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'pending')
+        self.assertIsNone(response.data['download_url'])
+        self.assertEqual(self.request_report().data['id'], response.data['id'])
+        self.assertEqual(ReportJob.objects.count(), 1)
+
+    def test_pdf_report(self):
+        job_id = self.request_report().data['id']
+        self.assertEqual(reports.run_pending(), 1)
+
+        response = self.client.get(f'/api/reports/{job_id}/')
+        self.assertEqual(response.data['status'], 'ready')
+        response = self.client.get(response.data['download_url'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(response.content.startswith(b'%PDF-1.4'))
+        self.assertTrue(response.content.rstrip().endswith(b'%%EOF'))
+
+    def test_xlsx_report(self):
+        self.request_report('xlsx')
+        reports.run_pending()
+        job = ReportJob.objects.get()
+
+        with zipfile.ZipFile(BytesIO(bytes(job.content))) as archive:
+            self.assertIn('xl/workbook.xml', archive.namelist())
+            summary = archive.read('xl/worksheets/sheet1.xml').decode()
+            rows = archive.read('xl/worksheets/sheet4.xml').decode()
+        self.assertIn('<v>1000.00</v>', summary)
+        self.assertIn('Food (home)', rows)
+        self.assertIn('Groceries', rows)
+
+    def test_report_data(self):
+        report = reports.report_data(self.user, date(2025, 3, 1), date(2025, 3, 31))
+        self.assertEqual(report['totals']['net_balance'], Decimal('960.00'))
+        self.assertEqual(report['categories'][0]['category_name'], 'Food (home)')
+        self.assertEqual(report['monthly'], [
+            {'month': '2025-03', 'income': Decimal('1000.00'), 'expense': Decimal('40.00')},
+        ])
+        self.assertEqual([row[1] for row in report['transactions']], ['Salary', 'Groceries'])
+
+    def test_unchanged_period_reuses_file(self):
+        self.request_report()
+        reports.run_pending()
+        response = self.request_report()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'ready')
+        self.assertIsNotNone(response.data['download_url'])
+        self.assertEqual(reports.run_pending(), 0)
+
+    def test_write_renders_new_report(self):
+        old_id = self.request_report().data['id']
+        reports.run_pending()
+        Transaction.objects.create(
+            user=self.user, amount=Decimal('5.00'),
+            transaction_date=date(2025, 3, 3), type='expense'
+        )
+
+        response = self.request_report()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertNotEqual(response.data['id'], old_id)
+        reports.run_pending()
+        self.assertEqual(list(ReportJob.objects.values_list('id', flat=True)), [response.data['id']])
+
+    def test_download_before_ready(self):
+        job_id = self.request_report().data['id']
+        response = self.client.get(f'/api/reports/{job_id}/download/')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_other_users_report(self):
+        job_id = self.request_report().data['id']
+        other = User.objects.create(username='other', email='other@test.com', password='pass')
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(other)['token']}")
+        self.assertEqual(self.client.get(f'/api/reports/{job_id}/').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(
+            self.client.get(f'/api/reports/{job_id}/download/').status_code, status.HTTP_404_NOT_FOUND
+        )
+
+    def test_invalid_request(self):
+        response = self.client.post('/api/reports/', {'format': 'docx'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(
+            '/api/reports/', {'date_from': '2025-04-01', 'date_to': '2025-03-01'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_failed_job_is_queued_again(self):
+        self.request_report()
+        with patch.dict('finances.reports.RENDERERS', {'pdf': (MagicMock(side_effect=RuntimeError('boom')), '')}):
+            reports.run_pending()
+        job = ReportJob.objects.get()
+        self.assertEqual((job.status, job.error), ('failed', 'boom'))
+
+        response = self.request_report()
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['status'], 'pending')
+
+    def test_claim_skips_running_jobs(self):
+        self.request_report()
+        self.assertIsNotNone(reports.claim_job())
+        self.assertIsNone(reports.claim_job())
+
+        ReportJob.objects.update(started_at=timezone.now() - reports.STALE_AFTER - timedelta(minutes=1))
+        self.assertIsNotNone(reports.claim_job())
+
+    def test_worker_command(self):
+        self.request_report()
+        self.request_report('xlsx')
+        out = StringIO()
+        call_command('run_report_jobs', '--once', stdout=out)
+        self.assertEqual(out.getvalue().count(': ready in'), 2)
+        self.assertFalse(ReportJob.objects.exclude(status='ready').exists())
+
+
 # ═══════════════════════════════════════════════════════════════════
 # AUTHENTICATION TESTS
 # ═══════════════════════════════════════════════════════════════════
@@ -993,6 +2689,332 @@ class CustomJWTAuthenticationTest(TestCase):
             self.auth.get_user(validated)
 
 
+class UserCacheTest(APITestCase):
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create(username='cacheuser', email='cache@test.com', password='pass')
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {get_tokens_for_user(self.user)['token']}"
+        )
+
+    def tearDown(self):
+        user_cache.clear()
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get('/api/categories/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [q for q in ctx.captured_queries if 'FROM "users"' in q['sql']]
+
+    def test_second_request_skips_user_query(self):
+        self.assertEqual(len(self.user_queries()), 1)
+        self.assertEqual(self.user_queries(), [])
+        stats = user_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_cached_user_is_a_fresh_instance(self):
+        auth = CustomJWTAuthentication()
+        token = auth.get_validated_token(get_tokens_for_user(self.user)['token'])
+        first = auth.get_user(token)
+        second = auth.get_user(token)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.email, 'cache@test.com')
+        self.assertFalse(second._state.adding)
+
+    def test_saving_user_invalidates_entry(self):
+        self.user_queries()
+        self.user.username = 'renamed'
+        self.user.save()
+        self.assertEqual(len(self.user_queries()), 1)
+
+    def test_deleted_user_is_rejected(self):
+        self.user_queries()
+        self.user.delete()
+        response = self.client.get('/api/categories/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(AUTH_USER_CACHE={'MAX_SIZE': 2, 'TTL': 60})
+    def test_lru_eviction(self):
+        users = [
+            User.objects.create(username=f'lru{i}', email=f'lru{i}@test.com', password='pass')
+            for i in range(3)
+        ]
+        for user in users:
+            user_cache.set(user)
+        self.assertIsNone(user_cache.get(users[0].id))
+        self.assertIsNotNone(user_cache.get(users[2].id))
+        self.assertEqual(user_cache.stats()['size'], 2)
+
+    @override_settings(AUTH_USER_CACHE={'MAX_SIZE': 10, 'TTL': 0})
+    def test_disabled_cache(self):
+        self.assertEqual(len(self.user_queries()), 1)
+        self.assertEqual(len(self.user_queries()), 1)
+
+    @override_settings(
+        AUTH_USER_CACHE={'MAX_SIZE': 10, 'TTL': 60, 'SHARED_CACHE': 'default'},
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    )
+    def test_shared_cache_fallback(self):
+        user_cache.set(self.user)
+        with user_cache._lock:
+            user_cache._entries.clear()
+        self.assertEqual(user_cache.get(self.user.id).email, 'cache@test.com')
+        self.assertEqual(user_cache.stats()['shared_hits'], 1)
+        user_cache.invalidate(self.user.id)
+
+    @override_settings(
+        AUTH_USER_CACHE={'MAX_SIZE': 10, 'TTL': 60, 'SHARED_CACHE': 'default'},
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    )
+    def test_password_hash_is_not_cached(self):
+        auth = CustomJWTAuthentication()
+        auth.get_user(auth.get_validated_token(get_tokens_for_user(self.user)['token']))
+        entry = caches['default'].get(user_cache._key(self.user.id))
+        self.assertEqual(entry['email'], 'cache@test.com')
+        self.assertNotIn('password', entry)
+        with user_cache._lock:
+            _, values = user_cache._entries[self.user.id]
+        self.assertNotIn('password', values)
+        cached = user_cache.get(self.user.id)
+        self.assertIn('password', cached.get_deferred_fields())
+        user_cache.invalidate(self.user.id)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_endpoint_exposes_counters(self):
+        self.user_queries()
+        self.client.credentials(HTTP_X_METRICS_TOKEN='secret')
+        response = self.client.get('/api/system/metrics/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['auth_user_cache']['misses'], 1)
+
+    def test_metrics_endpoint_hidden_without_token(self):
+        response = self.client.get('/api/system/metrics/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class PasswordHashingTest(APITestCase):
+    def setUp(self):
+        self.user = User(username='hashuser', email='hash@test.com')
+
+    def login(self, password='StrongPass1'):
+        return self.client.post('/api/login/', {'email': 'hash@test.com', 'password': password}, format='json')
+
+    def test_set_password_uses_configured_rounds(self):
+        self.user.set_password('StrongPass1')
+        self.assertEqual(hash_cost(self.user.password), 4)
+        with override_settings(PASSWORD_HASHING={**settings.PASSWORD_HASHING, 'ROUNDS': 5}):
+            self.user.set_password('StrongPass1')
+        self.assertEqual(hash_cost(self.user.password), 5)
+
+    def test_login_rehashes_other_cost(self):
+        self.user.password = bcrypt.hashpw(b'StrongPass1', bcrypt.gensalt(5)).decode('utf-8')
+        self.user.save()
+        rehashes = password_hasher.rehashes
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(hash_cost(self.user.password), 4)
+        self.assertTrue(self.user.check_password('StrongPass1'))
+        self.assertEqual(password_hasher.rehashes, rehashes + 1)
+
+    def test_failed_login_keeps_hash(self):
+        old = bcrypt.hashpw(b'StrongPass1', bcrypt.gensalt(5)).decode('utf-8')
+        self.user.password = old
+        self.user.save()
+        response = self.login('wrongpass')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.password, old)
+
+    def test_saturated_hasher_answers_503(self):
+        self.user.set_password('StrongPass1')
+        self.user.save()
+        release = threading.Event()
+        hashing = {**settings.PASSWORD_HASHING, 'MAX_CONCURRENCY': 1, 'MAX_QUEUE': 0}
+        with override_settings(PASSWORD_HASHING=hashing):
+            blocker = threading.Thread(target=password_hasher._run, args=(release.wait, 5))
+            blocker.start()
+            try:
+                while password_hasher.stats()['running'] == 0:
+                    release.wait(0.01)
+                response = self.login()
+            finally:
+                release.set()
+                blocker.join()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_queue_timeout(self):
+        release = threading.Event()
+        hashing = {**settings.PASSWORD_HASHING, 'MAX_CONCURRENCY': 1, 'MAX_QUEUE': 1, 'TIMEOUT': 0.05}
+        with override_settings(PASSWORD_HASHING=hashing):
+            blocker = password_hasher.executor().submit(release.wait, 5)
+            try:
+                with self.assertRaises(PasswordHashingBusy):
+                    password_hasher.hash('StrongPass1')
+            finally:
+                release.set()
+                blocker.result()
+
+    def test_timed_out_work_keeps_its_slot(self):
+        release = threading.Event()
+        hashing = {**settings.PASSWORD_HASHING, 'MAX_CONCURRENCY': 1, 'MAX_QUEUE': 0, 'TIMEOUT': 0.05}
+        with override_settings(PASSWORD_HASHING=hashing):
+            try:
+                with self.assertRaises(PasswordHashingBusy):
+                    password_hasher._run(release.wait, 5)
+                # The timed-out call is still running on the only thread.
+                self.assertEqual(password_hasher.pending, 1)
+                self.assertEqual(password_hasher.stats()['waiting'], 0)
+                with self.assertRaises(PasswordHashingBusy):
+                    password_hasher._run(release.wait, 5)
+            finally:
+                release.set()
+            for _ in range(500):
+                if password_hasher.pending == 0:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(password_hasher.pending, 0)
+            self.assertTrue(password_hasher._run(release.wait, 5))
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_report_hashing(self):
+        self.client.credentials(HTTP_X_METRICS_TOKEN='secret')
+        response = self.client.get('/api/system/metrics/')
+        hashing = response.data['password_hashing']
+        self.assertEqual(hashing['rounds'], 4)
+        self.assertEqual(hashing['running'], 0)
+        self.assertIn('rejected', hashing)
+
+
+class BenchmarkLoginTest(TransactionTestCase):
+    def test_benchmark_login(self):
+        out = StringIO()
+        call_command('benchmark_login', logins=4, clients=2, probes=2, stdout=out)
+        report = out.getvalue()
+        self.assertIn('4 ok, 0 rejected', report)
+        self.assertIn('logins/s', report)
+        self.assertFalse(User.objects.filter(email='bench_login@bench.local').exists())
+
+
+class DatabaseConnectionTest(APITestCase):
+    def load_settings(self, **env):
+        import core.settings
+        with patch.dict(os.environ, env):
+            os.environ.pop('DATABASE_URL', None)
+            database = importlib.reload(core.settings).DATABASES['default']
+        importlib.reload(core.settings)
+        return database
+
+    def test_persistent_connections_by_default(self):
+        database = self.load_settings()
+        self.assertEqual(database['CONN_MAX_AGE'], 60)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+        self.assertFalse(database['DISABLE_SERVER_SIDE_CURSORS'])
+        self.assertNotIn('pool', database.get('OPTIONS', {}))
+
+    def test_pool_from_environment(self):
+        database = self.load_settings(
+            DB_POOL='1', DB_POOL_MIN_SIZE='4', DB_POOL_MAX_SIZE='16', DB_POOL_TIMEOUT='2.5',
+            DB_DISABLE_SERVER_SIDE_CURSORS='1',
+        )
+        self.assertEqual(database['CONN_MAX_AGE'], 0)
+        self.assertEqual(database['OPTIONS']['pool'], {
+            'min_size': 4, 'max_size': 16, 'timeout': 2.5, 'max_idle': 300.0, 'max_lifetime': 3600.0,
+        })
+        self.assertTrue(database['DISABLE_SERVER_SIDE_CURSORS'])
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_report_connections(self):
+        self.client.credentials(HTTP_X_METRICS_TOKEN='secret')
+        response = self.client.get('/api/system/metrics/')
+        database = response.data['database']['default']
+        self.assertEqual(database['vendor'], 'sqlite')
+        self.assertTrue(database['open'])
+        self.assertIsNone(database['pool'])
+
+        pool = MagicMock()
+        pool.get_stats.return_value = {'pool_size': 3, 'requests_waiting': 0}
+        with patch.object(connections['default'], 'pool', pool, create=True):
+            response = self.client.get('/api/system/metrics/')
+        self.assertEqual(response.data['database']['default']['pool'], {'pool_size': 3, 'requests_waiting': 0})
+
+
+class StartupProfileTest(TestCase):
+    ENV = {
+        'DB_ENGINE': 'django.db.backends.sqlite3',
+        'DB_NAME': ':memory:',
+        'ALLOWED_HOSTS': 'testserver',
+        'METRICS_TOKEN': 'secret',
+    }
+
+    def run_python(self, script, settings_module):
+        env = {**os.environ, **self.ENV, 'DJANGO_SETTINGS_MODULE': settings_module}
+        env.pop('DATABASE_URL', None)
+        process = subprocess.run(
+            [sys.executable, '-c', script], cwd=settings.BASE_DIR, env=env,
+            capture_output=True, text=True,
+        )
+        self.assertEqual(process.returncode, 0, process.stderr)
+        return json.loads(process.stdout.strip().splitlines()[-1])
+
+    def test_api_profile_serves_api_without_unused_modules(self):
+        result = self.run_python(
+            'import json, sys\n'
+            'from django.core.wsgi import get_wsgi_application\n'
+            'get_wsgi_application()\n'
+            'from django.conf import settings\n'
+            'from django.test import Client\n'
+            "response = Client().get('/api/system/metrics/', HTTP_X_METRICS_TOKEN='secret')\n"
+            "admin = Client().get('/admin/')\n"
+            'print(json.dumps({\n'
+            "    'status': response.status_code, 'admin': admin.status_code,\n"
+            "    'apps': settings.INSTALLED_APPS, 'middleware': settings.MIDDLEWARE,\n"
+            "    'loaded': [name for name in ('google.oauth2', 'bcrypt', 'social_core', 'social_django')\n"
+            '               if name in sys.modules],\n'
+            '}))\n',
+            'core.settings_api',
+        )
+        self.assertEqual(result['status'], 200)
+        self.assertEqual(result['admin'], 404)
+        self.assertEqual(result['loaded'], [])
+        self.assertNotIn('django.contrib.admin', result['apps'])
+        self.assertNotIn('social_django', result['apps'])
+        self.assertNotIn('django.contrib.sessions.middleware.SessionMiddleware', result['middleware'])
+
+    def test_api_profile_drops_browsable_api(self):
+        result = self.run_python(
+            'import json\n'
+            'import django\n'
+            'django.setup()\n'
+            'from rest_framework.settings import api_settings\n'
+            'print(json.dumps([renderer.__name__ for renderer in api_settings.DEFAULT_RENDERER_CLASSES]))\n',
+            'core.settings_api',
+        )
+        self.assertEqual(result[0], 'ORJSONRenderer')
+        self.assertNotIn('BrowsableAPIRenderer', result)
+
+    def test_benchmark_startup(self):
+        out = StringIO()
+        with patch.dict(os.environ, self.ENV):
+            call_command('benchmark_startup', profiles=['core.settings_api'], repeat=1, top=3, stdout=out)
+        report = out.getvalue()
+        self.assertIn('core.settings_api', report)
+        self.assertIn('import time by package', report)
+        self.assertIn('django', report)
+
+    def test_parse_importtime(self):
+        from .management.commands.benchmark_startup import parse_importtime
+        packages = parse_importtime(
+            'import time: self [us] | cumulative | imported package\n'
+            'import time:       100 |        100 |   django.utils\n'
+            'import time:       300 |        400 | django.conf\n'
+            'import time:       500 |        500 | django.db\n'
+            'import time:        20 |         20 | finances\n'
+        )
+        self.assertEqual(packages, {'django': 900, 'finances': 20})
+
+
 # ═══════════════════════════════════════════════════════════════════
 # HELPER FUNCTION TESTS
 # ═══════════════════════════════════════════════════════════════════
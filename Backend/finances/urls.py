@@ -16,24 +16,39 @@ urlpatterns = [
     # ── TRANSACTIONS ─────────────────────────────────────────────
     re_path(r'^transactions/?$', views.get_transactions, name='get_transactions'),
     path('transactions/create/', views.create_transaction, name='create_transaction'),
+    path('transactions/bulk/', views.bulk_create_transactions, name='bulk_create_transactions'),
+    path('transactions/import/', views.import_transactions, name='import_transactions'),
+    path('transactions/export/', views.export_transactions, name='export_transactions'),
+    re_path(r'^transactions/search/?$', views.search_transactions, name='search_transactions'),
     re_path(r'^transactions/(?P<transaction_id>\d+)/?$', views.update_transaction, name='update_transaction'),
     re_path(r'^transactions/(?P<transaction_id>\d+)/delete/?$', views.delete_transaction, name='delete_transaction'),
 
     # ── BUDGETS ──────────────────────────────────────────────────
-    re_path(r'^budgets/?$', views.get_budgets, name='get_budgets'),
-    path('budgets/create/', views.create_budget, name='create_budget'),
-    re_path(r'^budgets/(?P<budget_id>\d+)/?$', views.update_budget, name='update_budget'),
-    re_path(r'^budgets/(?P<budget_id>\d+)/delete/?$', views.delete_budget, name='delete_budget'),
+    re_path(r'^budgets/?$', views.BudgetViewSet.as_view({'get': 'list'}), name='get_budgets'),
+    path('budgets/create/', views.BudgetViewSet.as_view({'post': 'create'}), name='create_budget'),
+    re_path(r'^budgets/(?P<pk>\d+)/?$', views.BudgetViewSet.as_view({'put': 'update'}), name='update_budget'),
+    re_path(r'^budgets/(?P<pk>\d+)/delete/?$', views.BudgetViewSet.as_view({'delete': 'destroy'}), name='delete_budget'),
 
     # ── GOALS ────────────────────────────────────────────────────
-    re_path(r'^goals/?$', views.get_goals, name='get_goals'),
-    path('goals/create/', views.create_goal, name='create_goal'),
-    re_path(r'^goals/(?P<goal_id>\d+)/?$', views.update_goal, name='update_goal'),
-    re_path(r'^goals/(?P<goal_id>\d+)/delete/?$', views.delete_goal, name='delete_goal'),
+    re_path(r'^goals/?$', views.GoalViewSet.as_view({'get': 'list'}), name='get_goals'),
+    path('goals/create/', views.GoalViewSet.as_view({'post': 'create'}), name='create_goal'),
+    re_path(r'^goals/(?P<pk>\d+)/?$', views.GoalViewSet.as_view({'put': 'update'}), name='update_goal'),
+    re_path(r'^goals/(?P<pk>\d+)/delete/?$', views.GoalViewSet.as_view({'delete': 'destroy'}), name='delete_goal'),
 
     # ── DEBTS ────────────────────────────────────────────────────
-    re_path(r'^debts/?$', views.get_debts, name='get_debts'),
-    path('debts/create/', views.create_debt, name='create_debt'),
-    re_path(r'^debts/(?P<debt_id>\d+)/?$', views.update_debt, name='update_debt'),
-    re_path(r'^debts/(?P<debt_id>\d+)/delete/?$', views.delete_debt, name='delete_debt'),
-]
\ No newline at end of file
+    re_path(r'^debts/?$', views.DebtViewSet.as_view({'get': 'list'}), name='get_debts'),
+    path('debts/create/', views.DebtViewSet.as_view({'post': 'create'}), name='create_debt'),
+    re_path(r'^debts/(?P<pk>\d+)/?$', views.DebtViewSet.as_view({'put': 'update'}), name='update_debt'),
+    re_path(r'^debts/(?P<pk>\d+)/delete/?$', views.DebtViewSet.as_view({'delete': 'destroy'}), name='delete_debt'),
+
+    # ── DASHBOARD ────────────────────────────────────────────────
+    re_path(r'^dashboard/summary/?$', views.get_dashboard_summary, name='get_dashboard_summary'),
+
+    # ── REPORTS ──────────────────────────────────────────────────
+    path('reports/', views.create_report, name='create_report'),
+    re_path(r'^reports/(?P<report_id>\d+)/?$', views.get_report, name='get_report'),
+    re_path(r'^reports/(?P<report_id>\d+)/download/?$', views.download_report, name='download_report'),
+
+    # ── SYSTEM ───────────────────────────────────────────────────
+    path('system/metrics/', views.get_metrics, name='get_metrics'),
+]
@@ -0,0 +1,143 @@
+import hashlib
+from datetime import datetime, time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from core.middleware import choose_encoding
+
+from .models import UserDataVersion
+
+
+def bump(user_id):
+    """Record a write to the user's data."""
+    now = timezone.now()
+    versions = UserDataVersion.objects.filter(user_id=user_id)
+    if versions.update(version=F('version') + 1, updated_at=now):
+        return
+    _, created = UserDataVersion.objects.get_or_create(
+        user_id=user_id, defaults={'version': 1, 'updated_at': now}
+    )
+    if not created:
+        versions.update(version=F('version') + 1, updated_at=now)
+
+
+def bump_many(user_ids):
+    """bump() for many users with one update and at most one insert."""
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    now = timezone.now()
+    versions = UserDataVersion.objects.filter(user_id__in=user_ids)
+    existing = set(versions.values_list('user_id', flat=True))
+    versions.update(version=F('version') + 1, updated_at=now)
+    UserDataVersion.objects.bulk_create(
+        [UserDataVersion(user_id=user_id, version=1, updated_at=now) for user_id in user_ids - existing],
+        ignore_conflicts=True,
+    )
+
+
+def current(user_id):
+    """(version, updated_at) of the user's data; (0, None) before any write."""
+    row = UserDataVersion.objects.filter(user_id=user_id).values_list('version', 'updated_at').first()
+    return row or (0, None)
+
+
+def validators(request):
+    """
+    ETag and Last-Modified timestamp for the response to a GET request.
+
+    Responses also depend on today's date (budget windows, dashboard
+    periods), so both validators roll over at local midnight. The result
+    is kept on the request for the response cache.
+    """
+    if hasattr(request, '_validators'):
+        return request._validators
+
+    version, updated_at = current(request.user.pk)
+    today = timezone.localdate()
+    renderer = getattr(request, 'accepted_renderer', None)
+    key = ':'.join([
+        str(request.user.pk),
+        str(version),
+        updated_at.isoformat() if updated_at else '',
+        today.isoformat(),
+        renderer.format if renderer else '',
+        request.get_full_path(),
+    ])
+    etag = '"%s"' % hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()
+
+    midnight = timezone.make_aware(datetime.combine(today, time.min))
+    last_modified = max(updated_at, midnight) if updated_at else midnight
+    request._validators = etag, int(last_modified.timestamp())
+    return request._validators
+
+
+def _request(view_args):
+    # Function views get the request first, ViewSet actions after self.
+    return view_args[0] if isinstance(view_args[0], Request) else view_args[1]
+
+
+def conditional(view):
+    """
+    Answer If-None-Match / If-Modified-Since on a read view with a 304
+    before the view runs. Works on function views and ViewSet actions.
+
+    When the client accepts an encoding CompressionMiddleware can produce,
+    the ETag is weak on both the 200 and the 304, so the validator does not
+    depend on whether the body ended up compressed.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        request = _request(args)
+        etag, last_modified = validators(request)
+        if choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+            etag = 'W/' + etag
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = view(*args, **kwargs)
+            if response.status_code != 200:
+                return response
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ['Authorization', 'Accept-Encoding'])
+        return response
+    return wrapper
+
+
+_MISSING = object()
+
+
+def cached(view):
+    """
+    Serve a read view's data from the response cache.
+
+    The key is the ETag, so it changes with the user's data version, the
+    date, the renderer and the query string; entries left behind by a
+    write are never read again and expire or get culled by the cache.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        request = _request(args)
+        cache = caches[settings.RESPONSE_CACHE_ALIAS]
+        key = 'response:' + validators(request)[0].strip('"')
+
+        data = cache.get(key, _MISSING)
+        if data is not _MISSING:
+            return Response(data)
+
+        response = view(*args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data)
+        return response
+    return wrapper
@@ -1,13 +1,29 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes, renderer_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework import status
-from rest_framework_simplejwt.tokens import RefreshToken, AccessToken
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
-from .serializers import RegisterSerializer, LoginSerializer, CategorySerializer, TransactionSerializer, BudgetSerializer, GoalSerializer, DebtSerializer
-from .models import User, Category, Transaction, Budget, Goal, Debt
-import bcrypt
+from rest_framework import status, viewsets
+from rest_framework_simplejwt.tokens import RefreshToken
+from .serializers import RegisterSerializer, LoginSerializer, CategorySerializer, TransactionSerializer, BudgetSerializer, GoalSerializer, DebtSerializer, ReportRequestSerializer, ReportJobSerializer
+from .passwords import PasswordHashingBusy, password_hasher
+from .models import User, Category, Transaction, Budget, Goal, Debt, ReportJob
+from .aggregates import (
+    budget_progress, dashboard_summary, debt_totals, with_debt_progress, with_goal_progress,
+)
+from .fieldsets import InvalidFields, columns, is_columnar, list_data, only_fields, sparse_fields
+from .filters import InvalidFilter, filter_transactions, ordering
+from .pagination import InvalidPage, paginate_by_date, parse_limit, parse_offset, wants_cursor_page
+from .search import InvalidSearch
+from .authentication import user_cache
+from .database import connection_stats
+from .versions import cached, conditional
+from . import bulk, exports, importers, reports, search
+from .documents import RENDERERS
+from .renderers import CSVRenderer, NDJSONRenderer, ORJSONRenderer
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+import hmac
 import os
 
 
@@ -44,18 +60,20 @@ def register(request):
                 status=status.HTTP_409_CONFLICT
             )
 
-        hashed = bcrypt.hashpw(
-            password.encode('utf-8'),
-            bcrypt.gensalt()
-        ).decode('utf-8')
-
-        user = User(username=username, email=email, password=hashed)
+        user = User(username=username, email=email)
+        user.set_password(password)
         user.save()
 
         return Response(
             {'message': 'User registered successfully'},
             status=status.HTTP_201_CREATED
         )
+    except PasswordHashingBusy as e:
+        return Response(
+            {'message': str(e)},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={'Retry-After': '1'}
+        )
     except Exception as e:
         print(f"Error in register: {e}")
         return Response(
@@ -91,10 +109,7 @@ def login(request):
                 status=status.HTTP_401_UNAUTHORIZED
             )
 
-        if not bcrypt.checkpw(
-            password.encode('utf-8'),
-            user.password.encode('utf-8')
-        ):
+        if not user.check_password(password):
             return Response(
                 {'message': 'Invalid credentials'},
                 status=status.HTTP_401_UNAUTHORIZED
@@ -109,6 +124,12 @@ def login(request):
                 'email': user.email,
             }
         })
+    except PasswordHashingBusy as e:
+        return Response(
+            {'message': str(e)},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={'Retry-After': '1'}
+        )
     except Exception as e:
         print(f"Error in login: {e}")
         return Response(
@@ -135,6 +156,11 @@ def google_auth(request):
         )
 
     try:
+        # google-auth (and requests under it) is only needed here; importing
+        # it lazily keeps it out of every cold start.
+        from google.oauth2 import id_token
+        from google.auth.transport import requests as google_requests
+
         idinfo = id_token.verify_oauth2_token(
             google_token,
             google_requests.Request(),
@@ -186,11 +212,22 @@ def google_auth(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional
+@cached
 def get_categories(request):
     try:
+        try:
+            fields = sparse_fields(request.query_params, CategorySerializer)
+            columnar = is_columnar(request.query_params)
+        except InvalidFields as e:
+            return Response(
+                {'message': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         categories = Category.objects.filter(user=request.user).order_by('-created_at')
-        serializer = CategorySerializer(categories, many=True)
-        return Response(serializer.data)
+        serializer = CategorySerializer(categories, many=True, context={'fields': fields})
+        return Response(list_data(serializer, columnar))
     except Exception as e:
         print(f"Error in get_categories: {e}")
         return Response(
@@ -290,11 +327,42 @@ def delete_category(request, category_id):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional
 def get_transactions(request):
     try:
-        transactions = Transaction.objects.filter(user=request.user).order_by('-created_at')
-        serializer = TransactionSerializer(transactions, many=True, context={'request': request})
-        return Response(serializer.data)
+        transactions = Transaction.objects.filter(user=request.user).select_related('category')
+        try:
+            transactions = filter_transactions(transactions, request.query_params)
+            order_by = ordering(request.query_params)
+            fields = sparse_fields(request.query_params, TransactionSerializer)
+            columnar = is_columnar(request.query_params)
+        except (InvalidFilter, InvalidFields) as e:
+            return Response(
+                {'message': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        # Cursor pages read the date of the last row.
+        transactions = only_fields(transactions, TransactionSerializer, fields, 'transaction_date')
+
+        # Opt-in keyset pagination; without cursor/limit the full list is
+        # returned as before for older clients.
+        if wants_cursor_page(request.query_params):
+            try:
+                rows, next_cursor = paginate_by_date(transactions, request.query_params)
+            except InvalidPage as e:
+                return Response(
+                    {'message': str(e)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            serializer = TransactionSerializer(rows, many=True, context={'request': request, 'fields': fields})
+            return Response({
+                'results': list_data(serializer, columnar),
+                'next_cursor': next_cursor,
+            })
+
+        transactions = transactions.order_by(*order_by)
+        serializer = TransactionSerializer(transactions, many=True, context={'request': request, 'fields': fields})
+        return Response(list_data(serializer, columnar))
     except Exception as e:
         print(f"Error in get_transactions: {e}")
         return Response(
@@ -303,6 +371,42 @@ def get_transactions(request):
         )
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional
+def search_transactions(request):
+    try:
+        transactions = Transaction.objects.filter(user=request.user).select_related('category')
+        try:
+            q = search.clean_query(request.query_params.get('q'))
+            limit = parse_limit(request.query_params.get('limit'))
+            offset = parse_offset(request.query_params.get('offset'))
+            transactions = filter_transactions(transactions, request.query_params)
+            fields = sparse_fields(request.query_params, TransactionSerializer)
+            columnar = is_columnar(request.query_params)
+        except (InvalidSearch, InvalidPage, InvalidFilter, InvalidFields) as e:
+            return Response(
+                {'message': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        transactions = only_fields(transactions, TransactionSerializer, fields)
+
+        # Best matches first; offset pages because the rank is not a
+        # column a cursor could seek on.
+        rows = list(search.search(transactions, q, connection, request.user.id)[offset:offset + limit + 1])
+        serializer = TransactionSerializer(rows[:limit], many=True, context={'request': request, 'fields': fields})
+        return Response({
+            'results': list_data(serializer, columnar),
+            'next_offset': offset + limit if len(rows) > limit else None,
+        })
+    except Exception as e:
+        print(f"Error in search_transactions: {e}")
+        return Response(
+            {'message': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_transaction(request):
@@ -332,132 +436,118 @@ def create_transaction(request):
         )
 
 
-@api_view(['PUT'])
+@api_view(['POST'])
 @permission_classes([IsAuthenticated])
-def update_transaction(request, transaction_id):
+def bulk_create_transactions(request):
     try:
-        try:
-            transaction = Transaction.objects.get(id=transaction_id, user=request.user)
-        except Transaction.DoesNotExist:
+        rows = request.data.get('transactions') if isinstance(request.data, dict) else request.data
+
+        if not isinstance(rows, list) or not rows:
             return Response(
-                {'message': 'Transaction not found'},
-                status=status.HTTP_404_NOT_FOUND
+                {'message': 'Send a non-empty list of transactions'},
+                status=status.HTTP_400_BAD_REQUEST
             )
-        
-        serializer = TransactionSerializer(transaction, data=request.data, context={'request': request}, partial=True)
-        
-        if not serializer.is_valid():
-            errors = serializer.errors
-            first_error = next(iter(errors.values()))[0]
+        if len(rows) > bulk.MAX_ROWS:
             return Response(
-                {'message': str(first_error)},
+                {'message': f'At most {bulk.MAX_ROWS} transactions per request'},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        serializer.save()
-        
+
+        transactions, errors = bulk.build_transactions(request, rows)
+
+        # All or nothing: one invalid row rejects the whole batch.
+        if errors:
+            return Response({
+                'message': f'{len(errors)} of {len(rows)} transactions are invalid',
+                'errors': errors,
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        created = bulk.insert_transactions(transactions)
+
         return Response({
-            'message': 'Transaction updated successfully',
-            'transaction': TransactionSerializer(serializer.instance, context={'request': request}).data
-        })
-        
+            'message': f'{len(created)} transactions created successfully',
+            'count': len(created),
+            'ids': [tx.id for tx in created],
+        }, status=status.HTTP_201_CREATED)
+
     except Exception as e:
-        print(f"Error in update_transaction: {e}")
+        print(f"Error in bulk_create_transactions: {e}")
         return Response(
             {'message': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
 
-@api_view(['DELETE'])
+@api_view(['POST'])
 @permission_classes([IsAuthenticated])
-def delete_transaction(request, transaction_id):
+def import_transactions(request):
     try:
-        try:
-            transaction = Transaction.objects.get(id=transaction_id, user=request.user)
-        except Transaction.DoesNotExist:
+        upload = request.FILES.get('file')
+        if upload is None:
             return Response(
-                {'message': 'Transaction not found'},
-                status=status.HTTP_404_NOT_FOUND
+                {'message': 'Statement file is required'},
+                status=status.HTTP_400_BAD_REQUEST
             )
-        
-        transaction.delete()
-        
-        return Response({'message': 'Transaction deleted successfully'})
-        
-    except Exception as e:
-        print(f"Error in delete_transaction: {e}")
-        return Response(
-            {'message': str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
-
 
-# ── BUDGETS ──────────────────────────────────────────────────────
-
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def get_budgets(request):
-    try:
-        auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Bearer '):
+        try:
+            format = importers.detect_format(upload.name, request.data.get('format'))
+            report = importers.import_statement(
+                request.user,
+                importers.open_text(upload.file, request.data.get('encoding') or 'utf-8-sig'),
+                format,
+                date_format=request.data.get('date_format') or None,
+            )
+        except (ValueError, LookupError) as e:
             return Response(
-                {'message': 'Token not provided'},
-                status=status.HTTP_401_UNAUTHORIZED
+                {'message': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
             )
-        
-        token = auth_header.split(' ')[1]
-        access_token = AccessToken(token)
-        user_id = access_token['id']
-        
-        user = User.objects.get(id=user_id)
-        budgets = Budget.objects.filter(user=user, is_active=True).select_related('category').order_by('-start_date')
-        serializer = BudgetSerializer(budgets, many=True)
-        
-        return Response(serializer.data)
+
+        return Response({
+            'message': f'{report.created} transactions imported',
+            'report': report.as_dict(),
+        }, status=status.HTTP_201_CREATED if report.created else status.HTTP_200_OK)
+
     except Exception as e:
-        print(f"❌ Error in get_budgets: {e}")
+        print(f"Error in import_transactions: {e}")
         return Response(
             {'message': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def create_budget(request):
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@renderer_classes([ORJSONRenderer, CSVRenderer, NDJSONRenderer])
+def export_transactions(request):
     try:
-        auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Bearer '):
-            return Response(
-                {'message': 'Token not provided'},
-                status=status.HTTP_401_UNAUTHORIZED
+        # ?format=csv|ndjson (or the Accept header) picks the renderer.
+        renderer = request.accepted_renderer
+        if renderer.format not in exports.EXPORT_FORMATS:
+            renderer = CSVRenderer()
+
+        try:
+            transactions = filter_transactions(
+                Transaction.objects.filter(user=request.user), request.query_params
             )
-        
-        token = auth_header.split(' ')[1]
-        access_token = AccessToken(token)
-        user_id = access_token['id']
-        user = User.objects.get(id=user_id)
-        
-        serializer = BudgetSerializer(data=request.data)
-        
-        if not serializer.is_valid():
-            errors = serializer.errors
-            first_error = next(iter(errors.values()))[0]
+        except InvalidFilter as e:
             return Response(
-                {'message': str(first_error)},
+                {'message': str(e)},
                 status=status.HTTP_400_BAD_REQUEST
             )
-        
-        budget = serializer.save(user=user)
-        
-        return Response({
-            'message': 'Budget created successfully',
-            'budget': BudgetSerializer(budget).data
-        }, status=status.HTTP_201_CREATED)
-        
+
+        rows = exports.export_rows(transactions)
+        response = StreamingHttpResponse(
+            exports.STREAMS[renderer.format](rows),
+            content_type=f'{renderer.media_type}; charset={renderer.charset}'
+        )
+        response['Content-Disposition'] = (
+            f'attachment; filename="transactions-{timezone.localdate():%Y%m%d}.{renderer.format}"'
+        )
+        return response
+
     except Exception as e:
-        print(f"❌ Error in create_budget: {e}")
+        print(f"Error in export_transactions: {e}")
         return Response(
             {'message': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -465,30 +555,18 @@ def create_budget(request):
 
 
 @api_view(['PUT'])
-@permission_classes([AllowAny])
-def update_budget(request, budget_id):
+@permission_classes([IsAuthenticated])
+def update_transaction(request, transaction_id):
     try:
-        auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Bearer '):
-            return Response(
-                {'message': 'Token not provided'},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-        
-        token = auth_header.split(' ')[1]
-        access_token = AccessToken(token)
-        user_id = access_token['id']
-        user = User.objects.get(id=user_id)
-        
         try:
-            budget = Budget.objects.get(id=budget_id, user=user)
-        except Budget.DoesNotExist:
+            transaction = Transaction.objects.select_related('category').get(id=transaction_id, user=request.user)
+        except Transaction.DoesNotExist:
             return Response(
-                {'message': 'Budget not found'},
+                {'message': 'Transaction not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        serializer = BudgetSerializer(budget, data=request.data, partial=True)
+        serializer = TransactionSerializer(transaction, data=request.data, context={'request': request}, partial=True)
         
         if not serializer.is_valid():
             errors = serializer.errors
@@ -500,10 +578,13 @@ def update_budget(request, budget_id):
         
         serializer.save()
         
-        return Response({'message': 'Budget updated successfully'})
+        return Response({
+            'message': 'Transaction updated successfully',
+            'transaction': TransactionSerializer(serializer.instance, context={'request': request}).data
+        })
         
     except Exception as e:
-        print(f"❌ Error in update_budget: {e}")
+        print(f"Error in update_transaction: {e}")
         return Response(
             {'message': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -511,336 +592,348 @@ def update_budget(request, budget_id):
 
 
 @api_view(['DELETE'])
-@permission_classes([AllowAny])
-def delete_budget(request, budget_id):
+@permission_classes([IsAuthenticated])
+def delete_transaction(request, transaction_id):
     try:
-        auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Bearer '):
-            return Response(
-                {'message': 'Token not provided'},
-                status=status.HTTP_401_UNAUTHORIZED
-            )
-        
-        token = auth_header.split(' ')[1]
-        access_token = AccessToken(token)
-        user_id = access_token['id']
-        user = User.objects.get(id=user_id)
-        
         try:
-            budget = Budget.objects.get(id=budget_id, user=user)
-        except Budget.DoesNotExist:
+            transaction = Transaction.objects.get(id=transaction_id, user=request.user)
+        except Transaction.DoesNotExist:
             return Response(
-                {'message': 'Budget not found'},
+                {'message': 'Transaction not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        budget.delete()
+        transaction.delete()
         
-        return Response({'message': 'Budget deleted successfully'})
+        return Response({'message': 'Transaction deleted successfully'})
         
     except Exception as e:
-        print(f"❌ Error in delete_budget: {e}")
+        print(f"Error in delete_transaction: {e}")
         return Response(
             {'message': str(e)},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
 
-# ── GOALS ────────────────────────────────────────────────────────
+# ── BUDGETS, GOALS AND DEBTS ─────────────────────────────────────
 
-@api_view(['GET'])
-@permission_classes([AllowAny])
-def get_goals(request):
-    try:
-        auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Bearer '):
-            return Response({'message': 'Token not provided'}, status=status.HTTP_401_UNAUTHORIZED)
-
-        token = auth_header.split(' ')[1]
-        access_token = AccessToken(token)
-        user_id = access_token['id']
-        user = User.objects.get(id=user_id)
-
-        goals = Goal.objects.filter(user=user).select_related('category').order_by('-created_at')
-        serializer = GoalSerializer(goals, many=True)
-        return Response(serializer.data)
-    except Exception as e:
-        print(f"❌ Error in get_goals: {e}")
-        return Response({'message': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+class UserOwnedViewSet(viewsets.GenericViewSet):
+    """
+    List, create, update and delete for a model owned by the request user.
 
+    Authentication runs once, in DRF's pipeline (CustomJWTAuthentication),
+    so request.user is resolved before any action runs. Subclasses set the
+    model queryset and serializer and may annotate what they return.
+    """
+    permission_classes = [IsAuthenticated]
+    label = None
+    list_ordering = ('-created_at',)
+    returns_updated = True
+    # ?fields= and ?layout= of the list request.
+    fieldset = None
+    columnar = False
 
-@api_view(['POST'])
-@permission_classes([AllowAny])
-def create_goal(request):
-    try:
-        auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Bearer '):
-            return Response({'message': 'Token not provided'}, status=status.HTTP_401_UNAUTHORIZED)
-
-        token = auth_header.split(' ')[1]
-        access_token = AccessToken(token)
-        user_id = access_token['id']
-        user = User.objects.get(id=user_id)
-
-        data = request.data
-        category_id = data.get('category_id')
-        category = None
-        if category_id:
-            try:
-                category = Category.objects.get(id=category_id, user=user)
-            except Category.DoesNotExist:
-                return Response({'message': 'Category not found'}, status=status.HTTP_400_BAD_REQUEST)
+    @property
+    def key(self):
+        return self.label.lower()
 
-        goal = Goal.objects.create(
-            user=user,
-            category=category,
-            name=data['name'],
-            description=data.get('description', ''),
-            target_amount=data['target_amount'],
-            target_date=data['target_date'],
-            priority=data.get('priority', 'medium'),
-            status=data.get('status', 'in_progress'),
-        )
+    def owned(self):
+        return self.queryset.filter(user=self.request.user).select_related('category')
 
-        return Response({
-            'message': 'Goal created successfully',
-            'goal': GoalSerializer(goal).data
-        }, status=status.HTTP_201_CREATED)
-    except Exception as e:
-        print(f"❌ Error in create_goal: {e}")
-        return Response({'message': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    def get_queryset(self):
+        return self.owned()
 
+    def list_queryset(self):
+        return self.get_queryset().order_by(*self.list_ordering)
 
-@api_view(['PUT'])
-@permission_classes([AllowAny])
-def update_goal(request, goal_id):
-    try:
-        auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Bearer '):
-            return Response({'message': 'Token not provided'}, status=status.HTTP_401_UNAUTHORIZED)
+    def saved(self, instance):
+        # Re-read saved rows so the response carries the list annotations.
+        return self.get_queryset().get(pk=instance.pk)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.fieldset
+        return context
+
+    def list_response(self, items):
+        return Response(list_data(self.get_serializer(items, many=True), self.columnar))
+
+    def error_response(self, action, e):
+        print(f"Error in {self.key}.{action}: {e}")
+        return Response(
+            {'message': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    def invalid_response(self, serializer):
+        errors = serializer.errors
+        first_error = next(iter(errors.values()))[0]
+        return Response(
+            {'message': str(first_error)},
+            status=status.HTTP_400_BAD_REQUEST
+        )
 
-        token = auth_header.split(' ')[1]
-        access_token = AccessToken(token)
-        user_id = access_token['id']
-        user = User.objects.get(id=user_id)
+    def not_found_response(self):
+        return Response(
+            {'message': f'{self.label} not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
 
+    @conditional
+    @cached
+    def list(self, request):
         try:
-            goal = Goal.objects.get(id=goal_id, user=user)
-        except Goal.DoesNotExist:
-            return Response({'message': 'Goal not found'}, status=status.HTTP_404_NOT_FOUND)
+            try:
+                self.fieldset = sparse_fields(request.query_params, self.get_serializer_class())
+                self.columnar = is_columnar(request.query_params)
+            except InvalidFields as e:
+                return Response(
+                    {'message': str(e)},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            return self.list_response(list(self.list_queryset()))
+        except Exception as e:
+            return self.error_response('list', e)
+
+    def create(self, request):
+        try:
+            serializer = self.get_serializer(data=request.data)
+
+            if not serializer.is_valid():
+                return self.invalid_response(serializer)
+
+            instance = serializer.save(user=request.user)
+
+            return Response({
+                'message': f'{self.label} created successfully',
+                self.key: self.get_serializer(self.saved(instance)).data
+            }, status=status.HTTP_201_CREATED)
 
-        data = request.data
-        category_id = data.get('category_id')
-        if category_id:
+        except Exception as e:
+            return self.error_response('create', e)
+
+    def update(self, request, pk):
+        try:
             try:
-                goal.category = Category.objects.get(id=category_id, user=user)
-            except Category.DoesNotExist:
-                return Response({'message': 'Category not found'}, status=status.HTTP_400_BAD_REQUEST)
-        else:
-            goal.category = None
-
-        goal.name          = data.get('name', goal.name)
-        goal.description   = data.get('description', goal.description)
-        goal.target_amount = data.get('target_amount', goal.target_amount)
-        goal.target_date   = data.get('target_date', goal.target_date)
-        goal.priority      = data.get('priority', goal.priority)
-        goal.status        = data.get('status', goal.status)
-        goal.save()
+                instance = self.owned().get(pk=pk)
+            except self.queryset.model.DoesNotExist:
+                return self.not_found_response()
 
-        return Response({
-            'message': 'Goal updated successfully',
-            'goal': GoalSerializer(goal).data
-        })
-    except Exception as e:
-        print(f"❌ Error in update_goal: {e}")
-        return Response({'message': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            serializer = self.get_serializer(instance, data=request.data, partial=True)
 
+            if not serializer.is_valid():
+                return self.invalid_response(serializer)
 
-@api_view(['DELETE'])
-@permission_classes([AllowAny])
-def delete_goal(request, goal_id):
-    try:
-        auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Bearer '):
-            return Response({'message': 'Token not provided'}, status=status.HTTP_401_UNAUTHORIZED)
+            instance = serializer.save()
+
+            response = {'message': f'{self.label} updated successfully'}
+            if self.returns_updated:
+                response[self.key] = self.get_serializer(self.saved(instance)).data
+            return Response(response)
 
-        token = auth_header.split(' ')[1]
-        access_token = AccessToken(token)
-        user_id = access_token['id']
-        user = User.objects.get(id=user_id)
+        except Exception as e:
+            return self.error_response('update', e)
 
+    def destroy(self, request, pk):
         try:
-            goal = Goal.objects.get(id=goal_id, user=user)
-        except Goal.DoesNotExist:
-            return Response({'message': 'Goal not found'}, status=status.HTTP_404_NOT_FOUND)
+            deleted, _ = self.queryset.filter(pk=pk, user=request.user).delete()
+            if not deleted:
+                return self.not_found_response()
 
-        goal.delete()
-        return Response({'message': 'Goal deleted successfully'})
-    except Exception as e:
-        print(f"❌ Error in delete_goal: {e}")
-        return Response({'message': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return Response({'message': f'{self.label} deleted successfully'})
+
+        except Exception as e:
+            return self.error_response('destroy', e)
+
+
+class BudgetViewSet(UserOwnedViewSet):
+    queryset = Budget.objects.all()
+    serializer_class = BudgetSerializer
+    label = 'Budget'
+    list_ordering = ('-start_date',)
+    returns_updated = False
+
+    def list_queryset(self):
+        return super().list_queryset().filter(is_active=True)
+
+    def saved(self, instance):
+        return instance
+
+    def list_response(self, budgets):
+        context = self.get_serializer_context()
+        if self.fieldset is None or 'progress' in self.fieldset:
+            context['progress'] = budget_progress(self.request.user, budgets)
+        serializer = self.get_serializer(budgets, many=True, context=context)
+        return Response(list_data(serializer, self.columnar))
+
+
+class GoalViewSet(UserOwnedViewSet):
+    queryset = Goal.objects.all()
+    serializer_class = GoalSerializer
+    label = 'Goal'
 
+    def get_queryset(self):
+        return with_goal_progress(self.owned())
 
-# ── DEBTS ────────────────────────────────────────────────────────
+
+class DebtViewSet(UserOwnedViewSet):
+    queryset = Debt.objects.all()
+    serializer_class = DebtSerializer
+    label = 'Debt'
+
+    def get_queryset(self):
+        return with_debt_progress(self.owned())
+
+    def list_response(self, debts):
+        data = list_data(self.get_serializer(debts, many=True), self.columnar)
+
+        # Portfolio totals are opt-in so the list stays a plain array for
+        # older clients.
+        if self.request.query_params.get('totals') in ('1', 'true'):
+            return Response({'results': data, 'totals': debt_totals(debts)})
+        return Response(data)
+
+
+# ── DASHBOARD ────────────────────────────────────────────────────
 
 @api_view(['GET'])
-@permission_classes([AllowAny])
-def get_debts(request):
+@permission_classes([IsAuthenticated])
+@conditional
+@cached
+def get_dashboard_summary(request):
     try:
-        auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Bearer '):
-            return Response({'message': 'Token not provided'}, status=status.HTTP_401_UNAUTHORIZED)
-
-        token = auth_header.split(' ')[1]
-        access_token = AccessToken(token)
-        user_id = access_token['id']
-        user = User.objects.get(id=user_id)
-
-        debts = Debt.objects.filter(user=user).select_related('category').order_by('-created_at')
-        serializer = DebtSerializer(debts, many=True)
-        return Response(serializer.data)
+        period = request.query_params.get('period', '30')
+        try:
+            fields = sparse_fields(request.query_params, TransactionSerializer)
+            columnar = is_columnar(request.query_params)
+            summary = dashboard_summary(request.user, period)
+        except ValueError as e:
+            return Response(
+                {'message': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        summary['recent_transactions'] = list_data(TransactionSerializer(
+            summary['recent_transactions'], many=True, context={'request': request, 'fields': fields}
+        ), columnar)
+        if columnar:
+            summary['monthly_trend'] = columns(summary['monthly_trend'])
+            summary['top_categories'] = columns(summary['top_categories'])
+        return Response(summary)
     except Exception as e:
-        print(f"❌ Error in get_debts: {e}")
-        return Response({'message': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        print(f"Error in get_dashboard_summary: {e}")
+        return Response(
+            {'message': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
 
+# ── REPORTS ──────────────────────────────────────────────────────
 
 @api_view(['POST'])
-@permission_classes([AllowAny])
-def create_debt(request):
+@permission_classes([IsAuthenticated])
+def create_report(request):
     try:
-        auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Bearer '):
-            return Response({'message': 'Token not provided'}, status=status.HTTP_401_UNAUTHORIZED)
-
-        token = auth_header.split(' ')[1]
-        access_token = AccessToken(token)
-        user_id = access_token['id']
-        user = User.objects.get(id=user_id)
-
-        data = request.data
-        category_id = data.get('category_id')
-        category = None
-        if category_id:
-            try:
-                category = Category.objects.get(id=category_id, user=user)
-            except Category.DoesNotExist:
-                return Response({'message': 'Category not found'}, status=status.HTTP_400_BAD_REQUEST)
-
-        amount        = float(data['amount'])
-        interest_rate = float(data.get('interest_rate', 0))
-        months        = int(data.get('months', 0))
-
-        # Compound interest calculation: total = amount * (1 + rate/100) ^ months
-        if interest_rate > 0 and months > 0:
-            total_with_interest = amount * ((1 + interest_rate / 100) ** months)
-        else:
-            total_with_interest = amount
-
-        # If the frontend sends the total already calculated, use it
-        total_with_interest = float(data.get('total_with_interest', total_with_interest))
-
-        debt = Debt.objects.create(
-            user=user,
-            category=category,
-            name=data['name'],
-            creditor_name=data.get('creditor_name', ''),
-            amount=amount,
-            interest_rate=interest_rate,
-            months=months,
-            total_with_interest=total_with_interest,
-            due_date=data['due_date'],
-            description=data.get('description', ''),
-            status=data.get('status', 'pending'),
-        )
+        serializer = ReportRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            first_error = next(iter(serializer.errors.values()))[0]
+            return Response(
+                {'message': str(first_error)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        return Response({
-            'message': 'Debt created successfully',
-            'debt': DebtSerializer(debt).data
-        }, status=status.HTTP_201_CREATED)
+        data = serializer.validated_data
+        try:
+            date_from, date_to = reports.report_period(data.get('date_from'), data.get('date_to'))
+        except ValueError as e:
+            return Response(
+                {'message': str(e)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Rendering happens in the run_report_jobs worker; a report of
+        # unchanged data is already stored and can be downloaded right away.
+        job = reports.request_report(request.user, data['format'], date_from, date_to)
+        return Response(
+            ReportJobSerializer(job).data,
+            status=status.HTTP_200_OK if job.status == 'ready' else status.HTTP_202_ACCEPTED
+        )
     except Exception as e:
-        print(f"❌ Error in create_debt: {e}")
-        return Response({'message': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        print(f"Error in create_report: {e}")
+        return Response(
+            {'message': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
 
 
-@api_view(['PUT'])
-@permission_classes([AllowAny])
-def update_debt(request, debt_id):
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_report(request, report_id):
     try:
-        auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Bearer '):
-            return Response({'message': 'Token not provided'}, status=status.HTTP_401_UNAUTHORIZED)
-
-        token = auth_header.split(' ')[1]
-        access_token = AccessToken(token)
-        user_id = access_token['id']
-        user = User.objects.get(id=user_id)
-
         try:
-            debt = Debt.objects.get(id=debt_id, user=user)
-        except Debt.DoesNotExist:
-            return Response({'message': 'Debt not found'}, status=status.HTTP_404_NOT_FOUND)
-
-        data = request.data
-        category_id = data.get('category_id')
-        if category_id:
-            try:
-                debt.category = Category.objects.get(id=category_id, user=user)
-            except Category.DoesNotExist:
-                return Response({'message': 'Category not found'}, status=status.HTTP_400_BAD_REQUEST)
-        else:
-            debt.category = None
-
-        amount        = float(data.get('amount', debt.amount))
-        interest_rate = float(data.get('interest_rate', debt.interest_rate))
-        months        = int(data.get('months', debt.months))
-
-        if interest_rate > 0 and months > 0:
-            total_with_interest = amount * ((1 + interest_rate / 100) ** months)
-        else:
-            total_with_interest = amount
-
-        total_with_interest = float(data.get('total_with_interest', total_with_interest))
-
-        debt.name                = data.get('name', debt.name)
-        debt.creditor_name       = data.get('creditor_name', debt.creditor_name)
-        debt.amount              = amount
-        debt.interest_rate       = interest_rate
-        debt.months              = months
-        debt.total_with_interest = total_with_interest
-        debt.due_date            = data.get('due_date', debt.due_date)
-        debt.description         = data.get('description', debt.description)
-        debt.status              = data.get('status', debt.status)
-        debt.save()
+            job = ReportJob.objects.defer('content').get(id=report_id, user=request.user)
+        except ReportJob.DoesNotExist:
+            return Response(
+                {'message': 'Report not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
 
-        return Response({
-            'message': 'Debt updated successfully',
-            'debt': DebtSerializer(debt).data
-        })
+        return Response(ReportJobSerializer(job).data)
     except Exception as e:
-        print(f"❌ Error in update_debt: {e}")
-        return Response({'message': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        print(f"Error in get_report: {e}")
+        return Response(
+            {'message': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
 
 
-@api_view(['DELETE'])
-@permission_classes([AllowAny])
-def delete_debt(request, debt_id):
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def download_report(request, report_id):
     try:
-        auth_header = request.headers.get('Authorization', '')
-        if not auth_header.startswith('Bearer '):
-            return Response({'message': 'Token not provided'}, status=status.HTTP_401_UNAUTHORIZED)
-
-        token = auth_header.split(' ')[1]
-        access_token = AccessToken(token)
-        user_id = access_token['id']
-        user = User.objects.get(id=user_id)
-
         try:
-            debt = Debt.objects.get(id=debt_id, user=user)
-        except Debt.DoesNotExist:
-            return Response({'message': 'Debt not found'}, status=status.HTTP_404_NOT_FOUND)
+            job = ReportJob.objects.get(id=report_id, user=request.user)
+        except ReportJob.DoesNotExist:
+            return Response(
+                {'message': 'Report not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
 
-        debt.delete()
-        return Response({'message': 'Debt deleted successfully'})
+        if job.status != 'ready':
+            return Response(
+                {'message': 'Report is not ready'},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        _, content_type = RENDERERS[job.format]
+        response = HttpResponse(bytes(job.content), content_type=content_type)
+        response['Content-Disposition'] = (
+            f'attachment; filename="report-{job.date_from:%Y%m%d}-{job.date_to:%Y%m%d}.{job.format}"'
+        )
+        # The file of a job never changes; newer data gets a new job.
+        response['Cache-Control'] = 'private, max-age=86400, immutable'
+        return response
     except Exception as e:
-        print(f"❌ Error in delete_debt: {e}")
-        return Response({'message': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        print(f"Error in download_report: {e}")
+        return Response(
+            {'message': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+# ── SYSTEM ───────────────────────────────────────────────────────
+
+@api_view(['GET'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def get_metrics(request):
+    expected = settings.METRICS_TOKEN
+    provided = request.headers.get('X-Metrics-Token', '')
+    if not expected or not hmac.compare_digest(provided, expected):
+        return Response({'message': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
+
+    return Response({
+        'auth_user_cache': user_cache.stats(),
+        'password_hashing': password_hasher.stats(),
+        'database': connection_stats(),
+    })
@@ -4,7 +4,8 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'Backend'))
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+# API-only profile: Vercel routes nothing but /api/ here.
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings_api')
 
 def application(environ, start_response):
     status = '500 Error'